@@ -1,7 +1,10 @@
+from .helpers import lazy_attributes
 from .manifest import (
     validate_manifest_uris,
     validate_manifest_example_images,
     validate_is_verification,
+    ManifestValidationSession,
+    ManifestValidationResult,
     Manifest,
     NestedManifest,
     RequestConfig,
@@ -10,9 +13,41 @@ from .manifest import (
 )
 from .manifest.data import (
     validate_taskdata_entry,
+    validate_taskdata_json,
     validate_groundtruth_entry,
+    validate_groundtruth_data,
     validate_requester_example_image,
     validate_requester_restricted_answer_set_uris,
+    ContentTypeCache,
+    set_content_type_cache,
+    DocumentCache,
+    set_document_cache,
+    SpanRecorder,
+    instrument,
+    set_instrumentation_hook,
+    Sampling,
+    SamplingResult,
+    CompactTaskData,
+    set_compact_taskdata,
+    LazyTaskData,
+    set_lazy_taskdata,
+    DuplicateIndex,
+    DuplicateReport,
+    KeyReconciler,
+    ReconciliationReport,
 )
-from .via import ViaDataManifest
 from .manifest.data.preprocess import Pipeline, Preprocess
+
+# Imported on first access: the transport imports `requests`, the VIA models `pydantic.v1`,
+# the bulk validation `multiprocessing`
+__getattr__ = lazy_attributes(
+    __name__, {
+        "validate_jsonl": ".manifest.bulk",
+        "validate_manifest_line": ".manifest.bulk",
+        "HttpTransport": ".manifest.data.transport",
+        "MemoryTransport": ".manifest.data.transport",
+        "FileTransport": ".manifest.data.transport",
+        "set_transport": ".manifest.data.transport",
+        "set_scheme_transport": ".manifest.data.transport",
+        "ViaDataManifest": ".via",
+    })
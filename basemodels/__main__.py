@@ -0,0 +1,79 @@
+"""
+Command line interface.
+
+Usage:
+    python -m basemodels validate manifests.jsonl -o report.jsonl --offline
+    cat manifests.jsonl | python -m basemodels validate --processes 4
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from .manifest.bulk import BULK_CHUNKSIZE, validate_jsonl
+
+
+def validate(args: argparse.Namespace) -> int:
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    lines = errors = 0
+
+    try:
+        reports = validate_jsonl(
+            source,
+            offline=args.offline,
+            nested=args.nested,
+            processes=args.processes,
+            chunksize=args.chunksize,
+        )
+        for report in reports:
+            lines += 1
+            errors += not report["ok"]
+            output.write(json.dumps(report) + "\n")
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{lines} manifests validated, {errors} invalid", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m basemodels")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = commands.add_parser("validate",
+                                          help="validate a JSONL file of manifests, one per line")
+    validate_parser.add_argument("input",
+                                 nargs="?",
+                                 default="-",
+                                 help="JSONL file, stdin by default")
+    validate_parser.add_argument("-o",
+                                 "--output",
+                                 default="-",
+                                 help="JSONL report file, stdout by default")
+    validate_parser.add_argument("--offline",
+                                 action="store_true",
+                                 help="skip the validation of remote objects")
+    validate_parser.add_argument("--nested",
+                                 action="store_true",
+                                 help="validate lines as nested manifests")
+    validate_parser.add_argument("-p",
+                                 "--processes",
+                                 type=int,
+                                 default=None,
+                                 help="worker processes, CPU count by default")
+    validate_parser.add_argument("--chunksize",
+                                 type=int,
+                                 default=BULK_CHUNKSIZE,
+                                 help="lines sent to a worker at once")
+    validate_parser.set_defaults(handler=validate)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
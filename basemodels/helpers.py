@@ -1,9 +1,12 @@
-from typing import Tuple, Optional, Any
+from importlib import import_module
+from typing import Any, Callable, Dict, NoReturn, Optional, Tuple, Union
 
 from pydantic_core import InitErrorDetails, ValidationError
 
 
-def raise_validation_error(location: Tuple[str, ...], error_message: str, input_data: Optional[Any] = None):
+def raise_validation_error(location: Tuple[Union[str, int], ...],
+                           error_message: str,
+                           input_data: Optional[Any] = None) -> NoReturn:
     """Helper function to raise validation error."""
     error_details = InitErrorDetails(
         loc=location,
@@ -12,3 +15,17 @@ def raise_validation_error(location: Tuple[str, ...], error_message: str, input_
         input=input_data
     )
     raise ValidationError.from_exception_data(error_message, [error_details])
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Module `__getattr__` importing `attributes` (name -> relative module) on first access,
+    for exports pulling in heavy dependencies.
+    """
+    def __getattr__(name: str) -> Any:
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(import_module(module, package), name)
+
+    return __getattr__
@@ -1,3 +1,4 @@
+from basemodels.helpers import lazy_attributes
 from .manifest import (
     Manifest,
     NestedManifest,
@@ -8,3 +9,10 @@ from .manifest import (
     validate_manifest_example_images,
     validate_is_verification,
 )
+from .session import ManifestValidationSession, ManifestValidationResult
+
+# Imported on first access: `multiprocessing` is only needed by these
+__getattr__ = lazy_attributes(__name__, {
+    "validate_jsonl": ".bulk",
+    "validate_manifest_line": ".bulk",
+})
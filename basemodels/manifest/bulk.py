@@ -0,0 +1,104 @@
+"""
+Bulk validation of JSONL manifest streams, one manifest per line.
+
+Lines are validated in a process pool and reported in input order, one report per line:
+    {"line": 1, "ok": false, "errors": [{"loc": [...], "msg": "...", "type": "..."}], "elapsed_ms": 0.8}
+"""
+import json
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+from threading import Event, Semaphore
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from .manifest import Manifest, NestedManifest, validate_manifest_uris
+
+BULK_CHUNKSIZE = 64
+# Lines in flight per worker process, bounds memory for arbitrarily large inputs
+BULK_WINDOW_PER_PROCESS = 8 * BULK_CHUNKSIZE
+
+Line = Union[str, bytes]
+
+
+def report_errors(error: Exception) -> list:
+    """JSON serializable list of errors of a failed validation"""
+    if isinstance(error, ValidationError):
+        return json.loads(error.json(include_url=False, include_input=False, include_context=False))
+    return [{"loc": [], "msg": str(error), "type": type(error).__name__}]
+
+
+def validate_manifest_line(line: Line, offline: bool = False, nested: bool = False) -> dict:
+    """
+    Validate one JSONL line and return its report.
+
+    The remote objects of the manifest are validated with `validate_manifest_uris`
+    unless `offline` is set, as with the `--offline` option of the command line.
+    """
+    model = NestedManifest if nested else Manifest
+    errors = []
+    start = time.perf_counter()
+
+    try:
+        manifest = model.from_json_bytes(line)
+        if not offline:
+            validate_manifest_uris(manifest.to_primitive())
+    except Exception as e:
+        errors = report_errors(e)
+
+    return {
+        "ok": not errors,
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _validate_numbered_line(numbered_line: Tuple[int, Line], offline: bool, nested: bool) -> dict:
+    number, line = numbered_line
+    return {"line": number, **validate_manifest_line(line, offline=offline, nested=nested)}
+
+
+def validate_jsonl(
+    lines: Iterable[Line],
+    offline: bool = False,
+    nested: bool = False,
+    processes: Optional[int] = None,
+    chunksize: int = BULK_CHUNKSIZE,
+) -> Iterator[dict]:
+    """
+    Validate a JSONL stream of manifests and yield the line reports in input order.
+
+    `processes` defaults to the number of CPUs, `processes=1` validates in the calling
+    process. Blank lines are skipped but still counted in line numbers.
+    """
+    numbered_lines = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    validate = partial(_validate_numbered_line, offline=offline, nested=nested)
+
+    if processes == 1:
+        yield from map(validate, numbered_lines)
+        return
+
+    processes = processes or os.cpu_count() or 1
+    window = processes * max(BULK_WINDOW_PER_PROCESS, chunksize)
+    # `imap` reads its input eagerly, the feeder waits for a free slot before each line
+    slots = Semaphore(window)
+    stopped = Event()
+
+    def feed() -> Iterator[Tuple[int, Line]]:
+        for numbered_line in numbered_lines:
+            slots.acquire()
+            if stopped.is_set():
+                return
+            yield numbered_line
+
+    with Pool(processes) as pool:
+        try:
+            for report in pool.imap(validate, feed(), chunksize):
+                slots.release()
+                yield report
+        finally:
+            # Unblock the feeder if the reports are not all consumed
+            stopped.set()
+            slots.release()
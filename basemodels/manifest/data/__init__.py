@@ -1,5 +1,40 @@
+from basemodels.helpers import lazy_attributes
 from .helpers import validate_content_type, ExampleResourceModel
-from .groundtruth import validate_groundtruth_entry
-from .taskdata import validate_taskdata_entry
+from .cache import (
+    ContentTypeCache,
+    MemoryCacheBackend,
+    set_content_type_cache,
+    get_content_type_cache,
+    DocumentCache,
+    set_document_cache,
+    get_document_cache,
+)
+from .instrumentation import (
+    Span,
+    SpanRecorder,
+    instrument,
+    set_instrumentation_hook,
+    get_instrumentation_hook,
+)
+from .sampling import Sampling, SamplingResult
+from .compact import CompactTaskData, set_compact_taskdata, get_compact_taskdata
+from .lazy import LazyTaskData, set_lazy_taskdata, get_lazy_taskdata
+from .duplicates import DuplicateIndex, DuplicateReport
+from .reconcile import KeyReconciler, ReconciliationReport
+from .groundtruth import validate_groundtruth_entry, validate_groundtruth_data
+from .taskdata import validate_taskdata_entry, validate_taskdata_json
 from .requester_question_example import validate_requester_example_image
 from .requester_restricted_answer_set import validate_requester_restricted_answer_set_uris
+
+# The transport imports `requests`, only when it is used
+__getattr__ = lazy_attributes(__name__, {
+    name: ".transport"
+    for name in (
+        "HttpTransport",
+        "MemoryTransport",
+        "FileTransport",
+        "set_transport",
+        "get_transport",
+        "set_scheme_transport",
+    )
+})
@@ -0,0 +1,268 @@
+"""
+Caches of remote resources used during manifest validation.
+
+Content types: `ContentTypeCache` is shared by all the content type checks. Enable it with
+`set_content_type_cache(ContentTypeCache())` for an in-process cache, or pass a backend
+object with `get(key)` and `set(key, value, ttl)` methods to share the results between
+processes (e.g. a thin wrapper around Redis).
+
+Documents: `DocumentCache` keeps the ETag/Last-Modified of taskdata and groundtruth
+documents on disk together with their validation verdict, so an unchanged document is
+neither downloaded nor validated again. Enable it with `set_document_cache(DocumentCache(path))`.
+The least recently used documents are evicted once the directory exceeds `max_size` bytes.
+
+Both caches are disabled by default.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend, entries are evicted once older than their ttl"""
+    def __init__(self, maxsize: int = 4096, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.timer = timer
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.timer():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self.timer() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ContentTypeCache:
+    """uri -> content type cache with hit/miss counters"""
+    def __init__(self, backend=None, ttl: float = 3600):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Content types are prefetched from a thread pool
+        self._lock = Lock()
+
+    def get_content_type(self, uri: str, fetch: Callable[[str], str]) -> str:
+        """Return the cached content type of uri, or fetch and cache it"""
+        content_type = self.backend.get(uri)
+        if content_type is not None:
+            with self._lock:
+                self.hits += 1
+            return content_type
+
+        with self._lock:
+            self.misses += 1
+        content_type = fetch(uri)
+        self.backend.set(uri, content_type, self.ttl)
+        return content_type
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+content_type_cache: Optional[ContentTypeCache] = None
+
+
+def set_content_type_cache(cache: Optional[ContentTypeCache]) -> None:
+    """Install the cache used by content type checks, None disables caching"""
+    global content_type_cache
+    content_type_cache = cache
+
+
+def get_content_type_cache() -> Optional[ContentTypeCache]:
+    return content_type_cache
+
+
+# Max size of the files of a `DocumentCache` directory
+DOCUMENT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+_DOCUMENT_SUFFIXES = (".json", ".body")
+
+
+class DocumentCache:
+    """On-disk cache of remote documents validators, verdicts and bodies"""
+    def __init__(self, directory: str, max_size: int = DOCUMENT_CACHE_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        # Size of the directory files, scanned on the first write then updated by each write.
+        # Files written by other processes are only counted on the next eviction scan.
+        self._size: Optional[int] = None
+        self._size_lock = Lock()
+
+    def _path(self, uri: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(str(uri).encode()).hexdigest() + suffix)
+
+    def _write(self, path: str, data: bytes) -> None:
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._size_lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_size:
+                self._size = self._evict(keep=os.path.splitext(os.path.basename(path))[0])
+
+    def _scan(self) -> Tuple[Dict[str, Tuple[float, int]], int]:
+        """(last use, size) of the cached documents by file name without suffix, and their total size"""
+        documents: Dict[str, Tuple[float, int]] = {}
+        total = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name, suffix = os.path.splitext(entry.name)
+                if suffix not in _DOCUMENT_SUFFIXES:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                used, size = documents.get(name, (0.0, 0))
+                documents[name] = (max(used, stat.st_mtime), size + stat.st_size)
+                total += stat.st_size
+        return documents, total
+
+    def _evict(self, keep: str) -> int:
+        """
+        Remove the least recently used documents but `keep` (a file name without suffix) over
+        `max_size`, returns the size of the remaining files.
+        """
+        documents, total = self._scan()
+        for name, (_, size) in sorted(documents.items(), key=lambda item: item[1][0]):
+            if total <= self.max_size:
+                break
+            if name == keep:
+                continue
+            for suffix in _DOCUMENT_SUFFIXES:
+                try:
+                    os.remove(os.path.join(self.directory, name + suffix))
+                except OSError:
+                    pass
+            total -= size
+        return total
+
+    def _touch(self, uri: str) -> None:
+        """Mark the document of uri as recently used"""
+        try:
+            os.utime(self._path(uri, ".json"))
+        except OSError:
+            pass
+
+    def load(self, uri: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(uri, ".json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _update(self, uri: str, response: "requests.Response") -> Dict[str, Any]:
+        """Load the entry of uri, reset if the response is a new version of the document"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        entry = self.load(uri)
+        if entry is None or entry["etag"] != etag or entry["last_modified"] != last_modified:
+            entry = {"etag": etag, "last_modified": last_modified, "verdicts": {}, "has_body": False}
+        return entry
+
+    def _save(self, uri: str, entry: Dict[str, Any]) -> None:
+        if entry["etag"] or entry["last_modified"]:
+            self._write(self._path(uri, ".json"), json.dumps(entry).encode())
+
+    def conditional_headers(self, uri: str, verdict: Optional[str] = None) -> Dict[str, str]:
+        """
+        Headers for a conditional GET of uri. Empty unless a 304 response can be served
+        from the cache, i.e. if the `verdict` (or the body when no verdict is given) is cached.
+        """
+        entry = self.load(uri)
+        if entry is None:
+            return {}
+        if verdict is None and not entry["has_body"]:
+            return {}
+        if verdict is not None and verdict not in entry["verdicts"]:
+            return {}
+
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_verdict(self, uri: str, verdict: str) -> Optional[int]:
+        """Entries count of a cached successful validation"""
+        entry = self.load(uri)
+        entries_count = entry["verdicts"].get(verdict) if entry else None
+        if entries_count is not None:
+            self._touch(uri)
+        return entries_count
+
+    def set_verdict(self, uri: str, response: "requests.Response", verdict: str, entries_count: int) -> None:
+        entry = self._update(uri, response)
+        entry["verdicts"][verdict] = entries_count
+        self._save(uri, entry)
+
+    def get_body(self, uri: str) -> Optional[bytes]:
+        """Cached body of uri, None if it is not cached or was evicted"""
+        try:
+            with open(self._path(uri, ".body"), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        self._touch(uri)
+        return body
+
+    def set_body(self, uri: str, response: "requests.Response", body: bytes) -> None:
+        entry = self._update(uri, response)
+        if not (entry["etag"] or entry["last_modified"]) or len(body) > self.max_size:
+            return
+        self._write(self._path(uri, ".body"), body)
+        entry["has_body"] = True
+        self._save(uri, entry)
+
+
+document_cache: Optional[DocumentCache] = None
+
+
+def set_document_cache(cache: Optional[DocumentCache]) -> None:
+    """Install the cache used for taskdata & groundtruth documents, None disables caching"""
+    global document_cache
+    document_cache = cache
+
+
+def get_document_cache() -> Optional[DocumentCache]:
+    return document_cache
@@ -0,0 +1,222 @@
+"""
+Compact columnar store for large inline `Manifest.taskdata`.
+
+A validated `TaskData` row is a pydantic model holding a `UUID`, an url object, a hash string
+and a dict, i.e. about a kilobyte per task. With `set_compact_taskdata(True)` validated rows are
+packed into a `CompactTaskData` instead:
+
+- task keys as 16-byte UUIDs in a single buffer,
+- uris and hashes as ids into a table storing every distinct string once, as UTF-8,
+- polygons as a flat int64 array, rows with larger coordinates keep their list,
+- entities and datapoint texts, usually absent, only for the rows having some.
+
+`TaskData` views of the rows are built on demand, and `to_primitive()` is unchanged.
+The store is read-only: assign a new list to `taskdata` to change it.
+"""
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Type, Union
+from uuid import UUID
+
+from pydantic import AnyHttpUrl
+
+if TYPE_CHECKING:
+    from ..manifest import TaskData
+
+# Rows validated at once while building a compact store
+COMPACT_TASKDATA_CHUNK_SIZE = 1024
+
+compact_taskdata = False
+
+
+class StringColumn:
+    """Column of optional strings, every distinct value is stored once as UTF-8"""
+
+    __slots__ = ("ids", "_data", "_offsets", "_index")
+
+    def __init__(self):
+        # Per row id of the value, 0 for None
+        self.ids = array("I")
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self._index: Optional[Dict[str, int]] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.ids.append(0)
+            return
+        if self._index is None:
+            raise ValueError("values cannot be appended to a frozen column")
+        value_id = self._index.get(value)
+        if value_id is None:
+            self._data += value.encode()
+            self._offsets.append(len(self._data))
+            value_id = self._index[value] = len(self._offsets) - 1
+        self.ids.append(value_id)
+
+    def freeze(self) -> None:
+        """Drop the index of the distinct values, no value can be appended afterwards"""
+        self._index = None
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        value_id = self.ids[row]
+        if value_id == 0:
+            return None
+        return self._data[self._offsets[value_id - 1]:self._offsets[value_id]].decode()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def distinct(self) -> int:
+        return len(self._offsets) - 1
+
+    def nbytes(self) -> int:
+        return self.ids.itemsize * len(self.ids) + len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+class CompactTaskData(Sequence):
+    """Read-only sequence of taskdata rows, see module docstring"""
+
+    _FIELDS = ("task_key", "datapoint_uri", "entities", "polygon", "datapoint_text", "datapoint_hash")
+    _POLYGON = 1 << len(_FIELDS)
+
+    def __init__(self, row_model: Type["TaskData"]):
+        self.row_model = row_model
+        self._keys = bytearray()
+        self._uris = StringColumn()
+        self._hashes = StringColumn()
+        # Per row fields set bits, and whether the row has a polygon
+        self._flags = bytearray()
+        self._points = array("q")
+        self._point_offsets = array("Q", [0])
+        # Polygons with coordinates out of the int64 range
+        self._large_polygons: Dict[int, List[int]] = {}
+        self._entities: Dict[int, List[Any]] = {}
+        self._texts: Dict[int, Dict[str, str]] = {}
+        self._fields_sets: Dict[int, FrozenSet[str]] = {}
+
+    def append(self, row: "TaskData") -> None:
+        index = len(self._flags)
+        flags = 0
+        for bit, name in enumerate(self._FIELDS):
+            if name in row.model_fields_set:
+                flags |= 1 << bit
+
+        self._keys += row.task_key.bytes
+        self._uris.append(None if row.datapoint_uri is None else str(row.datapoint_uri))
+        self._hashes.append(row.datapoint_hash)
+        if row.polygon is not None:
+            flags |= self._POLYGON
+            try:
+                self._points.extend(array("q", row.polygon))
+            except OverflowError:
+                self._large_polygons[index] = row.polygon
+        self._point_offsets.append(len(self._points))
+        if row.entities is not None:
+            self._entities[index] = row.entities
+        if row.datapoint_text is not None:
+            self._texts[index] = row.datapoint_text
+        self._flags.append(flags)
+
+    def extend(self, rows: Iterator["TaskData"]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def freeze(self) -> "CompactTaskData":
+        self._uris.freeze()
+        self._hashes.freeze()
+        return self
+
+    def _polygon(self, index: int, flags: int) -> Optional[List[int]]:
+        if not flags & self._POLYGON:
+            return None
+        if index in self._large_polygons:
+            return list(self._large_polygons[index])
+        return self._points[self._point_offsets[index]:self._point_offsets[index + 1]].tolist()
+
+    def _fields_set(self, flags: int) -> Set[str]:
+        fields_set = self._fields_sets.get(flags)
+        if fields_set is None:
+            fields_set = frozenset(name for bit, name in enumerate(self._FIELDS) if flags & (1 << bit))
+            self._fields_sets[flags] = fields_set
+        # Models update their fields set on assignment
+        return set(fields_set)
+
+    def row(self, index: int) -> "TaskData":
+        """`TaskData` view of a row, built without validation"""
+        flags = self._flags[index]
+        uri = self._uris[index]
+        return self.row_model.model_construct(
+            self._fields_set(flags),
+            task_key=UUID(bytes=bytes(self._keys[index * 16:index * 16 + 16])),
+            datapoint_uri=None if uri is None else AnyHttpUrl(uri),
+            entities=self._entities.get(index),
+            polygon=self._polygon(index, flags),
+            datapoint_text=self._texts.get(index),
+            datapoint_hash=self._hashes[index],
+        )
+
+    def to_primitive(self) -> List[Dict[str, Any]]:
+        """JSON serialization of the rows, same as `[row.model_dump(mode="json") for row in self]`"""
+        rows = []
+        for index, flags in enumerate(self._flags):
+            if index in self._entities:
+                rows.append(self.row(index).model_dump(mode="json"))
+                continue
+            rows.append({
+                "task_key": str(UUID(bytes=bytes(self._keys[index * 16:index * 16 + 16]))),
+                "datapoint_uri": self._uris[index],
+                "entities": None,
+                "polygon": self._polygon(index, flags),
+                "datapoint_text": self._texts.get(index),
+                "datapoint_hash": self._hashes[index],
+            })
+        return rows
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("taskdata index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator["TaskData"]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"CompactTaskData({len(self)} rows, {self._uris.distinct} distinct uris)"
+
+    def nbytes(self) -> int:
+        """Approximate size of the packed columns, without the entities and texts"""
+        return (
+            len(self._keys)
+            + len(self._flags)
+            + self._uris.nbytes()
+            + self._hashes.nbytes()
+            + self._points.itemsize * len(self._points)
+            + self._point_offsets.itemsize * len(self._point_offsets)
+        )
+
+
+def set_compact_taskdata(enabled: bool) -> None:
+    """
+    Store the inline taskdata of the manifests validated from now on as `CompactTaskData`,
+    unless a validation picks another storage with its `{"taskdata": ...}` context
+    """
+    global compact_taskdata
+    compact_taskdata = enabled
+
+
+def get_compact_taskdata() -> bool:
+    return compact_taskdata
@@ -0,0 +1,124 @@
+"""
+Transparent decompression of gzip, bzip2 and xz taskdata and groundtruth documents.
+
+Compressed documents are recognized by their magic number, whatever their uri, content type
+or content encoding, and are decompressed incrementally: a streamed document is inflated
+chunk by chunk straight into the JSON stream reader, so it is never held in memory as a whole.
+
+`Content-Encoding: gzip` and `deflate` are already decoded by `requests`, the documents of
+other encodings (e.g. a `.json.xz` file served as is) are decompressed here.
+
+Decompressed documents are limited to `DECOMPRESSED_SIZE_MAX` bytes, a larger output (e.g. a
+decompression bomb) is a `ValueError` raised before it is inflated in memory.
+"""
+import bz2
+import itertools
+import lzma
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .stream import STREAM_CHUNK_SIZE
+
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bzip2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+}
+_MAGIC_SIZE = max(len(magic) for magic in COMPRESSION_MAGIC.values())
+
+# Max size of the decompressed chunks, bounds the memory used by highly compressed documents
+DECOMPRESSED_CHUNK_SIZE = STREAM_CHUNK_SIZE
+# Max size of a decompressed document
+DECOMPRESSED_SIZE_MAX = 1024 * 1024 * 1024
+
+# zlib, bz2 & lzma decompressors share no common type
+_DECOMPRESSORS: Dict[str, Callable[[], Any]] = {
+    "gzip": lambda: zlib.decompressobj(wbits=zlib.MAX_WBITS | 16),
+    "bzip2": bz2.BZ2Decompressor,
+    "xz": lzma.LZMADecompressor,
+}
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Compression format of a document from its first bytes, None if it is not compressed"""
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _inflate(compression: str, chunks: Iterable[bytes], max_length: Optional[int], max_size: int) -> Iterator[bytes]:
+    decompressor = _DECOMPRESSORS[compression]()
+    # Whether the current stream has started and not ended yet
+    pending = False
+    size = 0
+    for data in chunks:
+        # bz2 & lzma decompressors keep the output beyond max_length, zlib keeps the input
+        while data or not getattr(decompressor, "needs_input", True):
+            # One byte past the remaining size tells a too large document
+            length = max_size - size + 1
+            if max_length is not None and max_length < length:
+                length = max_length
+            try:
+                output = decompressor.decompress(data, length)
+            except (zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+                raise ValueError(f"invalid {compression} document: {e}") from e
+            size += len(output)
+            if size > max_size:
+                raise ValueError(f"{compression} document larger than {max_size} bytes once decompressed")
+            if output:
+                yield output
+            if decompressor.eof:
+                # Concatenated streams, e.g. from pigz or pbzip2
+                data = decompressor.unused_data
+                decompressor = _DECOMPRESSORS[compression]()
+                pending = False
+            else:
+                data = getattr(decompressor, "unconsumed_tail", b"")
+                pending = True
+
+    if pending and compression == "gzip":
+        output = decompressor.flush()
+        if size + len(output) > max_size:
+            raise ValueError(f"{compression} document larger than {max_size} bytes once decompressed")
+        if output:
+            yield output
+    if pending and not decompressor.eof:
+        raise ValueError(f"invalid {compression} document: truncated stream")
+
+
+def decompressed_chunks(
+    chunks: Iterable[bytes],
+    max_length: Optional[int] = DECOMPRESSED_CHUNK_SIZE,
+    max_size: Optional[int] = None,
+) -> Tuple[Optional[str], Iterator[bytes]]:
+    """
+    Detect the compression of a stream of byte chunks from its first bytes.
+
+    Returns the compression format (None for uncompressed documents) and the decompressed
+    chunks, of at most `max_length` bytes (None for no limit). Uncompressed chunks are
+    passed through untouched. The decompressed chunks raise a `ValueError` past `max_size`
+    bytes in total, `DECOMPRESSED_SIZE_MAX` if None.
+    """
+    chunks = iter(chunks)
+    head = b""
+    read = []
+    for chunk in chunks:
+        read.append(chunk)
+        head += bytes(chunk[:_MAGIC_SIZE - len(head)])
+        if len(head) >= _MAGIC_SIZE:
+            break
+
+    compression = detect_compression(head)
+    chunks = itertools.chain(read, chunks)
+    if compression is None:
+        return None, chunks
+    if max_size is None:
+        max_size = DECOMPRESSED_SIZE_MAX
+    return compression, _inflate(compression, chunks, max_length, max_size)
+
+
+def decompress(body: bytes, max_size: Optional[int] = None) -> Tuple[Optional[str], bytes]:
+    """Decompress a whole document, see `decompressed_chunks`"""
+    compression, chunks = decompressed_chunks((body,), max_length=None, max_size=max_size)
+    return compression, body if compression is None else b"".join(chunks)
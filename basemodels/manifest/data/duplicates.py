@@ -0,0 +1,192 @@
+"""
+Duplicate detection of taskdata `task_key`, `datapoint_uri` and `datapoint_hash` values.
+
+A `DuplicateIndex` is fed with the entries while they are validated, see the `duplicates`
+argument of `validate_taskdata_uri`. The inline taskdata of a `Manifest` is indexed after
+its validation, by `Manifest.find_duplicates`. Values are not kept,
+only 64-bit fingerprints in an open addressing table, i.e. about 16 bytes per entry and
+field: UUIDs are folded from their 128-bit int, other values are hashed with the (per
+process) string hash. Uris are hashed in their validated form, so raw entries (stream mode)
+and validated ones (bulk mode) have the same fingerprints. Two distinct values share a fingerprint with a probability below
+1e-5 for 10M entries.
+"""
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import AnyHttpUrl, BaseModel, TypeAdapter, ValidationError
+
+DUPLICATE_FIELDS = ("task_key", "datapoint_uri", "datapoint_hash")
+# Indices of duplicate entries kept per field in a report
+DUPLICATES_MAX = 10
+
+_MASK_64 = (1 << 64) - 1
+_CANONICAL_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+class DuplicateReport(BaseModel):
+    """Duplicate values found in the entries of a document"""
+
+    entries: int
+    # Number of entries repeating a value of an earlier entry, by field
+    duplicates: Dict[str, int]
+    # Indices of the first of these entries, by field
+    first_duplicates: Dict[str, List[int]]
+
+
+class FingerprintSet:
+    """Set of non-zero 64-bit ints, stored in an open addressing table"""
+
+    __slots__ = ("_slots", "_mask", "_limit", "count")
+
+    def __init__(self, capacity: int = 1024):
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self._allocate(size)
+        self.count = 0
+
+    def _allocate(self, size: int) -> None:
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        # At most half full
+        self._limit = size // 2
+
+    def add(self, fingerprint: int) -> bool:
+        """Add a fingerprint, returns False if it was already in the set"""
+        slots, mask = self._slots, self._mask
+        slot = fingerprint & mask
+        value = slots[slot]
+        while value:
+            if value == fingerprint:
+                return False
+            # Fingerprints are uniformly distributed, linear probing is enough
+            slot = (slot + 1) & mask
+            value = slots[slot]
+
+        slots[slot] = fingerprint
+        self.count += 1
+        if self.count > self._limit:
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._allocate(2 * len(old))
+        slots, mask = self._slots, self._mask
+        for fingerprint in old:
+            if fingerprint:
+                slot = fingerprint & mask
+                while slots[slot]:
+                    slot = (slot + 1) & mask
+                slots[slot] = fingerprint
+
+    def __len__(self) -> int:
+        return self.count
+
+
+@lru_cache(maxsize=None)
+def uuid_adapter() -> TypeAdapter:
+    return TypeAdapter(UUID)
+
+
+def uuid_fingerprint(value: Any) -> int:
+    """Non-zero 64-bit fingerprint of an UUID, or of its string"""
+    if isinstance(value, UUID):
+        number = value.int
+    elif isinstance(value, str) and _CANONICAL_UUID.fullmatch(value):
+        # Canonical form, faster than validating it
+        number = int(value.replace("-", ""), 16)
+    else:
+        # Other forms accepted by `task_key` validation, unlike UUID() which e.g. takes "0x" prefixes
+        try:
+            number = uuid_adapter().validate_python(value).int
+        except ValidationError:
+            return fingerprint(value)
+    return ((number ^ (number >> 64)) & _MASK_64) or 1
+
+
+def fingerprint(value: Any) -> int:
+    """Non-zero 64-bit fingerprint of a value, stable within a process"""
+    if not isinstance(value, str):
+        value = str(value)
+    return (hash(value) & _MASK_64) or 1
+
+
+@lru_cache(maxsize=None)
+def uri_adapter() -> TypeAdapter:
+    return TypeAdapter(AnyHttpUrl)
+
+
+def uri_fingerprint(value: Any) -> int:
+    """Fingerprint of an uri, or of its string, normalized as `datapoint_uri` validation does"""
+    if isinstance(value, str):
+        try:
+            value = uri_adapter().validate_python(value)
+        except ValidationError:
+            pass
+    return fingerprint(value)
+
+
+_FIELD_FINGERPRINTS = {
+    "task_key": uuid_fingerprint,
+    "datapoint_uri": uri_fingerprint,
+}
+
+
+class DuplicateIndex:
+    """
+    Duplicate index of the `fields` of taskdata entries, see module docstring.
+
+    With `reject`, documents with any duplicate value are rejected by `validate_taskdata_uri`.
+    """
+
+    def __init__(self, fields: Sequence[str] = DUPLICATE_FIELDS, reject: bool = False):
+        self.fields = tuple(fields)
+        self.reject = reject
+        self.entries = 0
+        self._fingerprints = {field: FingerprintSet() for field in self.fields}
+        self._duplicates = {field: 0 for field in self.fields}
+        self._first_duplicates: Dict[str, List[int]] = {field: [] for field in self.fields}
+
+    def __repr__(self) -> str:
+        return f"DuplicateIndex(fields={self.fields}, reject={self.reject})"
+
+    def add(self, entry: Any) -> None:
+        """Index a taskdata entry, a dict or a model"""
+        index = self.entries
+        self.entries += 1
+        is_dict = isinstance(entry, dict)
+        for field in self.fields:
+            value = entry.get(field) if is_dict else getattr(entry, field, None)
+            if value is None:
+                continue
+            value_fingerprint = _FIELD_FINGERPRINTS.get(field, fingerprint)(value)
+            if not self._fingerprints[field].add(value_fingerprint):
+                self._duplicates[field] += 1
+                if len(self._first_duplicates[field]) < DUPLICATES_MAX:
+                    self._first_duplicates[field].append(index)
+
+    def extend(self, entries: Iterable[Any]) -> None:
+        for entry in entries:
+            self.add(entry)
+
+    def report(self) -> DuplicateReport:
+        return DuplicateReport(
+            entries=self.entries,
+            duplicates=dict(self._duplicates),
+            first_duplicates={field: list(indices) for field, indices in self._first_duplicates.items()},
+        )
+
+    def first_duplicate(self) -> Optional[Tuple[str, int]]:
+        """(field, index) of the first duplicate entry, None without duplicates"""
+        first = [(indices[0], field) for field, indices in self._first_duplicates.items() if indices]
+        if not first:
+            return None
+        index, field = min(first)
+        return field, index
+
+    def rejects(self) -> bool:
+        return self.reject and any(self._duplicates.values())
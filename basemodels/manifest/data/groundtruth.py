@@ -1,29 +1,16 @@
-from typing import List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from uuid import UUID
 
-import requests
-from pydantic import BaseModel, HttpUrl, ConfigDict
-from requests import RequestException
+from pydantic import BaseModel, HttpUrl, ConfigDict, TypeAdapter, ValidationError
 from typing_extensions import Literal
 
 from basemodels.constants import SUPPORTED_CONTENT_TYPES, BaseJobTypesEnum
 from basemodels.helpers import raise_validation_error
-
-
-def create_wrapper_model(type):
-    class WrapperModel(BaseModel):
-        model_config = ConfigDict(arbitrary_types_allowed=True)
-        data: Optional[type] = None
-
-    return WrapperModel
-
-
-def validate_wrapper_model(Model, data):
-    Model.validate({"data": data})
+from .helpers import fetch_content_type, request_exception
 
 
 groundtruth_entry_key_type = HttpUrl
-GroundtruthEntryKeyModel = create_wrapper_model(groundtruth_entry_key_type)
 """
 Groundtruth file format for `image_label_binary` job type:
 
@@ -33,7 +20,6 @@ Groundtruth file format for `image_label_binary` job type:
 }
 """
 ilb_groundtruth_entry_type = List[Literal["true", "false"]]
-ILBGroundtruthEntryModel = create_wrapper_model(ilb_groundtruth_entry_type)
 """
 Groundtruth file format for `image_label_multiple_choice` job type:
 
@@ -51,10 +37,10 @@ Groundtruth file format for `image_label_multiple_choice` job type:
 }
 """
 ilmc_groundtruth_entry_type = List[List[str]]
-ILMCGroundtruthEntryModel = create_wrapper_model(ilmc_groundtruth_entry_type)
 
 
 class ILASGroundtruthEntry(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     entity_name: Optional[Union[int, float]] = None
     entity_type: str
     entity_coords: List[Union[int, float]]
@@ -76,10 +62,10 @@ Groundtruth file format for `image_label_area_select` job type
 }
 """
 ilas_groundtruth_entry_type = List[List[ILASGroundtruthEntry]]
-ILASGroundtruthEntryModel = create_wrapper_model(ilas_groundtruth_entry_type)
 
 
 class IDDGroundtruthEntry(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     entity_name: UUID
     entity_type: Optional[str]
     entity_coords: List[int]
@@ -99,13 +85,12 @@ Groundtruth file format for `image_drag_drop` job type
 }
 """
 idd_groundtruth_entry_type = List[IDDGroundtruthEntry]
-IDDGroundtruthEntryModel = create_wrapper_model(idd_groundtruth_entry_type)
 
 idd_groundtruth_entry_key_type = UUID
-IDDGroundtruthEntryKeyModel = create_wrapper_model(idd_groundtruth_entry_key_type)
 
 
 class TLMSSGroundTruthEntry(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     start: int
     end: int
     label: str
@@ -125,31 +110,51 @@ Groundtruth file format for `text_label_multiple_span_select` job type
 }
 """
 tlmss_groundtruth_entry_type = List[TLMSSGroundTruthEntry]
-TLMSSGroundTruthEntryModel = create_wrapper_model(tlmss_groundtruth_entry_type)
 
 
-groundtruth_entry_models_map = {
-    "image_label_binary": ILBGroundtruthEntryModel,
-    "image_label_multiple_choice": ILMCGroundtruthEntryModel,
-    "image_label_area_select": ILASGroundtruthEntryModel,
-    "text_label_multiple_span_select": TLMSSGroundTruthEntryModel,
-    "image_drag_drop": IDDGroundtruthEntryModel,
+groundtruth_entry_types_map: Dict[str, Any] = {
+    BaseJobTypesEnum.image_label_binary: ilb_groundtruth_entry_type,
+    BaseJobTypesEnum.image_label_multiple_choice: ilmc_groundtruth_entry_type,
+    BaseJobTypesEnum.image_label_area_select: ilas_groundtruth_entry_type,
+    BaseJobTypesEnum.text_label_multiple_span_select: tlmss_groundtruth_entry_type,
+    BaseJobTypesEnum.image_drag_drop: idd_groundtruth_entry_type,
+}
+
+groundtruth_entry_key_types_map: Dict[str, Any] = {
+    BaseJobTypesEnum.image_drag_drop: idd_groundtruth_entry_key_type,
 }
 
 
+@lru_cache(maxsize=None)
+def groundtruth_adapters(request_type: str) -> Optional[Tuple[TypeAdapter, TypeAdapter, TypeAdapter]]:
+    """
+    Compiled (key, value, whole mapping) validators of a request type's groundtruth.
+    Returns None if groundtruth of this request type is not validated.
+    """
+    entry_type = groundtruth_entry_types_map.get(request_type)
+    if entry_type is None:
+        return None
+    key_type = groundtruth_entry_key_types_map.get(request_type, groundtruth_entry_key_type)
+    config = ConfigDict(arbitrary_types_allowed=True)
+    # Types built at runtime, mypy only checks static type expressions
+    return (
+        TypeAdapter(Optional[key_type], config=config),  # type: ignore[arg-type]
+        TypeAdapter(Optional[entry_type], config=config),  # type: ignore[arg-type]
+        TypeAdapter(Dict[key_type, Optional[entry_type]], config=config),  # type: ignore[valid-type]
+    )
+
+
 def validate_content_type(uri: str) -> None:
     """Validate uri content type"""
     try:
-        response = requests.head(uri, timeout=(3.5, 5))
-        response.raise_for_status()
-    except RequestException as e:
+        content_type = fetch_content_type(uri)
+    except request_exception() as e:
         raise_validation_error(
             location=("groundtruth_uri",),
             error_message=f"groundtruth content type ({uri}) validation failed",
             input_data={"groundtruth_uri": uri}
         )
 
-    content_type = response.headers.get("Content-Type", "")
     if content_type not in SUPPORTED_CONTENT_TYPES:
         raise_validation_error(
             location=("groundtruth_uri",),
@@ -165,17 +170,63 @@ def validate_groundtruth_entry(
     validate_image_content_type: bool,
 ):
     """Validate key & value of groundtruth entry based on request_type"""
-    groundtruth_entry_value_model_class = groundtruth_entry_models_map.get(request_type)
-    groundtruth_entry_key_model_class = GroundtruthEntryKeyModel
-
-    if groundtruth_entry_value_model_class is None:
+    adapters = groundtruth_adapters(request_type)
+    if adapters is None:
         return
 
-    if request_type == BaseJobTypesEnum.image_drag_drop:
-        groundtruth_entry_key_model_class = IDDGroundtruthEntryKeyModel
-
-    validate_wrapper_model(groundtruth_entry_key_model_class, key)
-    validate_wrapper_model(groundtruth_entry_value_model_class, value)
+    key_adapter, value_adapter, _ = adapters
+    key_adapter.validate_python(key)
+    value_adapter.validate_python(value)
 
     if validate_image_content_type:
         validate_content_type(key)
+
+
+def iter_groundtruth_entries(data: Union[dict, list]) -> Iterator[Tuple[str, Any]]:
+    """(key, value) pairs of a groundtruth document, keys are empty for the list layout"""
+    if not isinstance(data, (dict, list)):
+        raise_validation_error(
+            location=("groundtruth_uri",),
+            error_message="groundtruth should be a dict or a list",
+        )
+    return iter(data.items()) if isinstance(data, dict) else (("", value) for value in data)
+
+
+def validate_groundtruth_data(
+    data: Union[dict, list],
+    request_type: str,
+    validate_image_content_type: bool,
+) -> int:
+    """
+    Validate a whole groundtruth document based on request_type in a single pydantic-core call.
+    Returns entries count.
+    """
+    if not isinstance(data, (dict, list)):
+        raise_validation_error(
+            location=("groundtruth_uri",),
+            error_message="groundtruth should be a dict or a list",
+        )
+
+    adapters = groundtruth_adapters(request_type)
+    if adapters is None:
+        return len(data)
+
+    try:
+        adapters[2].validate_python(data)
+    except ValidationError:
+        # Re-validate entry by entry to report the first invalid one
+        for index, (key, value) in enumerate(iter_groundtruth_entries(data)):
+            location = key if isinstance(data, dict) else index
+            try:
+                validate_groundtruth_entry(key, value, request_type, False)
+            except ValidationError as e:
+                raise_validation_error(
+                    location=("groundtruth_uri", location),
+                    error_message=f"groundtruth entry {location} is invalid: {e.errors()[0]['msg']}",
+                )
+        raise
+
+    if validate_image_content_type and data:
+        validate_content_type(next(iter(data)))
+
+    return len(data)
@@ -1,19 +1,79 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Type, Union
+
 from pydantic import BaseModel, HttpUrl
 
 from basemodels.constants import SUPPORTED_CONTENT_TYPES
 from basemodels.helpers import raise_validation_error
+from .cache import get_content_type_cache
+from .instrumentation import span
+
+# Default number of concurrent HEAD requests for content type checks
+CONTENT_TYPE_MAX_WORKERS = 8
+
+ContentTypes = Dict[str, Union[str, Exception]]
+
+
+def request_exception() -> Type[Exception]:
+    """
+    `requests.RequestException`, for except clauses. `requests` is only imported with the
+    transport, on the first remote call.
+    """
+    from requests import RequestException
+    return RequestException
 
 
 class ExampleResourceModel(BaseModel):
     answer_example_uri: HttpUrl
 
 
-def validate_content_type(uri: str) -> None:
-    """Validate uri content type"""
-    response = requests.head(uri, timeout=(3.5, 5))
-    response.raise_for_status()
-    content_type = response.headers.get("Content-Type", "")
+def head_content_type(uri: str) -> str:
+    """Fetch uri content type with a HEAD request"""
+    from .transport import transport_for
+
+    with span("content_type", uri=str(uri)) as probe_span:
+        response = transport_for(uri).head(uri)
+        probe_span.set(status=response.status_code)
+        response.raise_for_status()
+        return response.headers.get("Content-Type", "")
+
+
+def fetch_content_type(uri: str) -> str:
+    """Fetch uri content type, through the content type cache if one is installed"""
+    cache = get_content_type_cache()
+    if cache is None:
+        return head_content_type(uri)
+    return cache.get_content_type(str(uri), head_content_type)
+
+
+def prefetch_content_types(uris: Iterable[str], max_workers: int = CONTENT_TYPE_MAX_WORKERS) -> ContentTypes:
+    """
+    Fetch content types of unique uris concurrently.
+    Request errors are returned in place of the content type, to be raised by the caller.
+    """
+    def fetch(uri: str) -> Union[str, Exception]:
+        try:
+            return fetch_content_type(uri)
+        except request_exception() as e:
+            return e
+
+    unique_uris = list(dict.fromkeys(str(uri) for uri in uris))
+    if len(unique_uris) <= 1 or max_workers <= 1:
+        return {uri: fetch(uri) for uri in unique_uris}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_uris))) as executor:
+        return dict(zip(unique_uris, executor.map(fetch, unique_uris)))
+
+
+def validate_content_type(uri: str, content_types: Optional[ContentTypes] = None) -> None:
+    """Validate uri content type, using prefetched content types if available"""
+    if content_types is not None and str(uri) in content_types:
+        content_type = content_types[str(uri)]
+        if isinstance(content_type, Exception):
+            raise content_type
+    else:
+        content_type = fetch_content_type(uri)
+
     if content_type not in SUPPORTED_CONTENT_TYPES:
         raise_validation_error(
             location=("taskdata_uri",),
@@ -0,0 +1,195 @@
+"""
+Opt-in instrumentation of the validation pipeline.
+
+Install a hook with `set_instrumentation_hook(hook)`, or temporarily with
+`with instrument(hook):`. The hook is called with every finished `Span`, from the thread
+that ran it:
+
+- `manifest.validate`, `nested_manifest.validate`: model construction & validation
+- `taskdata_uri`, `groundtruth_uri`: whole validation of a remote document, with its
+  `bytes` and `entries` counts. Phases:
+  - `<document>.request`: connection, TLS handshake and response headers, and the body
+    download unless the document is streamed. `ttfb` is the time to the response headers.
+  - `<document>.parse`: JSON parsing. Streamed documents are downloaded while they are
+    parsed, so this includes reading the body.
+  - `<document>.validate`: entries validation, including the content type probe of the
+    first entry. In bulk mode, parsing happens in the same pydantic-core call.
+- `fetch_data_from_uri`, with `.request` and `.parse` phases
+- `content_type`: HEAD request probing the content type of a resource
+
+Instrumentation is disabled by default and costs a global lookup per phase, not per
+entry, while no hook is installed.
+
+Usage:
+    recorder = SpanRecorder()
+    with instrument(recorder):
+        validate_manifest_uris(manifest)
+    print(recorder.totals())
+"""
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sized
+
+
+class Span:
+    """A timed phase of the validation pipeline"""
+
+    __slots__ = ("name", "attributes", "bytes", "entries", "duration", "error", "cumulative", "_start")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], cumulative: bool = False):
+        self.name = name
+        self.attributes = attributes
+        self.bytes = 0
+        self.entries = 0
+        self.duration = 0.0
+        # Exception type name if the phase failed
+        self.error: Optional[str] = None
+        # Cumulative spans only count the time spent in `timed` functions & iterables
+        self.cumulative = cumulative
+
+    def __repr__(self) -> str:
+        return (
+            f"Span({self.name!r}, duration={self.duration:.6f}, bytes={self.bytes}, "
+            f"entries={self.entries}, attributes={self.attributes!r}, error={self.error!r})"
+        )
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if not self.cumulative:
+            self.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if _hook is not None:
+            _hook(self)
+
+    def add(self, bytes: int = 0, entries: int = 0) -> None:
+        self.bytes += bytes
+        self.entries += entries
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def count_bytes(self, body: Sized) -> None:
+        """Add the size of a downloaded body to the byte count, only measured in active spans"""
+        self.bytes += len(body)
+
+    def timed(self, func: Callable) -> Callable:
+        """Wrap `func` to add the time spent in it to the span duration"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.duration += time.perf_counter() - start
+        return wrapper
+
+    def timed_iter(self, iterable: Iterable) -> Iterator:
+        """Add the time spent producing the items of `iterable` to the span duration"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.duration += time.perf_counter() - start
+            yield item
+
+    def counted_bytes(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Add the size of the chunks of `chunks` to the span byte count"""
+        for chunk in chunks:
+            self.bytes += len(chunk)
+            yield chunk
+
+
+class NullSpan:
+    """Span returned while no hook is installed, every method is a no-op"""
+
+    bytes = 0
+    entries = 0
+    duration = 0.0
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    def add(self, bytes: int = 0, entries: int = 0) -> None:
+        pass
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def count_bytes(self, body: Sized) -> None:
+        pass
+
+    def timed(self, func: Callable) -> Callable:
+        return func
+
+    def timed_iter(self, iterable: Iterable) -> Iterable:
+        return iterable
+
+    def counted_bytes(self, chunks: Iterable) -> Iterable:
+        return chunks
+
+
+NULL_SPAN = NullSpan()
+
+_hook: Optional[Callable[[Span], None]] = None
+
+
+def span(name: str, cumulative: bool = False, **attributes: Any):
+    """Context manager timing a phase, reported to the installed hook on exit"""
+    if _hook is None:
+        return NULL_SPAN
+    return Span(name, attributes, cumulative)
+
+
+def set_instrumentation_hook(hook: Optional[Callable[[Span], None]]) -> None:
+    """Install the callable receiving finished spans, None to disable instrumentation"""
+    global _hook
+    _hook = hook
+
+
+def get_instrumentation_hook() -> Optional[Callable[[Span], None]]:
+    return _hook
+
+
+@contextmanager
+def instrument(hook: Callable[[Span], None]):
+    """Install `hook` for the duration of the block"""
+    previous = get_instrumentation_hook()
+    set_instrumentation_hook(hook)
+    try:
+        yield hook
+    finally:
+        set_instrumentation_hook(previous)
+
+
+class SpanRecorder:
+    """Hook keeping all the finished spans, thread safe"""
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = Lock()
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Count, duration, bytes and entries of the recorded spans, summed by name"""
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for span in self.spans:
+                total = totals.setdefault(span.name, {"count": 0, "duration": 0.0, "bytes": 0, "entries": 0})
+                total["count"] += 1
+                total["duration"] += span.duration
+                total["bytes"] += span.bytes
+                total["entries"] += span.entries
+        return totals
@@ -0,0 +1,130 @@
+"""
+Lazy validation of inline `Manifest.taskdata`.
+
+Most readers of a manifest only need its header fields. With `set_lazy_taskdata(True)` the
+inline taskdata is kept as raw data in a `LazyTaskData`, and its entries are validated by
+chunks on first access. A validation error is raised at that point, with the location it
+would have had in an eager validation. `Manifest.validate_all()` validates every entry
+upfront, e.g. at ingestion.
+"""
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Iterator, List, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import InitErrorDetails
+
+# Entries validated at once on access
+LAZY_TASKDATA_CHUNK_SIZE = 1024
+
+lazy_taskdata = False
+
+
+@lru_cache(maxsize=None)
+def rows_adapter(row_model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[row_model])  # type: ignore[valid-type]
+
+
+class LazyTaskData(Sequence):
+    """Sequence of taskdata rows validated by chunks on access, see module docstring"""
+
+    def __init__(self, raw: List[Any], row_model: Type[BaseModel], chunk_size: int = LAZY_TASKDATA_CHUNK_SIZE):
+        self.row_model = row_model
+        self.chunk_size = chunk_size
+        self._raw = list(raw)
+        # Validated rows of every chunk, None until the chunk is accessed
+        self._chunks: List[Optional[List[BaseModel]]] = [None] * -(-len(self._raw) // chunk_size)
+        self._lock = Lock()
+
+    def _chunk(self, chunk_index: int) -> List[BaseModel]:
+        rows = self._chunks[chunk_index]
+        if rows is not None:
+            return rows
+
+        with self._lock:
+            rows = self._chunks[chunk_index]
+            if rows is None:
+                start = chunk_index * self.chunk_size
+                raw = self._raw[start:start + self.chunk_size]
+                try:
+                    rows = rows_adapter(self.row_model).validate_python(raw)
+                except ValidationError as e:
+                    raise relocated_error(e, start) from None
+                self._chunks[chunk_index] = rows
+                # The raw entries are not needed anymore
+                self._raw[start:start + self.chunk_size] = [None] * len(raw)
+        return rows
+
+    @property
+    def validated(self) -> bool:
+        """Whether every entry has been validated"""
+        return all(rows is not None for rows in self._chunks)
+
+    def validate_all(self) -> "LazyTaskData":
+        """Validate every entry not validated yet, raise the first invalid chunk errors"""
+        for chunk_index in range(len(self._chunks)):
+            self._chunk(chunk_index)
+        return self
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("taskdata index out of range")
+        return self._chunk(index // self.chunk_size)[index % self.chunk_size]
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for chunk_index in range(len(self._chunks)):
+            yield from self._chunk(chunk_index)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        validated = sum(1 for rows in self._chunks if rows is not None)
+        return f"LazyTaskData({len(self)} rows, {validated}/{len(self._chunks)} chunks validated)"
+
+
+def relocated_error(error: ValidationError, start: int) -> ValidationError:
+    """Errors of a chunk located by their index in `taskdata`"""
+    line_errors = []
+    for detail in error.errors():
+        location = detail["loc"]
+        line_error = InitErrorDetails(
+            type=detail["type"],
+            loc=("taskdata", int(location[0]) + start) + location[1:],
+            input=detail["input"],
+        )
+        if "ctx" in detail:
+            line_error["ctx"] = detail["ctx"]
+        line_errors.append(line_error)
+    return ValidationError.from_exception_data("Manifest", line_errors)
+
+
+def set_lazy_taskdata(enabled: bool) -> None:
+    """
+    Validate the inline taskdata of the manifests validated from now on lazily, unless a
+    validation picks another storage with its `{"taskdata": ...}` context
+    """
+    global lazy_taskdata
+    lazy_taskdata = enabled
+
+
+def get_lazy_taskdata() -> bool:
+    return lazy_taskdata
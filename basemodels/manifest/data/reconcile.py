@@ -0,0 +1,261 @@
+"""
+Streaming reconciliation of the taskdata and groundtruth keys of verification jobs.
+
+Every taskdata entry should have a groundtruth entry and the other way round. A
+`KeyReconciler` is fed with the entries of both documents while they are streamed, and
+reports the missing (taskdata keys without groundtruth) and extra (groundtruth keys
+without taskdata) key counts, with samples.
+
+Keys are not kept in memory: each one is appended to a key log (flushed to a temporary file
+by `RECONCILE_LOG_MEMORY` bytes), and only its 64-bit fingerprint and log position are kept
+in arrays, i.e. 16 bytes per key. Above `spill_keys` keys, the fingerprints are sorted and
+spilled to temporary files by runs, which are merged at the end. Sample keys are read back
+from the key log.
+"""
+import heapq
+import os
+import tempfile
+from array import array
+from itertools import chain
+from typing import Any, IO, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+
+# Keys sorted in memory before the fingerprints are spilled to disk
+RECONCILE_SPILL_KEYS = 256 * 1024
+# Size of the in-memory key log buffer, flushed to a temporary file when full
+RECONCILE_LOG_MEMORY = 8 * 1024 * 1024
+# Keys kept as samples of the missing and extra keys
+RECONCILE_SAMPLES_MAX = 10
+
+_MASK_64 = (1 << 64) - 1
+# A log position packs the offset & size of a key, larger keys are truncated in samples
+_SIZE_BITS = 20
+_SIZE_MAX = (1 << _SIZE_BITS) - 1
+# Records read at once from a spilled run
+_RUN_READ_RECORDS = 8192
+
+
+class ReconciliationReport(BaseModel):
+    """Comparison of the taskdata & groundtruth keys of a verification job"""
+
+    # Distinct keys of each document
+    taskdata_keys: int
+    groundtruth_keys: int
+    # Taskdata keys without groundtruth entry
+    missing: int
+    # Groundtruth keys without taskdata entry
+    extra: int
+    # Entries without a key: taskdata entries without task key field, list layout groundtruth entries
+    unkeyed: int = 0
+    missing_sample: List[str] = []
+    extra_sample: List[str] = []
+
+    @property
+    def matches(self) -> bool:
+        return not (self.missing or self.extra or self.unkeyed)
+
+
+class KeyRuns:
+    """Fingerprints & log positions of the keys of one document, see module docstring"""
+
+    def __init__(self, spill_keys: int, directory: Optional[str] = None):
+        self.spill_keys = spill_keys
+        self.directory = directory
+        self.unkeyed = 0
+        # Key log, the oldest keys are flushed to a temporary file when the buffer is full
+        self._log: Optional[IO[bytes]] = None
+        self._log_buffer = bytearray()
+        self._log_flushed = 0
+        self._fingerprints = array("Q")
+        self._positions = array("Q")
+        self._runs: List[IO[bytes]] = []
+
+    def add(self, key: Any) -> None:
+        if key is None:
+            self.unkeyed += 1
+            return
+        if not isinstance(key, str):
+            key = str(key)
+        data = key.encode()
+        size = len(data)
+        if size > _SIZE_MAX:
+            size = _SIZE_MAX
+        buffer = self._log_buffer
+        self._positions.append((self._log_flushed + len(buffer)) << _SIZE_BITS | size)
+        # Inlined `duplicates.fingerprint(key)`
+        self._fingerprints.append((hash(key) & _MASK_64) or 1)
+        buffer += data
+        if len(buffer) >= RECONCILE_LOG_MEMORY:
+            self._flush_log()
+        if len(self._positions) >= self.spill_keys:
+            self._spill()
+
+    def _flush_log(self) -> None:
+        if self._log is None:
+            self._log = tempfile.TemporaryFile(dir=self.directory)
+        self._log.write(self._log_buffer)
+        self._log_flushed += len(self._log_buffer)
+        self._log_buffer = bytearray()
+
+    @property
+    def spilled(self) -> bool:
+        return bool(self._runs)
+
+    def _sorted_records(self) -> array:
+        """Buffered (fingerprint, position) records sorted by fingerprint, flattened"""
+        flat = array("Q", chain.from_iterable(sorted(zip(self._fingerprints, self._positions))))
+        self._fingerprints = array("Q")
+        self._positions = array("Q")
+        return flat
+
+    def _spill(self) -> None:
+        run = tempfile.TemporaryFile(dir=self.directory)
+        self._sorted_records().tofile(run)
+        run.seek(0)
+        self._runs.append(run)
+
+    def _read_run(self, run: IO[bytes]) -> Iterator[Tuple[int, int]]:
+        while True:
+            records = array("Q")
+            data = run.read(_RUN_READ_RECORDS * 2 * records.itemsize)
+            if not data:
+                return
+            records.frombytes(data)
+            yield from zip(records[::2], records[1::2])
+
+    def merged(self) -> Iterator[Tuple[int, int]]:
+        """Distinct (fingerprint, position) records, sorted by fingerprint"""
+        last = self._sorted_records()
+        runs = [self._read_run(run) for run in self._runs]
+        runs.append(zip(last[::2], last[1::2]))
+        previous = None
+        for fingerprint_, position in heapq.merge(*runs):
+            if fingerprint_ != previous:
+                previous = fingerprint_
+                yield fingerprint_, position
+
+    def fingerprints(self) -> Set[int]:
+        return set(self._fingerprints)
+
+    def positions(self, fingerprints: Set[int], count: int) -> List[int]:
+        """Log positions of the first `count` keys having one of `fingerprints`"""
+        positions: List[int] = []
+        remaining = set(fingerprints)
+        for fingerprint_, position in zip(self._fingerprints, self._positions):
+            if len(positions) == count:
+                break
+            if fingerprint_ in remaining:
+                positions.append(position)
+                remaining.discard(fingerprint_)
+        return positions
+
+    def key(self, position: int) -> str:
+        offset, size = position >> _SIZE_BITS, position & _SIZE_MAX
+        # Nothing is flushed before the log file is created
+        if self._log is not None and offset < self._log_flushed:
+            self._log.seek(offset)
+            data = self._log.read(size)
+            self._log.seek(0, os.SEEK_END)
+        else:
+            offset -= self._log_flushed
+            data = bytes(self._log_buffer[offset:offset + size])
+        return data.decode(errors="replace")
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+        self._log_buffer = bytearray()
+        for run in self._runs:
+            run.close()
+
+
+class KeyReconciler:
+    """
+    Compare the keys of the taskdata & groundtruth documents of a verification job.
+
+    `task_key` is the taskdata field matching the groundtruth keys. Taskdata entries are
+    added with `add_task(entry)`, groundtruth entries with `add_groundtruth(key, value)`,
+    e.g. as `on_entry` callbacks. Each document can be fed from its own thread. The entries of
+    a list layout groundtruth document (empty key) have no key to match, they are counted as
+    `unkeyed`.
+
+    Usage:
+        with KeyReconciler("datapoint_uri") as reconciler:
+            ...
+            report = reconciler.report()
+    """
+
+    def __init__(self, task_key: str, spill_keys: int = RECONCILE_SPILL_KEYS, directory: Optional[str] = None):
+        self.task_key = task_key
+        self.taskdata = KeyRuns(spill_keys, directory)
+        self.groundtruth = KeyRuns(spill_keys, directory)
+
+    def __enter__(self) -> "KeyReconciler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_task(self, entry: Any) -> None:
+        self.taskdata.add(entry.get(self.task_key) if isinstance(entry, dict) else None)
+
+    def add_groundtruth(self, key: str, value: Any) -> None:
+        self.groundtruth.add(key or None)
+
+    def report(self) -> ReconciliationReport:
+        if self.taskdata.spilled or self.groundtruth.spilled:
+            counts, missing_sample, extra_sample = self._merge_join()
+        else:
+            counts, missing_sample, extra_sample = self._compare_sets()
+        return ReconciliationReport(
+            taskdata_keys=counts[0],
+            groundtruth_keys=counts[1],
+            missing=counts[2],
+            extra=counts[3],
+            unkeyed=self.taskdata.unkeyed + self.groundtruth.unkeyed,
+            missing_sample=[self.taskdata.key(position) for position in missing_sample],
+            extra_sample=[self.groundtruth.key(position) for position in extra_sample],
+        )
+
+    def _compare_sets(self):
+        """Comparison of the fingerprint sets, when every fingerprint is in memory"""
+        taskdata, groundtruth = self.taskdata.fingerprints(), self.groundtruth.fingerprints()
+        missing, extra = taskdata - groundtruth, groundtruth - taskdata
+        return (
+            (len(taskdata), len(groundtruth), len(missing), len(extra)),
+            self.taskdata.positions(missing, RECONCILE_SAMPLES_MAX),
+            self.groundtruth.positions(extra, RECONCILE_SAMPLES_MAX),
+        )
+
+    def _merge_join(self):
+        """Merge join of the sorted fingerprints of both documents"""
+        taskdata_keys = groundtruth_keys = missing = extra = 0
+        missing_sample, extra_sample = [], []
+        taskdata, groundtruth = self.taskdata.merged(), self.groundtruth.merged()
+        task = next(taskdata, None)
+        truth = next(groundtruth, None)
+        while task is not None or truth is not None:
+            if truth is None or (task is not None and task[0] < truth[0]):
+                taskdata_keys += 1
+                missing += 1
+                if len(missing_sample) < RECONCILE_SAMPLES_MAX:
+                    missing_sample.append(task[1])
+                task = next(taskdata, None)
+            elif task is None or truth[0] < task[0]:
+                groundtruth_keys += 1
+                extra += 1
+                if len(extra_sample) < RECONCILE_SAMPLES_MAX:
+                    extra_sample.append(truth[1])
+                truth = next(groundtruth, None)
+            else:
+                taskdata_keys += 1
+                groundtruth_keys += 1
+                task = next(taskdata, None)
+                truth = next(groundtruth, None)
+        return (taskdata_keys, groundtruth_keys, missing, extra), missing_sample, extra_sample
+
+    def close(self) -> None:
+        self.taskdata.close()
+        self.groundtruth.close()
@@ -1,27 +1,27 @@
-from typing import Union
+from typing import Optional, Union
 
-from requests import RequestException
 from pydantic import ValidationError
-from .helpers import validate_content_type
+from .helpers import validate_content_type, ContentTypes, request_exception
 from basemodels.helpers import raise_validation_error
 
 
 def validate_requester_example_image(
     value: Union[str, list],
+    content_types: Optional[ContentTypes] = None,
 ):
     """Validate requester example image"""
     uri_val = ""
     try:
         if isinstance(value, str):
             uri_val = value
-            validate_content_type(value)
+            validate_content_type(value, content_types)
         elif isinstance(value, list):
             for uri in value:
                 uri_val = uri
-                validate_content_type(uri)
+                validate_content_type(uri, content_types)
         else:
             raise ValueError(f"Not supported format for requester_question_example.")
-    except RequestException as e:
+    except request_exception() as e:
         raise_validation_error(
             location=("requester_question_example",),
             error_message="could not retrieve requester example",
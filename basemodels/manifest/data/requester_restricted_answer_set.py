@@ -1,6 +1,7 @@
-from requests import RequestException
+from typing import Optional
+
 from pydantic import ValidationError
-from .helpers import validate_content_type
+from .helpers import validate_content_type, ContentTypes, request_exception
 from basemodels.helpers import raise_validation_error
 
 
@@ -14,15 +15,18 @@ def extract_answer_uri(restricted_answer_set: dict) -> list:
     return answer_uris
 
 
-def validate_requester_restricted_answer_set_uris(restricted_answer_set: dict) -> None:
+def validate_requester_restricted_answer_set_uris(
+    restricted_answer_set: dict,
+    content_types: Optional[ContentTypes] = None,
+) -> None:
     """Validate requester restricted entry"""
     if not isinstance(restricted_answer_set, dict):
         raise ValueError("Requester restricted set should be a dict")
     uris = extract_answer_uri(restricted_answer_set)
     for uri in uris:
         try:
-            validate_content_type(uri)
-        except RequestException as e:
+            validate_content_type(uri, content_types)
+        except request_exception() as e:
             raise_validation_error(
                 location=("requester_restricted_answer_set",),
                 error_message=f"could not retrieve requester restricted answer set example uri ({uri})",
@@ -0,0 +1,112 @@
+"""
+Statistical sampling of taskdata and groundtruth entries.
+
+With a `Sampling`, `validate_taskdata_uri` and `validate_groundtruth_uri` still read and
+count every entry, but only validate the first `head` entries plus a uniform reservoir
+sample of `size` of the remaining ones. The sample only depends on `seed` and the
+document, so a rejection can always be reproduced. A full validation (without `sample`)
+can follow later, e.g. in a background job.
+"""
+import random
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+# Indices of invalid entries kept in a sampling result
+SAMPLE_ERRORS_MAX = 10
+
+
+class SamplingResult(BaseModel):
+    """Result of the validation of a sample of the entries of a document"""
+
+    entries: int
+    sample_size: int
+    errors: int
+    error_rate: float
+    # (index, message) of the first invalid sampled entries
+    first_errors: List[Tuple[int, str]] = []
+
+
+class Sampling:
+    """
+    Sampling configuration, see module docstring.
+
+    A document is rejected when the error rate of its sample exceeds `max_error_rate`.
+    """
+    def __init__(self, size: int = 1000, head: int = 0, seed: int = 0, max_error_rate: float = 0.0):
+        if size < 0 or head < 0:
+            raise ValueError("sample size and head should be positive")
+        self.size = size
+        self.head = head
+        self.seed = seed
+        self.max_error_rate = max_error_rate
+
+    def __repr__(self) -> str:
+        return f"Sampling(size={self.size}, head={self.head}, seed={self.seed}, max_error_rate={self.max_error_rate})"
+
+    def sample(self, entries: Iterable[Any], on_entry: Optional[Callable[[Any], None]] = None) -> Tuple[int, List[Tuple[int, Any]]]:
+        """
+        Count `entries` and pick the sample, in a single pass keeping at most `head + size`
+        entries in memory. Returns the entries count and the (index, entry) pairs of the
+        sample by index. `on_entry` is called with every entry.
+        """
+        rng = random.Random(self.seed)
+        head: List[Tuple[int, Any]] = []
+        reservoir: List[Tuple[int, Any]] = []
+        count = 0
+
+        for index, entry in enumerate(entries):
+            count += 1
+            if on_entry is not None:
+                on_entry(entry)
+            if index < self.head:
+                head.append((index, entry))
+                continue
+            # Algorithm R over the entries after the head
+            seen = index - self.head
+            if seen < self.size:
+                reservoir.append((index, entry))
+            else:
+                slot = rng.randrange(seen + 1)
+                if slot < self.size:
+                    reservoir[slot] = (index, entry)
+
+        return count, head + sorted(reservoir, key=lambda item: item[0])
+
+    def validate(
+        self,
+        entries_count: int,
+        sample: List[Tuple[int, Any]],
+        validate: Callable[[Any], None],
+        probe: Optional[Callable[[Any], None]] = None,
+    ) -> SamplingResult:
+        """
+        Validate the sampled entries with `validate(entry)`.
+
+        `probe(entry)` is called with the first valid sampled entry, e.g. for the content type
+        check of its datapoint. Its errors are raised, they are not invalid entries.
+        """
+        errors = 0
+        first_errors: List[Tuple[int, str]] = []
+        for index, entry in sample:
+            try:
+                validate(entry)
+            except ValidationError as e:
+                errors += 1
+                if len(first_errors) < SAMPLE_ERRORS_MAX:
+                    first_errors.append((index, e.errors()[0]["msg"]))
+                continue
+            if probe is not None:
+                probe(entry)
+                probe = None
+
+        return SamplingResult(
+            entries=entries_count,
+            sample_size=len(sample),
+            errors=errors,
+            error_rate=errors / len(sample) if sample else 0.0,
+            first_errors=first_errors,
+        )
+
+    def rejects(self, result: SamplingResult) -> bool:
+        return result.error_rate > self.max_error_rate
@@ -0,0 +1,156 @@
+"""
+Incremental JSON parsing for remote taskdata and groundtruth documents.
+
+The readers below consume an iterable of byte chunks (e.g. `response.iter_content()`)
+and yield top level entries one at a time, so only the entry being parsed has to be
+kept in memory instead of the whole document.
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Tuple
+
+# Size of the chunks requested from the remote server while streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+# Longest partial token a decode error can point to when a value is cut, e.g. "-Infinit"
+_PARTIAL_TOKEN_MAX = 8
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamReader:
+    """Parse top level entries of a JSON document from a stream of byte chunks."""
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """
+        Append the next chunks to the buffer until it holds at least `min_size` chars.
+
+        Returns False if the end of the stream was reached before anything was read.
+        """
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        read = False
+        while not self._eof and (not read or len(self._buffer) < min_size):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                text = self._text_decoder.decode(b"", final=True)
+            else:
+                text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                read = True
+        return read
+
+    def _next_char(self) -> str:
+        """Skip whitespace and return the next char without consuming it ("" at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """Whether a decode error may come from a value cut by the end of the buffer"""
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return len(self._buffer) - error.pos <= _PARTIAL_TOKEN_MAX
+
+    def _read_value(self) -> Any:
+        """Read one complete JSON value starting at the current position."""
+        self._next_char()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # The value may be cut by the chunk boundary. Grow the buffer geometrically
+                # so large values are not re-parsed once per chunk. Other syntax errors are
+                # raised right away, without reading the rest of the document.
+                if self._truncated(e) and self._fill(2 * (len(self._buffer) - self._pos)):
+                    continue
+                raise
+
+            # A number at the end of the buffer, or followed by a partial exponent, may
+            # continue in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and len(self._buffer) - end <= _PARTIAL_TOKEN_MAX
+                and not self._buffer[end:].strip(_NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+
+            self._pos = end
+            return value
+
+    def _expect_end(self) -> None:
+        if self._next_char():
+            raise self._error("Extra data")
+
+    def peek(self) -> str:
+        """Return the first char of the next value, e.g. "[" or "{" for the document layout."""
+        return self._next_char()
+
+    def _iter_container(self, opening: str, closing: str, read_item) -> Iterator[Any]:
+        if self._next_char() != opening:
+            raise self._error(f"Expecting '{opening}'")
+        self._pos += 1
+
+        if self._next_char() == closing:
+            self._pos += 1
+            self._expect_end()
+            return
+
+        while True:
+            yield read_item()
+
+            char = self._next_char()
+            if char == closing:
+                self._pos += 1
+                break
+            if char != ",":
+                raise self._error("Expecting ',' delimiter")
+            self._pos += 1
+
+        self._expect_end()
+
+    def _read_key_value(self) -> Tuple[str, Any]:
+        if self._next_char() != '"':
+            raise self._error("Expecting property name enclosed in double quotes")
+        key = self._read_value()
+        if self._next_char() != ":":
+            raise self._error("Expecting ':' delimiter")
+        self._pos += 1
+        return key, self._read_value()
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the items of a top level JSON array."""
+        return self._iter_container("[", "]", self._read_value)
+
+    def iter_object(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs of a top level JSON object."""
+        return self._iter_container("{", "}", self._read_key_value)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Lazily yield the items of a JSON array read from byte chunks."""
+    return JSONStreamReader(chunks).iter_array()
+
+
+def iter_json_object(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Any]]:
+    """Lazily yield the (key, value) pairs of a JSON object read from byte chunks."""
+    return JSONStreamReader(chunks).iter_object()
@@ -0,0 +1,277 @@
+"""
+Seeded generator of synthetic manifests, taskdata and groundtruth for load testing.
+
+Documents are generated lazily, entry by entry, in the shapes validated by `TaskDataEntry`,
+the groundtruth models and `Manifest`, so arbitrarily large documents can be streamed to
+disk or memory. The same seed always generates the same documents, and groundtruth keys
+match the taskdata entries generated with the same seed and count.
+
+With `fault_rate`, a random share of the entries is made invalid, and every injected
+fault is recorded in `SyntheticData.faults`.
+
+Usage:
+    synthetic = SyntheticData(seed=1)
+    with open("taskdata.json", "w") as f:
+        dump_json_array(f, synthetic.taskdata_entries("image_label_binary", 10 ** 6))
+"""
+import json
+import random
+import uuid
+from typing import IO, Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from basemodels.constants import BaseJobTypesEnum
+from .groundtruth import groundtruth_entry_types_map
+
+LABELS = ["cat", "dog", "bird", "car", "tree", "gate"]
+ANSWERS_PER_ENTRY = 3
+JSON_CHUNK_ENTRIES = 1000
+
+TEXT_REQUEST_TYPES = [
+    BaseJobTypesEnum.text_free_entry,
+    BaseJobTypesEnum.text_label_multiple_span_select,
+    BaseJobTypesEnum.text_multiple_choice_one_option,
+    BaseJobTypesEnum.text_multiple_choice_multiple_options,
+]
+NESTED_REQUEST_TYPES = [t for t in BaseJobTypesEnum if t != BaseJobTypesEnum.multi_challenge]
+
+
+class Fault(NamedTuple):
+    # "taskdata", "groundtruth" or "manifest"
+    document: str
+    index: int
+    kind: str
+
+
+def json_array_chunks(items: Iterable[Any], chunk_entries: int = JSON_CHUNK_ENTRIES) -> Iterator[str]:
+    """Serialize items as a JSON array, in chunks of `chunk_entries` entries"""
+    chunk = ["["]
+    for i, item in enumerate(items):
+        chunk.append(("," if i else "") + json.dumps(item))
+        if len(chunk) >= chunk_entries:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append("]")
+    yield "".join(chunk)
+
+
+def json_object_chunks(pairs: Iterable[Tuple[str, Any]], chunk_entries: int = JSON_CHUNK_ENTRIES) -> Iterator[str]:
+    """Serialize (key, value) pairs as a JSON object, in chunks of `chunk_entries` entries"""
+    chunk = ["{"]
+    for i, (key, value) in enumerate(pairs):
+        chunk.append(("," if i else "") + json.dumps(key) + ":" + json.dumps(value))
+        if len(chunk) >= chunk_entries:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append("}")
+    yield "".join(chunk)
+
+
+def dump_json_array(fp: IO[str], items: Iterable[Any]) -> None:
+    fp.writelines(json_array_chunks(items))
+
+
+def dump_json_object(fp: IO[str], pairs: Iterable[Tuple[str, Any]]) -> None:
+    fp.writelines(json_object_chunks(pairs))
+
+
+def dump_jsonl(fp: IO[str], items: Iterable[Any]) -> None:
+    fp.writelines(json.dumps(item) + "\n" for item in items)
+
+
+class SyntheticData:
+    """
+    Deterministic generator of valid, or optionally invalid, job documents.
+
+    Every document is generated from its own random stream derived from `seed`, so the
+    documents do not depend on the order they are generated in.
+    """
+    def __init__(self, seed: int = 0, base_uri: str = "https://domain.com", fault_rate: float = 0.0):
+        self.seed = seed
+        self.base_uri = base_uri.rstrip("/")
+        self.fault_rate = fault_rate
+        self.faults: List[Fault] = []
+
+    def rng(self, *stream: Any) -> random.Random:
+        return random.Random(":".join(map(str, (self.seed,) + stream)))
+
+    def inject_fault(self, rng: random.Random) -> bool:
+        return bool(self.fault_rate) and rng.random() < self.fault_rate
+
+    @staticmethod
+    def random_uuid(rng: random.Random) -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def taskdata_entries(self, request_type: str, count: int) -> Iterator[dict]:
+        """Taskdata entries of a job, with `datapoint_text` for text jobs and entities for drag & drop jobs"""
+        rng = self.rng("taskdata", request_type, count)
+        faults = self.rng("taskdata_faults", request_type, count)
+
+        for i in range(count):
+            task_key = self.random_uuid(rng)
+            entry = {"task_key": task_key}
+            if request_type in TEXT_REQUEST_TYPES:
+                entry["datapoint_uri"] = f"{self.base_uri}/{task_key}.txt"
+                entry["datapoint_text"] = {"en": " ".join(rng.choices(LABELS, k=rng.randint(3, 12)))}
+            else:
+                entry["datapoint_uri"] = f"{self.base_uri}/{task_key}.jpg"
+            entry["datapoint_hash"] = "%040x" % rng.getrandbits(160)
+            if request_type == BaseJobTypesEnum.image_drag_drop:
+                entry["entities"] = [
+                    {
+                        "entity_id": self.random_uuid(rng),
+                        "entity_uri": f"{self.base_uri}/entities/{j}.png",
+                        "coords": [rng.randint(0, 640), rng.randint(0, 480)],
+                        "size": [rng.randint(16, 128), rng.randint(16, 128)],
+                    }
+                    for j in range(rng.randint(1, 4))
+                ]
+
+            if self.inject_fault(faults):
+                kind = faults.choice(["invalid_task_key", "missing_datapoint", "invalid_datapoint_uri"])
+                if kind == "invalid_task_key":
+                    entry["task_key"] = "not-a-uuid"
+                elif kind == "missing_datapoint":
+                    entry.pop("datapoint_uri")
+                    entry.pop("datapoint_text", None)
+                else:
+                    entry.pop("datapoint_text", None)
+                    entry["datapoint_uri"] = "not an uri"
+                self.faults.append(Fault("taskdata", i, kind))
+
+            yield entry
+
+    def groundtruth_value(self, request_type: str, rng: random.Random) -> Any:
+        if request_type == BaseJobTypesEnum.image_label_multiple_choice:
+            return [[rng.choice(LABELS)] for _ in range(ANSWERS_PER_ENTRY)]
+        if request_type == BaseJobTypesEnum.image_label_area_select:
+            return [[self.polygon(rng, j) for j in range(rng.randint(1, 3))] for _ in range(ANSWERS_PER_ENTRY)]
+        if request_type == BaseJobTypesEnum.image_drag_drop:
+            return [
+                {
+                    "entity_name": self.random_uuid(rng),
+                    "entity_type": "default",
+                    "entity_coords": [rng.randint(0, 640), rng.randint(0, 480)],
+                }
+                for _ in range(rng.randint(1, 4))
+            ]
+        if request_type == BaseJobTypesEnum.text_label_multiple_span_select:
+            spans, start = [], 0
+            for _ in range(rng.randint(1, 4)):
+                start += rng.randint(0, 20)
+                end = start + rng.randint(1, 20)
+                spans.append({"start": start, "end": end, "label": str(rng.randint(0, 3))})
+                start = end
+            return spans
+        return [rng.choice(["true", "false"]) for _ in range(ANSWERS_PER_ENTRY)]
+
+    @staticmethod
+    def polygon(rng: random.Random, entity_name: int) -> dict:
+        coords = []
+        for _ in range(rng.randint(3, 8)):
+            coords += [rng.randint(0, 640), rng.randint(0, 480)]
+        return {"entity_name": entity_name, "entity_type": rng.choice(LABELS), "entity_coords": coords}
+
+    def groundtruth_value_fault(self, request_type: str, value: Any) -> Tuple[str, Any]:
+        if request_type == BaseJobTypesEnum.image_label_multiple_choice:
+            return "invalid_answer", [answer[0] for answer in value]
+        if request_type == BaseJobTypesEnum.image_label_area_select:
+            value[0][0].pop("entity_type")
+            return "missing_entity_type", value
+        if request_type == BaseJobTypesEnum.image_drag_drop:
+            value[0]["entity_name"] = "not-a-uuid"
+            return "invalid_entity_name", value
+        if request_type == BaseJobTypesEnum.text_label_multiple_span_select:
+            value[0]["start"] = "start"
+            return "invalid_span", value
+        return "invalid_answer", value[:-1] + ["maybe"]
+
+    def groundtruth_entries(self, request_type: str, count: int) -> Iterator[Tuple[str, Any]]:
+        """
+        (key, value) pairs of a groundtruth document. Keys are the datapoint_uri, or the
+        task_key for drag & drop jobs, of `taskdata_entries(request_type, count)`.
+        """
+        rng = self.rng("groundtruth", request_type, count)
+        faults = self.rng("groundtruth_faults", request_type, count)
+        taskdata = SyntheticData(self.seed, self.base_uri).taskdata_entries(request_type, count)
+
+        for i, task in enumerate(taskdata):
+            key = task["task_key"] if request_type == BaseJobTypesEnum.image_drag_drop else task["datapoint_uri"]
+            value = self.groundtruth_value(request_type, rng)
+
+            # Only the groundtruth of some request types is validated
+            if self.inject_fault(faults) and request_type in groundtruth_entry_types_map:
+                if faults.random() < 0.5:
+                    key, kind = "not an uri", "invalid_key"
+                else:
+                    kind, value = self.groundtruth_value_fault(request_type, value)
+                self.faults.append(Fault("groundtruth", i, kind))
+
+            yield key, value
+
+    def nested_manifest(self, request_type: str) -> dict:
+        return {
+            "request_type": request_type,
+            "requester_question": {"en": f"Please select the {request_type} answer"},
+            "requester_restricted_answer_set": {str(i): {"en": label} for i, label in enumerate(LABELS[:2])},
+        }
+
+    def manifest(
+        self,
+        request_type: str,
+        taskdata_entries: int = 0,
+        taskdata_uri: Optional[str] = None,
+        groundtruth_uri: Optional[str] = None,
+        nested_manifests: int = 2,
+        index: int = 0,
+    ) -> dict:
+        """
+        A manifest with inline taskdata, or `taskdata_uri` if given. multi_challenge
+        manifests get `nested_manifests` nested manifests of all the other request types.
+        """
+        rng = self.rng("manifest", request_type, index)
+        manifest = {
+            "job_mode": rng.choice(["batch", "online", "instant_delivery"]),
+            "request_type": request_type,
+            "job_total_tasks": max(taskdata_entries, 1),
+            "task_bid_price": round(rng.uniform(0.001, 1), 4),
+            "oracle_stake": 0.05,
+            "requester_question": {"en": f"Please select the {request_type} answer"},
+            "requester_restricted_answer_set": {
+                str(i): {"en": label} for i, label in enumerate(rng.sample(LABELS, rng.randint(2, 4)))
+            },
+            "restricted_audience": {"lang": [{"en-us": {"score": round(rng.random(), 2)}}]},
+        }
+        if taskdata_uri:
+            manifest["taskdata_uri"] = taskdata_uri
+        else:
+            manifest["taskdata"] = list(SyntheticData(self.seed, self.base_uri).taskdata_entries(
+                request_type, taskdata_entries
+            ))
+        if groundtruth_uri:
+            manifest["groundtruth_uri"] = groundtruth_uri
+        if request_type == BaseJobTypesEnum.multi_challenge:
+            manifest["multi_challenge_manifests"] = [
+                self.nested_manifest(NESTED_REQUEST_TYPES[i % len(NESTED_REQUEST_TYPES)])
+                for i in range(nested_manifests)
+            ]
+
+        faults = self.rng("manifest_faults", request_type, index)
+        if self.inject_fault(faults):
+            kind = faults.choice(["invalid_job_mode", "missing_taskdata", "invalid_request_type"])
+            if kind == "invalid_job_mode":
+                manifest["job_mode"] = "unknown"
+            elif kind == "missing_taskdata":
+                manifest.pop("taskdata", None)
+                manifest.pop("taskdata_uri", None)
+            else:
+                manifest["request_type"] = "unknown"
+            self.faults.append(Fault("manifest", index, kind))
+
+        return manifest
+
+    def manifests(self, count: int, taskdata_entries: int = 0, request_types: Optional[List[str]] = None) -> Iterator[dict]:
+        """Manifests of `request_types`, all request types by default, in turn"""
+        request_types = request_types or [t.value for t in BaseJobTypesEnum]
+        for i in range(count):
+            yield self.manifest(request_types[i % len(request_types)], taskdata_entries, index=i)
+
@@ -1,16 +1,18 @@
+from functools import lru_cache
 from typing import Dict, Optional, Union, Any, List, Tuple
 from uuid import UUID
 
-import requests
-from pydantic import BaseModel, AnyHttpUrl, HttpUrl, field_validator, model_validator
-from requests import RequestException
+from pydantic import BaseModel, AnyHttpUrl, ConfigDict, HttpUrl, TypeAdapter, ValidationError, field_validator, model_validator
 
 from basemodels.constants import SUPPORTED_CONTENT_TYPES
 from basemodels.helpers import raise_validation_error
+from .helpers import fetch_content_type, request_exception
+from .duplicates import DuplicateIndex
 
 
 class Entity(BaseModel):
     """Entity configuration"""
+    model_config = ConfigDict(defer_build=True)
 
     entity_id: UUID
     entity_uri: AnyHttpUrl
@@ -37,6 +39,7 @@ class TaskDataEntry(BaseModel):
       }
     ]
     """
+    model_config = ConfigDict(defer_build=True)
 
     task_key: Optional[UUID] = None
     datapoint_uri: Optional[HttpUrl] = None
@@ -58,6 +61,9 @@ class TaskDataEntry(BaseModel):
 
         Raise error if no datapoint_text and no value for URI.
         """
+        if not isinstance(values, dict):
+            # Let the model validation report the type error
+            return values
         if not values.get("datapoint_uri") and not values.get("datapoint_text"):
             raise ValueError(f"datapoint_uri is missing. {list(values.keys())}")
         return values
@@ -82,15 +88,13 @@ class TaskDataEntry(BaseModel):
 def validate_content_type(uri: str) -> None:
     """Validate uri content type"""
     try:
-        response = requests.head(uri, timeout=(3.5, 5))
-        response.raise_for_status()
-    except RequestException as e:
+        content_type = fetch_content_type(uri)
+    except request_exception() as e:
         raise_validation_error(
             location=("taskdata_uri",),
             error_message=f"taskdata content type ({uri}) validation failed",
         )
 
-    content_type = response.headers.get("Content-Type", "")
     if content_type not in SUPPORTED_CONTENT_TYPES:
         raise_validation_error(
             location=("taskdata_uri",),
@@ -109,3 +113,42 @@ def validate_taskdata_entry(value: dict, validate_image_content_type: bool) -> N
 
     if validate_image_content_type:
         validate_content_type(task_data.datapoint_uri)
+
+
+@lru_cache(maxsize=None)
+def taskdata_adapter() -> TypeAdapter:
+    """Compiled validator for a whole taskdata document"""
+    return TypeAdapter(List[TaskDataEntry])
+
+
+def validate_taskdata_json(
+    data: Union[str, bytes],
+    validate_image_content_type: bool,
+    duplicates: Optional[DuplicateIndex] = None,
+) -> int:
+    """
+    Parse & validate a raw taskdata document in a single pydantic-core call.
+    Returns entries count.
+
+    The validated entries are added to `duplicates`, if any.
+    """
+    try:
+        entries = taskdata_adapter().validate_json(data)
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = error["loc"]
+        if location:
+            message = f"taskdata entry {location[0]} is invalid: {error['msg']}"
+        else:
+            message = f"taskdata is invalid: {error['msg']}"
+        raise_validation_error(
+            location=("taskdata_uri", *location),
+            error_message=f"{message} ({e.error_count()} errors)",
+        )
+
+    if validate_image_content_type and entries:
+        validate_content_type(entries[0].datapoint_uri)
+    if duplicates is not None:
+        duplicates.extend(entries)
+
+    return len(entries)
@@ -0,0 +1,290 @@
+"""
+HTTP transport shared by all the remote calls of the package: taskdata and groundtruth
+documents, `fetch_data_from_uri` and the content type checks.
+
+The default `HttpTransport` keeps a pool of keep-alive connections per host and retries
+idempotent requests on connection errors and 429/5xx responses, with jittered exponential
+backoff. Install another configuration, or your own transport, with `set_transport`:
+
+    set_transport(HttpTransport(retries=5, timeout=(1, 10)))
+
+A transport is any object with `get(uri, headers, stream)` and `head(uri)` methods returning
+`requests.Response` objects. `MemoryTransport` serves in-memory documents, e.g. in tests.
+
+Other uri schemes get their own transport, see `set_scheme_transport`. Uris come from
+requesters, so none is installed by default: `file://` uris are only served once a
+`FileTransport`, memory-mapping the documents of one root directory, is installed:
+
+    set_scheme_transport("file", FileTransport(root="/data/documents"))
+"""
+import io
+import mimetypes
+import mmap
+import os
+import random
+import threading
+from datetime import timedelta
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import InvalidURL
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+# Keep-alive connections kept per host
+HTTP_POOL_MAXSIZE = 16
+# Number of hosts with a connection pool
+HTTP_POOL_CONNECTIONS = 10
+HTTP_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.2
+# (connect, read) timeouts in seconds
+HTTP_TIMEOUT = (3.5, 5)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class JitteredRetry(Retry):
+    """Retry with "full jitter" backoff: a random delay up to the exponential backoff"""
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+class HttpTransport:
+    """Thread safe `requests` transport, see module docstring"""
+    def __init__(
+        self,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        retries: int = HTTP_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        timeout: Timeout = HTTP_TIMEOUT,
+        keep_alive: bool = True,
+    ):
+        self.timeout = timeout
+        self.session = requests.Session()
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        retry = JitteredRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, uri: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+        return self.session.get(uri, headers=headers, timeout=self.timeout, stream=stream)
+
+    def head(self, uri: str) -> requests.Response:
+        return self.session.head(uri, timeout=self.timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def build_response(
+    response: requests.Response,
+    method: str,
+    uri: str,
+    request_headers: Dict[str, str],
+    status: int,
+    headers: Dict[str, str],
+    raw: Optional[io.IOBase],
+) -> requests.Response:
+    """Fill a response of a transport that does not go through `requests`"""
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.raw = raw
+    response.url = uri
+    response.reason = HTTPStatus(status).phrase
+    response.elapsed = timedelta(0)
+    response.request = requests.Request(method, uri, headers=request_headers).prepare()
+    return response
+
+
+class MemoryTransport:
+    """
+    Transport serving in-memory documents, without any network access.
+
+    Documents added with an `ETag` header are answered with 304 to matching conditional
+    requests. Unknown uris are answered with 404. Requests are recorded in `requests` as
+    (method, uri, headers) tuples.
+    """
+    def __init__(self):
+        self.documents: Dict[str, Tuple[int, Dict[str, str], bytes]] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        uri: str,
+        body: Union[str, bytes] = b"",
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if isinstance(body, str):
+            body = body.encode()
+        self.documents[str(uri)] = (status, headers or {}, body)
+
+    def response(self, method: str, uri: str, headers: Optional[Dict[str, str]]) -> requests.Response:
+        uri = str(uri)
+        headers = dict(headers or {})
+        with self._lock:
+            self.requests.append((method, uri, headers))
+        status, document_headers, body = self.documents.get(uri, (404, {}, b""))
+
+        etag = document_headers.get("ETag")
+        if status == 200 and etag is not None and headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        if method == "HEAD":
+            body = b""
+
+        return build_response(requests.Response(), method, uri, headers, status, document_headers, io.BytesIO(body))
+
+    def get(self, uri: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+        return self.response("GET", uri, headers)
+
+    def head(self, uri: str) -> requests.Response:
+        return self.response("HEAD", uri, None)
+
+    def close(self) -> None:
+        pass
+
+
+class MappedFileResponse(requests.Response):
+    """
+    Response whose body is a read-only memory map of a local file.
+
+    `iter_content()` yields memoryview slices of the map, so streamed documents are parsed
+    straight from the page cache. `content` copies the file on first access, for the parsers
+    that only accept bytes, and is kept for the later accesses.
+    """
+    def __init__(self, path: str):
+        super().__init__()
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # Empty files can not be mapped
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._body: Optional[bytes] = None
+
+    @property
+    def content(self) -> bytes:
+        if self._body is None:
+            self._body = self._map[:] if self._map is not None else b""
+        return self._body
+
+    def iter_content(self, chunk_size: Optional[int] = 1, decode_unicode: bool = False) -> Iterator[Any]:
+        if self._map is None:
+            return
+        view = memoryview(self._map)
+        if chunk_size is None:
+            chunk_size = len(view)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Chunks are still referenced, the map is closed once they are released
+                pass
+        self._file.close()
+
+
+class FileTransport:
+    """
+    Transport of the `file://` uris of the files under `root`. Documents are memory-mapped,
+    with an ETag and Last-Modified derived from the file size & mtime for conditional
+    requests. Missing files are answered with 404, uris outside of `root` are rejected
+    with `InvalidURL` without looking them up.
+    """
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def path(self, uri: str) -> str:
+        parsed = urlparse(str(uri))
+        if parsed.netloc not in ("", "localhost"):
+            raise InvalidURL(f"{uri} is not a local file uri")
+        # Symbolic links and ".." segments are resolved before the root check
+        path = os.path.realpath(url2pathname(parsed.path))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise InvalidURL(f"{uri} is not under the file transport root")
+        return path
+
+    def stat_headers(self, path: str) -> Dict[str, str]:
+        stat = os.stat(path)
+        return {
+            "Content-Type": mimetypes.guess_type(path)[0] or "application/octet-stream",
+            "Content-Length": str(stat.st_size),
+            "ETag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        }
+
+    def response(self, method: str, uri: str, headers: Optional[Dict[str, str]]) -> requests.Response:
+        uri = str(uri)
+        headers = dict(headers or {})
+        path = self.path(uri)
+        try:
+            file_headers = self.stat_headers(path)
+        except OSError:
+            return build_response(requests.Response(), method, uri, headers, 404, {}, io.BytesIO())
+
+        if method == "HEAD" or headers.get("If-None-Match") == file_headers["ETag"]:
+            status = 200 if method == "HEAD" else 304
+            return build_response(requests.Response(), method, uri, headers, status, file_headers, io.BytesIO())
+        return build_response(MappedFileResponse(path), method, uri, headers, 200, file_headers, None)
+
+    def get(self, uri: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+        return self.response("GET", uri, headers)
+
+    def head(self, uri: str) -> requests.Response:
+        return self.response("HEAD", uri, None)
+
+    def close(self) -> None:
+        pass
+
+
+_transport = None
+_transport_lock = threading.Lock()
+_scheme_transports: Dict[str, Any] = {}
+
+
+def set_transport(transport) -> None:
+    """Install the transport used for all the remote calls, None restores the default one"""
+    global _transport
+    _transport = transport
+
+
+def get_transport():
+    """Installed transport, a default `HttpTransport` is created on first use"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+def set_scheme_transport(scheme: str, transport) -> None:
+    """Install the transport of the uris of `scheme`, None to use the default transport"""
+    if transport is None:
+        _scheme_transports.pop(scheme.lower(), None)
+    else:
+        _scheme_transports[scheme.lower()] = transport
+
+
+def transport_for(uri: str):
+    """Transport of an uri, based on its scheme"""
+    scheme = str(uri).partition(":")[0].lower()
+    return _scheme_transports.get(scheme) or get_transport()
@@ -2,23 +2,45 @@ import json
 import uuid
 from datetime import datetime
 
-import requests
 from pydantic_core.core_schema import ValidationInfo
-from requests.exceptions import RequestException
 from typing_extensions import Literal
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 from enum import Enum
 from uuid import UUID, uuid4
-from .data.groundtruth import validate_groundtruth_entry
+from .data.groundtruth import validate_groundtruth_entry, validate_groundtruth_data, iter_groundtruth_entries
 from .data.requester_question_example import validate_requester_example_image
-from .data.requester_restricted_answer_set import validate_requester_restricted_answer_set_uris
-from .data.taskdata import validate_taskdata_entry, Entity
-from pydantic import BaseModel, field_validator, ValidationError, HttpUrl, AnyHttpUrl, model_validator, ConfigDict
+from .data.requester_restricted_answer_set import validate_requester_restricted_answer_set_uris, extract_answer_uri
+from .data.helpers import prefetch_content_types, request_exception, CONTENT_TYPE_MAX_WORKERS
+from .data.taskdata import validate_taskdata_entry, validate_taskdata_json, Entity
+from .data.cache import get_document_cache
+from .data.stream import iter_json_array, JSONStreamReader, STREAM_CHUNK_SIZE
+from .data.compression import decompress, decompressed_chunks
+from .data.compact import CompactTaskData, COMPACT_TASKDATA_CHUNK_SIZE, get_compact_taskdata
+from .data.lazy import LazyTaskData, get_lazy_taskdata
+from .data.duplicates import DuplicateIndex, DuplicateReport, DUPLICATE_FIELDS
+from .data.reconcile import KeyReconciler, ReconciliationReport
+from .data.instrumentation import span
+from .data.sampling import Sampling, SamplingResult
+from pydantic import (
+    BaseModel,
+    field_validator,
+    ValidationError,
+    HttpUrl,
+    AnyHttpUrl,
+    model_validator,
+    field_serializer,
+    ConfigDict,
+    PrivateAttr,
+    ModelWrapValidatorHandler,
+)
 from pydantic.fields import Field
 from basemodels.manifest.restricted_audience import RestrictedAudience
 from basemodels.constants import JOB_TYPES_FOR_CONTENT_TYPE_VALIDATION, BaseJobTypesEnum
 from basemodels.helpers import raise_validation_error
 
+if TYPE_CHECKING:
+    import requests
+
 
 # A validator function for UUID fields
 def validate_uuid(cls, value):
@@ -55,14 +77,130 @@ class ShapeTypes(str, Enum):
 
 
 class Model(BaseModel):
+    """
+    Base model tracking the fields changed since the last validation, so
+    `check(incremental=True)` only re-runs the validators affected by the changes.
+
+    `check_dependencies` maps a field to the fields whose validators read it. In-place
+    changes of list or dict fields are not tracked, an incremental check misses them unless
+    the field is assigned again. `check()` validates the whole model.
+    """
+
+    # Validators & serializers are built on first use, not at import
+    model_config = ConfigDict(defer_build=True)
+
+    check_dependencies: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+    # Name of the instrumentation span timing the validation of the model, if any
+    validation_span: ClassVar[Optional[str]] = None
+
+    # Fields changed since the last validation, None if the model was never validated
+    _dirty_fields: Optional[Set[str]] = PrivateAttr(None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def track_changes(cls, values: Any, handler: ModelWrapValidatorHandler) -> Any:
+        if cls.validation_span is None:
+            model = handler(values)
+        else:
+            with span(cls.validation_span) as validation_span:
+                model = handler(values)
+                validation_span.add(entries=len(getattr(model, "taskdata", None) or ()))
+        # Instances are passed through unvalidated, e.g. on assignment, and keep their changes
+        if isinstance(model, Model) and model is not values:
+            model._dirty_fields = set()
+        return model
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields and self._dirty_fields is not None:
+            self._dirty_fields.add(name)
+
+    def __copy__(self):
+        copied = super().__copy__()
+        # The copy tracks its own changes
+        if copied._dirty_fields is not None:
+            copied._dirty_fields = set(copied._dirty_fields)
+        return copied
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        if copied._dirty_fields is not None:
+            copied._dirty_fields = set(copied._dirty_fields) | (set(update or ()) & set(type(self).model_fields))
+        return copied
+
     def to_primitive(self):
         return self.model_dump()
 
-    def check(self, return_new=False):
-        validated_obj = self.__class__.model_validate(self.model_dump())
-        # For compatibility with tests
-        if return_new:
-            return validated_obj
+    @classmethod
+    def from_json_bytes(cls, data: Union[str, bytes, bytearray]):
+        """
+        Parse & validate a raw JSON document, e.g. an HTTP request body.
+
+        Equivalent to `cls(**json.loads(data))`: the JSON document is parsed by pydantic-core
+        and goes through the same validators, including the `mode="before"` ones.
+        """
+        return cls.model_validate_json(data)
+
+    def mark_clean(self):
+        """Mark the model and its nested models as validated"""
+        self._dirty_fields = set()
+        for name in type(self).model_fields:
+            for child in nested_models(getattr(self, name, None)):
+                child.mark_clean()
+
+    def affected_fields(self) -> Set[str]:
+        """Changed fields and the fields depending on them"""
+        affected: Set[str] = set()
+        pending = list(self._dirty_fields or ())
+        while pending:
+            name = pending.pop()
+            if name not in affected:
+                affected.add(name)
+                pending.extend(self.check_dependencies.get(name, ()))
+        return affected
+
+    def validate_all(self):
+        """Validate the values whose validation was deferred, if any"""
+
+    def check(self, return_new=False, full=False, incremental=False):
+        """
+        Validate the model again, e.g. after changes. With `incremental`, only the fields
+        assigned since the last validation and the fields depending on them are validated.
+        """
+        # Deferred validation errors are raised as such, not wrapped in serialization errors
+        self.validate_all()
+        if return_new or full or not incremental or self._dirty_fields is None:
+            validated_obj = self.__class__.model_validate(self.model_dump())
+            self.mark_clean()
+            # For compatibility with tests
+            if return_new:
+                return validated_obj
+            return
+
+        affected = self.affected_fields()
+        if affected:
+            # Validate on a copy so the model values are left as they are, like a full check
+            validated_obj = self.model_copy()
+            for name in type(self).model_fields:
+                if name in affected:
+                    self.__pydantic_validator__.validate_assignment(validated_obj, name, getattr(self, name))
+
+        # Reassigned fields hold the same child instances too, the assignment does not validate them again
+        for name in type(self).model_fields:
+            for child in nested_models(getattr(self, name, None)):
+                if child._dirty_fields:
+                    child.check(incremental=True)
+
+        self._dirty_fields = set()
+
+
+def nested_models(value: Any) -> List[Model]:
+    """Models directly nested in a field value"""
+    if isinstance(value, Model):
+        return [value]
+    if isinstance(value, list) and value and isinstance(value[0], Model):
+        return [item for item in value if isinstance(item, Model)]
+    return []
 
 
 class Webhook(Model):
@@ -80,6 +218,7 @@ class Webhook(Model):
 
 class TaskData(BaseModel):
     """objects within taskdata list in Manifest"""
+    model_config = ConfigDict(defer_build=True)
 
     task_key: UUID
     datapoint_uri: Optional[AnyHttpUrl] = None
@@ -101,6 +240,9 @@ class TaskData(BaseModel):
 
         Raise error if no datapoint_text and no value for URI.
         """
+        if not isinstance(values, dict):
+            # Let the model validation report the type error
+            return values
         if not values.get("datapoint_uri") and not values.get("datapoint_text"):
             raise ValueError("datapoint_uri is missing.")
         return values
@@ -151,6 +293,12 @@ class NestedManifest(Model):
     """The nested manifest description for multi_challenge jobs"""
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    check_dependencies: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "request_type": ("requester_restricted_answer_set", "requester_question_example"),
+        "groundtruth_uri": ("groundtruth",),
+    }
+    validation_span: ClassVar[Optional[str]] = "nested_manifest.validate"
+
     # We will set a default dynamic value for job_id
     job_id: Optional[UUID] = None
     validate_job_id = field_validator("job_id")(validate_uuid)
@@ -227,10 +375,46 @@ class NestedManifest(Model):
     webhook: Optional[Webhook] = None
 
 
+# Storages of the inline taskdata rows, see `taskdata_mode`
+TASKDATA_MODES = ("models", "compact", "lazy")
+
+
+def taskdata_mode(context: Optional[dict]) -> str:
+    """
+    Storage of the inline taskdata of a manifest validated with `context`.
+
+    `context["taskdata"]` picks it for one validation, e.g.
+    `Manifest.model_validate(data, context={"taskdata": "compact"})`. Without it, the
+    process-wide default of `set_compact_taskdata` and `set_lazy_taskdata` is used.
+    """
+    mode = (context or {}).get("taskdata")
+    if mode is None:
+        compact, lazy = get_compact_taskdata(), get_lazy_taskdata()
+        if compact and lazy:
+            raise ValueError("set_compact_taskdata and set_lazy_taskdata can't be enabled together")
+        return "compact" if compact else "lazy" if lazy else "models"
+    if mode not in TASKDATA_MODES:
+        raise ValueError(f"taskdata mode must be one of {', '.join(TASKDATA_MODES)}, got {mode!r}")
+    return mode
+
+
 class Manifest(Model):
     """The manifest description."""
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    # The model level validator reads start_date, expiration_date, taskdata, taskdata_uri,
+    # is_verification and is_testing. It runs again with every re-validated field.
+    check_dependencies: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "request_type": (
+            "requester_min_repeats",
+            "requester_restricted_answer_set",
+            "requester_question_example",
+        ),
+        "multi_challenge_manifests": ("request_type",),
+        "groundtruth_uri": ("groundtruth",),
+    }
+    validation_span: ClassVar[Optional[str]] = "manifest.validate"
+
     job_mode: Literal["batch", "online", "instant_delivery"]
 
     # We will set a default dynamic value for job_api_key
@@ -309,6 +493,9 @@ class Manifest(Model):
 
     @model_validator(mode="before")
     def validate(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(values, dict):
+            # Let the model validation report the type error
+            return values
         start_date = values.get("start_date")
         expiration_date = values.get("expiration_date")
         # validate at least taskdata or taskdata_uri is present
@@ -402,18 +589,174 @@ class Manifest(Model):
     validate_job_api_key = field_validator("job_api_key")(validate_uuid)
     validate_job_id = field_validator("job_id")(validate_uuid)
 
+    @field_validator("taskdata", mode="wrap")
+    def validate_taskdata(cls, value, handler, validation_info: ValidationInfo):
+        """
+        Pack the validated rows into a `CompactTaskData`, or defer their validation with a
+        `LazyTaskData`, see `taskdata_mode`.
+        """
+        if isinstance(value, (CompactTaskData, LazyTaskData)):
+            # Rows are already validated, or validated on access
+            return value
+        if not isinstance(value, list):
+            return handler(value)
+        mode = taskdata_mode(validation_info.context)
+        if mode == "lazy":
+            return LazyTaskData(value, TaskData)
+        if mode == "models":
+            return handler(value)
+
+        rows = CompactTaskData(TaskData)
+        for start in range(0, len(value), COMPACT_TASKDATA_CHUNK_SIZE):
+            try:
+                rows.extend(handler(value[start:start + COMPACT_TASKDATA_CHUNK_SIZE]))
+            except ValidationError:
+                # Validate the whole list again, for errors located by their index in taskdata
+                handler(value)
+                raise
+        return rows.freeze()
+
+    @field_serializer("taskdata", mode="wrap")
+    def serialize_taskdata(self, value, handler, info):
+        if isinstance(value, LazyTaskData):
+            return handler(list(value))
+        if not isinstance(value, CompactTaskData):
+            return handler(value)
+        if info.mode_is_json() and not (
+            info.include or info.exclude or info.exclude_unset or info.exclude_defaults or info.exclude_none
+        ):
+            return value.to_primitive()
+        return handler(list(value))
+
+    def validate_all(self):
+        """Validate the lazily validated taskdata entries, if any, see `set_lazy_taskdata`"""
+        if isinstance(self.taskdata, LazyTaskData):
+            self.taskdata.validate_all()
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        # Invalid lazy entries raise a `ValidationError` before the serialization
+        self.validate_all()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self.validate_all()
+        return super().model_dump_json(**kwargs)
+
+    def find_duplicates(self, fields: Sequence[str] = DUPLICATE_FIELDS) -> DuplicateReport:
+        """
+        Duplicate `fields` values of the inline taskdata entries.
+
+        Unlike the `duplicates` argument of `validate_taskdata_uri`, entries are indexed in a
+        second pass over the validated (or lazily validated) taskdata.
+        """
+        duplicates = DuplicateIndex(fields)
+        duplicates.extend(self.taskdata or ())
+        return duplicates.report()
+
     def to_primitive(self):
         """Override primitive function to make it serializable."""
-        d = json.loads(self.model_dump_json())
+        d = self.model_dump(mode="json")
         if isinstance(self.restricted_audience, RestrictedAudience):
             d["restricted_audience"] = self.restricted_audience.to_primitive()
         return d
 
 
-def validate_groundtruth_uri(manifest: dict):
+def fetch_document(name: str, uri: str, headers: dict, stream: bool = False) -> "requests.Response":
+    """GET a remote document, timed as the `<name>.request` span"""
+    from .data.transport import transport_for
+
+    with span(f"{name}.request", uri=uri) as request_span:
+        response = transport_for(uri).get(uri, headers=headers, stream=stream)
+        request_span.set(status=response.status_code, ttfb=response.elapsed.total_seconds())
+        try:
+            response.raise_for_status()
+        except request_exception():
+            response.close()
+            raise
+    return response
+
+
+def document_chunks(response: "requests.Response", document_span, parse_span) -> Iterator[bytes]:
+    """Decompressed chunks of a streamed document, `parse_span` counts the downloaded bytes"""
+    chunks = parse_span.counted_bytes(response.iter_content(STREAM_CHUNK_SIZE))
+    compression, chunks = decompressed_chunks(chunks)
+    if compression is not None:
+        document_span.set(compression=compression)
+    return chunks
+
+
+def document_body(response: "requests.Response", document_span) -> bytes:
+    """Decompressed body of a document"""
+    compression, body = decompress(response.content)
+    if compression is not None:
+        document_span.set(compression=compression)
+    return body
+
+
+def chain_callbacks(*callbacks: Optional[Callable]) -> Callable:
+    """Callback calling all the given callbacks"""
+    present = [callback for callback in callbacks if callback is not None]
+    if len(present) == 1:
+        return present[0]
+
+    def chained(*args):
+        for callback in present:
+            callback(*args)
+    return chained
+
+
+def sample_groundtruth(
+    entries: Iterable[Tuple[str, Any]],
+    request_type: str,
+    validate_image_content_type: bool,
+    sample: Sampling,
+    on_entry: Optional[Callable[[str, Any], None]],
+    validate_entry: Callable = validate_groundtruth_entry,
+) -> Tuple[int, SamplingResult]:
+    """Count groundtruth (key, value) pairs and validate a sample of them"""
+    entries_count, sampled = sample.sample(entries, None if on_entry is None else lambda entry: on_entry(*entry))
+    result = sample.validate(
+        entries_count,
+        sampled,
+        lambda entry: validate_entry(*entry, request_type, False),
+        (lambda entry: validate_entry(*entry, request_type, True)) if validate_image_content_type else None,
+    )
+    return entries_count, result
+
+
+def check_sampling_result(uri_key: str, uri: str, sample: Sampling, result: SamplingResult) -> SamplingResult:
+    """Raise if too many sampled entries are invalid"""
+    if sample.rejects(result):
+        index, message = result.first_errors[0]
+        raise_validation_error(
+            location=(uri_key, index),
+            error_message=(
+                f"Validation failed for {uri}: {result.errors} of {result.sample_size} sampled entries are "
+                f"invalid ({sample!r}), first invalid entry {index}: {message}"
+            ),
+            input_data={uri_key: uri},
+        )
+    return result
+
+
+def validate_groundtruth_uri(
+    manifest: dict,
+    stream: bool = False,
+    on_entry: Optional[Callable[[str, Any], None]] = None,
+    sample: Optional[Sampling] = None,
+):
     """
     Validate groundtruth_uri
     Returns entries count if succeeded
+
+    With `stream` every (key, value) pair is validated as soon as it has been
+    downloaded, for both the dict and the list groundtruth layouts.
+
+    `on_entry` is called with every validated (key, value) pair. The document is then
+    always downloaded, even if its validation verdict is cached.
+
+    With `sample` every entry is counted but only a sample of them is validated, see
+    `validate_taskdata_uri`.
     """
     request_type = manifest.get("request_type", "")
     validate_image_content_type = request_type in JOB_TYPES_FOR_CONTENT_TYPE_VALIDATION
@@ -421,21 +764,65 @@ def validate_groundtruth_uri(manifest: dict):
     uri = manifest.get(uri_key)
     if uri is None:
         return
+    verdict = f"groundtruth:{getattr(request_type, 'value', request_type)}"
+    cache = get_document_cache() if sample is None else None
+    headers: Dict[str, str] = {}
+    cached_count = None
+    if cache is not None and on_entry is None:
+        # Read before the request, a 304 response is answered with it even if evicted meanwhile
+        cached_count = cache.get_verdict(uri, verdict)
+        if cached_count is not None:
+            headers = cache.conditional_headers(uri, verdict)
     entries_count = 0
+    document_span = span(uri_key, uri=uri, stream=stream)
     try:
-        response = requests.get(uri, timeout=(3.5, 5))
-        response.raise_for_status()
-        data = response.json()
-        if isinstance(data, dict):
-            for k, v in data.items():
-                entries_count += 1
-                validate_groundtruth_entry(k, v, request_type, validate_image_content_type)
-                validate_image_content_type = False
-        else:
-            for v in data:
-                entries_count += 1
-                validate_groundtruth_entry("", v, request_type, validate_image_content_type)
-                validate_image_content_type = False
+        with document_span:
+            response = fetch_document(uri_key, uri, headers, stream=stream)
+            with response:
+                if response.status_code == 304 and headers:
+                    # Unchanged since its last successful validation
+                    document_span.set(cached=True)
+                    return cached_count
+                parse_span = span(f"{uri_key}.parse", uri=uri, cumulative=True)
+                validate_span = span(f"{uri_key}.validate", uri=uri, cumulative=True)
+                with parse_span, validate_span:
+                    if stream:
+                        reader = JSONStreamReader(document_chunks(response, document_span, parse_span))
+                        if parse_span.timed(reader.peek)() == "{":
+                            entries = reader.iter_object()
+                        else:
+                            entries = (("", v) for v in reader.iter_array())
+                        entries = parse_span.timed_iter(entries)
+                    else:
+                        data = parse_span.timed(json.loads)(document_body(response, document_span))
+                        parse_span.count_bytes(response.content)
+
+                    validate_entry = validate_span.timed(validate_groundtruth_entry)
+                    if sample is not None:
+                        entries_count, sample_result = sample_groundtruth(
+                            entries if stream else iter_groundtruth_entries(data),
+                            request_type,
+                            validate_image_content_type,
+                            sample,
+                            on_entry,
+                            validate_entry,
+                        )
+                    elif stream:
+                        for k, v in entries:
+                            entries_count += 1
+                            validate_entry(k, v, request_type, validate_image_content_type)
+                            validate_image_content_type = False
+                            if on_entry is not None:
+                                on_entry(k, v)
+                    else:
+                        entries_count = validate_span.timed(validate_groundtruth_data)(
+                            data, request_type, validate_image_content_type
+                        )
+                        if on_entry is not None:
+                            for k, v in iter_groundtruth_entries(data):
+                                on_entry(k, v)
+                    validate_span.add(entries=entries_count)
+                document_span.add(bytes=parse_span.bytes, entries=entries_count)
 
     except ValidationError as e:
         raise_validation_error(
@@ -443,7 +830,7 @@ def validate_groundtruth_uri(manifest: dict):
             error_message=f"Validation failed for {uri}: {e.title}",
             input_data={"groundtruth_uri": uri}
         )
-    except RequestException as e:
+    except (request_exception(), ValueError) as e:
         raise_validation_error(
             location=("groundtruth_uri",),
             error_message=f"Validation failed for {uri}: {e}",
@@ -457,11 +844,46 @@ def validate_groundtruth_uri(manifest: dict):
             input_data={"groundtruth_uri": uri}
         )
 
+    if sample is not None:
+        return check_sampling_result(uri_key, uri, sample, sample_result)
+
+    if cache is not None:
+        cache.set_verdict(uri, response, verdict, entries_count)
+    return entries_count
 
-def validate_taskdata_uri(manifest: dict):
+
+def validate_taskdata_uri(
+    manifest: dict,
+    stream: bool = False,
+    bulk: bool = False,
+    on_entry: Optional[Callable[[Any], None]] = None,
+    sample: Optional[Sampling] = None,
+    duplicates: Optional[DuplicateIndex] = None,
+):
     """
     Validate taskdata_uri
     Returns entries count if succeeded
+
+    With `stream` the document is parsed while it is downloaded and every entry is
+    validated as soon as it is complete, so memory usage does not depend on the
+    document size and the download stops at the first invalid entry.
+
+    With `bulk` the raw response body is parsed and validated as a whole by pydantic-core,
+    which is much faster for documents that fit in memory. Takes precedence over `stream`.
+
+    `on_entry` is called with every validated entry. Entries are then validated one by one
+    (`bulk` is ignored) and the document is always downloaded, even if its validation
+    verdict is cached.
+
+    With `sample` every entry is counted but only a sample of them is validated (`bulk` is
+    ignored and `on_entry` is called with every entry). Returns a `SamplingResult`, and
+    raises if the error rate of the sample exceeds `sample.max_error_rate`. Sampled
+    verdicts are not cached. The content type of the first valid sampled entry is checked
+    as without sampling: a failed check fails the document, it is not an invalid entry.
+
+    With `duplicates` every entry is added to the `DuplicateIndex`, whose report lists the
+    duplicate task keys, uris and hashes. The document is then always downloaded, and is
+    rejected on duplicates if `duplicates.reject` is set.
     """
     request_type = manifest.get("request_type", "")
     validate_image_content_type = request_type in JOB_TYPES_FOR_CONTENT_TYPE_VALIDATION
@@ -469,23 +891,74 @@ def validate_taskdata_uri(manifest: dict):
     uri = manifest.get(uri_key)
     if uri is None:
         return
+    verdict = f"taskdata:{getattr(request_type, 'value', request_type)}"
+    cache = get_document_cache() if sample is None else None
+    headers: Dict[str, str] = {}
+    cached_count = None
+    if cache is not None and on_entry is None and duplicates is None:
+        # Read before the request, a 304 response is answered with it even if evicted meanwhile
+        cached_count = cache.get_verdict(uri, verdict)
+        if cached_count is not None:
+            headers = cache.conditional_headers(uri, verdict)
+    bulk = bulk and on_entry is None and sample is None
+    if duplicates is not None:
+        on_entry = chain_callbacks(on_entry, duplicates.add)
     entries_count = 0
+    document_span = span(uri_key, uri=uri, stream=stream, bulk=bulk)
     try:
-        response = requests.get(uri, timeout=(3.5, 5))
-        response.raise_for_status()
-        data = response.json()
-        for v in data:
-            entries_count += 1
-            validate_taskdata_entry(v, validate_image_content_type)
-            validate_image_content_type = False  # We want to validate only first entry for content type
+        with document_span:
+            response = fetch_document(uri_key, uri, headers, stream=stream and not bulk)
+            with response:
+                if response.status_code == 304 and headers:
+                    # Unchanged since its last successful validation
+                    document_span.set(cached=True)
+                    return cached_count
+                if bulk:
+                    with span(f"{uri_key}.validate", uri=uri) as validate_span:
+                        entries_count = validate_taskdata_json(
+                            document_body(response, document_span), validate_image_content_type, duplicates
+                        )
+                        validate_span.add(entries=entries_count)
+                        validate_span.count_bytes(response.content)
+                    document_span.count_bytes(response.content)
+                else:
+                    parse_span = span(f"{uri_key}.parse", uri=uri, cumulative=True)
+                    validate_span = span(f"{uri_key}.validate", uri=uri, cumulative=True)
+                    with parse_span, validate_span:
+                        if stream:
+                            chunks = document_chunks(response, document_span, parse_span)
+                            data = parse_span.timed_iter(iter_json_array(chunks))
+                        else:
+                            data = parse_span.timed(json.loads)(document_body(response, document_span))
+                            parse_span.count_bytes(response.content)
+                        validate_entry = validate_span.timed(validate_taskdata_entry)
+                        if sample is not None:
+                            entries_count, sampled = sample.sample(data, on_entry)
+                            sample_result = sample.validate(
+                                entries_count,
+                                sampled,
+                                lambda v: validate_entry(v, False),
+                                (lambda v: validate_entry(v, True)) if validate_image_content_type else None,
+                            )
+                        else:
+                            for v in data:
+                                entries_count += 1
+                                validate_entry(v, validate_image_content_type)
+                                validate_image_content_type = False  # We want to validate only first entry for content type
+                                if on_entry is not None:
+                                    on_entry(v)
+                        validate_span.add(entries=entries_count)
+                    document_span.add(bytes=parse_span.bytes)
+            document_span.add(entries=entries_count)
 
     except ValidationError as e:
+        # Bulk errors are located by entry, e.g. ("taskdata_uri", 1, "task_key"): keep the index
         raise_validation_error(
-            location=("taskdata_uri",),
+            location=e.errors()[0]["loc"][:2] if bulk else ("taskdata_uri",),
             error_message=f"Validation failed for {uri}: {e.title}",
             input_data={"taskdata_uri": uri}
         )
-    except RequestException as e:
+    except (request_exception(), ValueError) as e:
         raise_validation_error(
             location=("taskdata_uri",),
             error_message=f"Validation failed for {uri}: {e}",
@@ -499,46 +972,114 @@ def validate_taskdata_uri(manifest: dict):
             input_data={"taskdata_uri": uri}
         )
 
+    first_duplicate = duplicates.first_duplicate() if duplicates is not None and duplicates.rejects() else None
+    if duplicates is not None and first_duplicate is not None:
+        field, index = first_duplicate
+        report = duplicates.report()
+        raise_validation_error(
+            location=(uri_key, index),
+            error_message=(
+                f"Validation failed for {uri}: duplicate taskdata entries "
+                f"{report.duplicates}, first duplicate {field} at entry {index}"
+            ),
+            input_data={uri_key: uri},
+        )
+
+    if sample is not None:
+        return check_sampling_result(uri_key, uri, sample, sample_result)
 
-def validate_manifest_example_images(manifest: dict):
-    """Fetch and validate the example resources."""
+    if cache is not None:
+        cache.set_verdict(uri, response, verdict, entries_count)
+    return entries_count
+
+
+def validate_manifest_example_images(manifest: dict, max_workers: int = CONTENT_TYPE_MAX_WORKERS):
+    """
+    Fetch and validate the example resources.
+
+    Content types of all the example uris are fetched concurrently, with at most
+    `max_workers` HEAD requests in flight, and each uri is fetched only once.
+    """
     question_example = manifest.get("requester_question_example")
     req_res_answer_set = manifest.get("requester_restricted_answer_set", {})
+
+    uris = []
+    if isinstance(question_example, str):
+        uris.append(question_example)
+    elif isinstance(question_example, list):
+        uris.extend(uri for uri in question_example if isinstance(uri, str))
+    if isinstance(req_res_answer_set, dict):
+        uris.extend(extract_answer_uri(req_res_answer_set))
+    content_types = prefetch_content_types(uris, max_workers)
+
     if question_example:
         # some jobs might not have requester_question_example
-        validate_requester_example_image(question_example)
+        validate_requester_example_image(question_example, content_types)
     if req_res_answer_set:
-        validate_requester_restricted_answer_set_uris(req_res_answer_set)
+        validate_requester_restricted_answer_set_uris(req_res_answer_set, content_types)
 
 
 def fetch_data_from_uri(data_uri: str):
     """Fetch data from a given uri."""
+    cache = get_document_cache()
+    headers = cache.conditional_headers(data_uri) if cache is not None else {}
     try:
-        response = requests.get(data_uri, timeout=(3.5, 5))
-        response.raise_for_status()
-        return response.json()
-    except RequestException as e:
+        with span("fetch_data_from_uri", uri=data_uri) as document_span:
+            response = fetch_document("fetch_data_from_uri", data_uri, headers)
+            if cache is not None and headers and response.status_code == 304:
+                body = cache.get_body(data_uri)
+                if body is not None:
+                    document_span.set(cached=True)
+                    return json.loads(decompress(body)[1])
+                # Evicted since the conditional request was prepared
+                response = fetch_document("fetch_data_from_uri", data_uri, {})
+            if cache is not None:
+                cache.set_body(data_uri, response, response.content)
+            with span("fetch_data_from_uri.parse", uri=data_uri) as parse_span:
+                data = json.loads(document_body(response, document_span))
+                parse_span.count_bytes(response.content)
+            document_span.count_bytes(response.content)
+            return data
+    except (request_exception(), ValueError) as e:
         raise_validation_error(
             location=("taskdata_uri", "groundtruth_uri",),
             error_message=f"Failed to fetch data from {data_uri}: {e}"
         )
 
 
-def validate_manifest_uris(manifest: dict):
-    """Fetch & validate manifest's remote objects"""
-    validate_taskdata_uri(manifest)
-    validate_groundtruth_uri(manifest)
+def stream_data_from_uri(data_uri: str, array: bool = False) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream the (key, value) pairs of a JSON object document, or the ("", value) pairs of a
+    JSON array, without validating them. With `array`, object documents are rejected.
+    """
+    try:
+        with span("fetch_data_from_uri", uri=data_uri, stream=True) as document_span:
+            response = fetch_document("fetch_data_from_uri", data_uri, {}, stream=True)
+            with response, span("fetch_data_from_uri.parse", uri=data_uri, cumulative=True) as parse_span:
+                reader = JSONStreamReader(document_chunks(response, document_span, parse_span))
+                entries: Iterator[Tuple[str, Any]]
+                if parse_span.timed(reader.peek)() != "{":
+                    entries = (("", v) for v in reader.iter_array())
+                elif array:
+                    raise ValueError("expected a JSON array")
+                else:
+                    entries = reader.iter_object()
+                yield from parse_span.timed_iter(entries)
+    except (request_exception(), ValueError) as e:
+        raise_validation_error(
+            location=("taskdata_uri", "groundtruth_uri",),
+            error_message=f"Failed to fetch data from {data_uri}: {e}"
+        )
 
 
-def validate_is_verification(manifest: dict):
-    """Check for verification jobs."""
+def validate_manifest_uris(manifest: dict, stream: bool = False, bulk: bool = False):
+    """Fetch & validate manifest's remote objects"""
+    validate_taskdata_uri(manifest, stream=stream, bulk=bulk)
+    validate_groundtruth_uri(manifest, stream=stream)
 
-    request_type = manifest.get("request_type")
-    if request_type == BaseJobTypesEnum.image_drag_drop:
-        task_key = "task_key"
-    else:
-        task_key = "datapoint_uri"
 
+def verification_uris(manifest: dict) -> Tuple[str, str]:
+    """Return (taskdata_uri, groundtruth_uri) of a verification job."""
     taskdata_uri = manifest.get("taskdata_uri")
     gt_uri = manifest.get("groundtruth_uri")
 
@@ -547,16 +1088,57 @@ def validate_is_verification(manifest: dict):
             location=("taskdata_uri", "groundtruth_uri",),
             error_message="Manifest is missing either of groundtruth or taskdata"
         )
+    return taskdata_uri, gt_uri
 
-    taskdata = fetch_data_from_uri(taskdata_uri)
-    groundtruth = fetch_data_from_uri(gt_uri)
 
-    task_keys = {task.get(task_key) for task in taskdata}
-    gt_keys = set(groundtruth.keys())
+def verification_task_key(request_type: Optional[str]) -> str:
+    """Taskdata entry field matching the groundtruth keys of a request type, `datapoint_uri` without one."""
+    if request_type is None:
+        return "datapoint_uri"
+    if request_type == BaseJobTypesEnum.image_drag_drop:
+        return "task_key"
+    return "datapoint_uri"
 
-    if gt_keys != task_keys:
+
+def validate_verification_report(manifest: dict, report: ReconciliationReport):
+    """Check a verification job has no missing, extra or unkeyed entries."""
+    if not report.matches:
         raise_validation_error(
             location=("taskdata_uri", "groundtruth_uri",),
             error_message="All taskdata entries dont have corresponding groundtruth entry",
-            input_data={"taskdata_uri": taskdata_uri, "groundtruth_uri": gt_uri}
+            input_data={
+                "taskdata_uri": manifest.get("taskdata_uri"),
+                "groundtruth_uri": manifest.get("groundtruth_uri"),
+                **report.model_dump(),
+            }
         )
+
+
+def add_taskdata_keys(reconciler: KeyReconciler, taskdata_uri: str) -> None:
+    """Stream the taskdata document, a JSON array, into `reconciler`"""
+    for _, task in stream_data_from_uri(taskdata_uri, array=True):
+        reconciler.add_task(task)
+
+
+def add_groundtruth_keys(reconciler: KeyReconciler, gt_uri: str) -> None:
+    """Stream the groundtruth document into `reconciler`"""
+    for key, value in stream_data_from_uri(gt_uri):
+        reconciler.add_groundtruth(key, value)
+
+
+def validate_is_verification(manifest: dict, directory: Optional[str] = None) -> ReconciliationReport:
+    """
+    Check for verification jobs.
+
+    Both documents are streamed, their keys are compared by a `KeyReconciler` spilling to
+    temporary files of `directory` for very large documents.
+    """
+    taskdata_uri, gt_uri = verification_uris(manifest)
+
+    with KeyReconciler(verification_task_key(manifest.get("request_type")), directory=directory) as reconciler:
+        add_taskdata_keys(reconciler, taskdata_uri)
+        add_groundtruth_keys(reconciler, gt_uri)
+        report = reconciler.report()
+
+    validate_verification_report(manifest, report)
+    return report
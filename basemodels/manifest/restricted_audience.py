@@ -3,6 +3,7 @@ from uuid import UUID
 from typing import Optional, List, Dict, Any
 from pydantic import (
     BaseModel,
+    ConfigDict,
     conint,
     confloat,
     field_validator,
@@ -22,15 +23,18 @@ class RestrictedAudienceConfidenceEnum(str, Enum):
 
 
 class RestrictedAudienceScore(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     score: confloat(ge=0, le=1)
 
 
 class RestrictedPlatform(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     browser_name: Optional[str] = None
     device_os: Optional[str] = None
 
 
 class RestrictedAudience(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     lang: Optional[List[Dict[str, RestrictedAudienceScore]]] = None
     country: Optional[List[Dict[str, RestrictedAudienceScore]]] = None
     sitekey: Optional[List[Dict[str, RestrictedAudienceScore]]] = None
@@ -62,6 +66,9 @@ class RestrictedAudience(BaseModel):
 
     @model_validator(mode="before")
     def validate_score_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(values, dict):
+            # Let the model validation report the type error
+            return values
         for entry, value in values.items():
             if value is None:
                 continue
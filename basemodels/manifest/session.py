@@ -0,0 +1,70 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .data.reconcile import KeyReconciler, ReconciliationReport
+from .manifest import (
+    validate_groundtruth_uri,
+    validate_taskdata_uri,
+    validate_verification_report,
+    verification_task_key,
+    verification_uris,
+)
+
+
+class ManifestValidationResult(BaseModel):
+    """Combined result of the remote validation of a manifest"""
+
+    taskdata_entries: Optional[int] = None
+    groundtruth_entries: Optional[int] = None
+    # True if taskdata & groundtruth keys were compared for a verification job
+    verified: bool = False
+    # Comparison of the taskdata & groundtruth keys of a verification job
+    reconciliation: Optional[ReconciliationReport] = None
+
+
+class ManifestValidationSession:
+    """
+    Validate the remote objects of a manifest, downloading every document once.
+
+    Taskdata and groundtruth entries are validated while they are streamed, and for
+    verification jobs their keys are collected in the same pass to be compared at the
+    end, instead of fetching both documents again like `validate_is_verification` does.
+
+    Usage:
+        result = ManifestValidationSession(manifest).validate()
+    """
+    def __init__(self, manifest: dict, stream: bool = True):
+        self.manifest = manifest
+        self.stream = stream
+
+    def validate(self, is_verification: Optional[bool] = None) -> ManifestValidationResult:
+        """
+        Run `validate_manifest_uris` and, for verification jobs, `validate_is_verification`.
+        `is_verification` defaults to the manifest value.
+        """
+        if is_verification is None:
+            is_verification = bool(self.manifest.get("is_verification"))
+        if not is_verification:
+            return ManifestValidationResult(
+                taskdata_entries=validate_taskdata_uri(self.manifest, stream=self.stream),
+                groundtruth_entries=validate_groundtruth_uri(self.manifest, stream=self.stream),
+            )
+
+        verification_uris(self.manifest)
+        with KeyReconciler(verification_task_key(self.manifest.get("request_type"))) as reconciler:
+            taskdata_entries = validate_taskdata_uri(self.manifest, stream=self.stream, on_entry=reconciler.add_task)
+            groundtruth_entries = validate_groundtruth_uri(
+                self.manifest,
+                stream=self.stream,
+                on_entry=reconciler.add_groundtruth,
+            )
+            report = reconciler.report()
+        validate_verification_report(self.manifest, report)
+
+        return ManifestValidationResult(
+            taskdata_entries=taskdata_entries,
+            groundtruth_entries=groundtruth_entries,
+            verified=True,
+            reconciliation=report,
+        )
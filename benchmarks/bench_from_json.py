@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compare Manifest.from_json_bytes with json.loads followed by Manifest(**d).
+
+Usage: PYTHONPATH=. python benchmarks/bench_from_json.py [taskdata entries ...]
+"""
+import json
+import sys
+import timeit
+import uuid
+
+from basemodels import Manifest
+
+
+def make_manifest_json(entries: int) -> bytes:
+    manifest = {
+        "job_mode": "batch",
+        "request_type": "image_label_binary",
+        "job_total_tasks": max(entries, 1),
+        "task_bid_price": 1.0,
+        "oracle_stake": 0.05,
+        "requester_question": {"en": "Is there a cat?"},
+        "requester_restricted_answer_set": {"0": {"en": "yes"}, "1": {"en": "no"}},
+        "restricted_audience": {"lang": [{"en-us": {"score": 0.9}}]},
+    }
+    if entries:
+        manifest["taskdata"] = [
+            {
+                "task_key": str(uuid.UUID(int=i)),
+                "datapoint_uri": f"https://domain.com/{i}/file.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            }
+            for i in range(entries)
+        ]
+    else:
+        manifest["taskdata_uri"] = "https://domain.com/taskdata.json"
+    return json.dumps(manifest).encode()
+
+
+def main(sizes):
+    for entries in sizes:
+        data = make_manifest_json(entries)
+        number = max(1, 10000 // max(entries, 1))
+        old = min(timeit.repeat(lambda: Manifest(**json.loads(data)), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: Manifest.from_json_bytes(data), number=number, repeat=3)) / number
+        print(f"{entries:>8} taskdata entries  json.loads + Manifest(**d) {old * 1000:9.3f}ms  "
+              f"from_json_bytes {new * 1000:9.3f}ms  x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [0, 100, 10000])
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare whole-document groundtruth validation with the per-entry wrapper model path it replaced.
+
+The wrapper models, one `{"data": value}` pydantic model per key & entry type validated entry by
+entry, are rebuilt here from the groundtruth entry types.
+
+Usage: PYTHONPATH=. python benchmarks/bench_groundtruth.py [entries ...]
+"""
+import sys
+import timeit
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from basemodels.manifest.data import groundtruth
+from basemodels.manifest.data.groundtruth import validate_groundtruth_data
+
+REQUEST_TYPES = ("image_label_binary", "image_label_area_select", "image_drag_drop")
+
+
+def wrapper_model(type_: Any) -> Type[BaseModel]:
+    return create_model(
+        "WrapperModel",
+        __config__=ConfigDict(arbitrary_types_allowed=True),
+        data=(Optional[type_], None),
+    )
+
+
+def entry_models(request_type: str) -> Tuple[Type[BaseModel], Type[BaseModel]]:
+    key_types = groundtruth.groundtruth_entry_key_types_map
+    key_type = key_types.get(request_type, groundtruth.groundtruth_entry_key_type)
+    return wrapper_model(key_type), wrapper_model(groundtruth.groundtruth_entry_types_map[request_type])
+
+
+def make_groundtruth(request_type: str, entries: int) -> dict:
+    if request_type == "image_label_binary":
+        return {f"https://domain.com/{i}/file.jpeg": ["false", "true", "false"] for i in range(entries)}
+    if request_type == "image_label_area_select":
+        polygon = {"entity_name": 0, "entity_type": "gate", "entity_coords": [275, 184, 454, 183, 453, 366]}
+        return {f"https://domain.com/{i}/file.jpeg": [[polygon, polygon]] for i in range(entries)}
+    entity = {"entity_name": "04606112-4b9d-455f-8f43-9cc1a9bca185", "entity_type": "d", "entity_coords": [1, 2]}
+    return {f"81fb76f3-3906-4fbd-8168-{i:012d}": [entity] for i in range(entries)}
+
+
+def wrapper_model_path(data: dict, key_model: Type[BaseModel], value_model: Type[BaseModel]):
+    for key, value in data.items():
+        key_model.model_validate({"data": key})
+        value_model.model_validate({"data": value})
+
+
+def main(sizes):
+    for request_type in REQUEST_TYPES:
+        key_model, value_model = entry_models(request_type)
+        for entries in sizes:
+            data = make_groundtruth(request_type, entries)
+            old = min(timeit.repeat(lambda: wrapper_model_path(data, key_model, value_model), number=1, repeat=3))
+            new = min(timeit.repeat(lambda: validate_groundtruth_data(data, request_type, False), number=1, repeat=3))
+            print(f"{request_type:<24} {entries:>8} entries  wrapper models {old:8.3f}s  "
+                  f"adapter {new:8.3f}s  x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Time `import basemodels` in fresh interpreters, pydantic itself included.
+
+The exit status is 1 if the fastest import takes more than the budget (seconds).
+
+Usage: PYTHONPATH=. python benchmarks/bench_import_time.py [budget] [repeat]
+"""
+import statistics
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET = 0.35
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import basemodels
+print(time.perf_counter() - start)
+"""
+
+
+def import_time() -> float:
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+def main(budget: float, repeat: int) -> int:
+    timings = [import_time() for _ in range(repeat)]
+    print(f"import basemodels  min {min(timings) * 1000:.0f}ms  median {statistics.median(timings) * 1000:.0f}ms  "
+          f"budget {budget * 1000:.0f}ms")
+    return 0 if min(timings) <= budget else 1
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sys.exit(main(float(args[0]) if args else IMPORT_TIME_BUDGET, int(args[1]) if len(args) > 1 else 10))
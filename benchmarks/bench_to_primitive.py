@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare Manifest.to_primitive with the former model_dump_json/json.loads round trip.
+
+Usage: PYTHONPATH=. python benchmarks/bench_to_primitive.py [taskdata entries ...]
+"""
+import json
+import sys
+import timeit
+import uuid
+
+from basemodels import Manifest
+from basemodels.manifest.restricted_audience import RestrictedAudience
+
+
+def make_manifest(entries: int) -> Manifest:
+    return Manifest(
+        job_mode="batch",
+        request_type="image_label_binary",
+        job_total_tasks=entries,
+        task_bid_price=1.0,
+        oracle_stake=0.05,
+        requester_question={"en": "Is there a cat?"},
+        restricted_audience={"lang": [{"en-us": {"score": 0.9}}]},
+        taskdata=[
+            {
+                "task_key": str(uuid.UUID(int=i)),
+                "datapoint_uri": f"https://domain.com/{i}/file.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            }
+            for i in range(entries)
+        ],
+    )
+
+
+def json_round_trip(manifest: Manifest) -> dict:
+    d = json.loads(manifest.model_dump_json())
+    if isinstance(manifest.restricted_audience, RestrictedAudience):
+        d["restricted_audience"] = manifest.restricted_audience.to_primitive()
+    return d
+
+
+def main(sizes):
+    for entries in sizes:
+        manifest = make_manifest(entries)
+        old = min(timeit.repeat(lambda: json_round_trip(manifest), number=1, repeat=3))
+        new = min(timeit.repeat(manifest.to_primitive, number=1, repeat=3))
+        print(f"{entries:>8} taskdata entries  json round trip {old:8.3f}s  "
+              f"to_primitive {new:8.3f}s  x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite of model construction, serialization and remote validation.
+
+Every scenario is parameterized by request type and/or taskdata size. Remote validation
+runs against a local HTTP server. Results are written as JSON to compare releases:
+
+    PYTHONPATH=. python benchmarks/suite.py -o results-1.3.6.json
+    PYTHONPATH=. python benchmarks/suite.py --filter 'uri' --compare results-1.3.6.json
+
+Usage: PYTHONPATH=. python benchmarks/suite.py [--sizes 10 1000] [--filter REGEX]
+       [--repeat N] [--min-time SECONDS] [-o results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import platform
+import re
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+import pydantic
+
+from basemodels import Manifest
+from basemodels.constants import BaseJobTypesEnum
+from basemodels.manifest.data.groundtruth import validate_groundtruth_entry
+from basemodels.manifest.data.synthetic import SyntheticData, json_array_chunks, json_object_chunks
+from basemodels.manifest.manifest import validate_groundtruth_uri, validate_taskdata_uri
+
+DEFAULT_SIZES = [10, 1000, 10000]
+NESTED_MANIFESTS = [10, 100, 1000]
+GROUNDTRUTH_ENTRIES = 1000
+SEED = 0
+
+REQUEST_TYPES = [request_type.value for request_type in BaseJobTypesEnum]
+
+
+class Scenario(NamedTuple):
+    name: str
+    params: Dict[str, Any]
+    # Number of entries, manifests... handled by a single run, for per item timings
+    items: int
+    run: Callable[[], Any]
+
+
+class DocumentServer:
+    """Local HTTP server of in-memory documents. HEAD requests are answered as JPEG images."""
+
+    def __init__(self):
+        documents = self.documents = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are separate writes, avoid delayed ACK stalls on keep-alive connections
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                body = documents.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add(self, path: str, chunks: Iterator[str]) -> str:
+        self.documents[path] = "".join(chunks).encode()
+        return self.url + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def scenarios(sizes: List[int], server: DocumentServer) -> Iterator[Scenario]:
+    synthetic = SyntheticData(SEED)
+    remote = SyntheticData(SEED, base_uri=server.url)
+
+    for request_type in REQUEST_TYPES:
+        for entries in sizes:
+            data = synthetic.manifest(request_type, entries)
+            params = {"request_type": request_type, "taskdata_entries": entries}
+            yield Scenario("manifest_construction", params, max(entries, 1), lambda data=data: Manifest(**data))
+
+            manifest = Manifest(**data)
+            yield Scenario("to_primitive", params, max(entries, 1), manifest.to_primitive)
+
+    for nested in NESTED_MANIFESTS:
+        data = synthetic.manifest("multi_challenge", 1, nested_manifests=nested)
+        yield Scenario(
+            "multi_challenge_construction", {"nested_manifests": nested}, nested, lambda data=data: Manifest(**data)
+        )
+
+    for request_type in REQUEST_TYPES:
+        entries = list(synthetic.groundtruth_entries(request_type, GROUNDTRUTH_ENTRIES))
+
+        def validate_entries(entries=entries, request_type=request_type):
+            for key, value in entries:
+                validate_groundtruth_entry(key, value, request_type, False)
+
+        yield Scenario("groundtruth_entry", {"request_type": request_type}, len(entries), validate_entries)
+
+    for entries in sizes:
+        uri = server.add(
+            f"/taskdata/{entries}.json", json_array_chunks(remote.taskdata_entries("image_label_binary", entries))
+        )
+        manifest = {"taskdata_uri": uri, "request_type": "image_label_binary"}
+        for mode in ("default", "stream", "bulk"):
+            yield Scenario(
+                "validate_taskdata_uri",
+                {"taskdata_entries": entries, "mode": mode},
+                entries,
+                lambda manifest=manifest, mode=mode: validate_taskdata_uri(
+                    manifest, stream=mode == "stream", bulk=mode == "bulk"
+                ),
+            )
+
+    for request_type in REQUEST_TYPES:
+        uri = server.add(
+            f"/groundtruth/{request_type}.json",
+            json_object_chunks(remote.groundtruth_entries(request_type, GROUNDTRUTH_ENTRIES)),
+        )
+        manifest = {"groundtruth_uri": uri, "request_type": request_type}
+        for mode in ("default", "stream"):
+            yield Scenario(
+                "validate_groundtruth_uri",
+                {"request_type": request_type, "groundtruth_entries": GROUNDTRUTH_ENTRIES, "mode": mode},
+                GROUNDTRUTH_ENTRIES,
+                lambda manifest=manifest, mode=mode: validate_groundtruth_uri(manifest, stream=mode == "stream"),
+            )
+
+
+def measure(scenario: Scenario, repeat: int, min_time: float) -> dict:
+    """Time a scenario, with enough runs per repeat to last at least `min_time` seconds"""
+    start = time.perf_counter()
+    scenario.run()
+    elapsed = time.perf_counter() - start
+    number = max(1, int(min_time / elapsed)) if elapsed > 0 else 1000
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            scenario.run()
+        timings.append((time.perf_counter() - start) / number)
+
+    best = min(timings)
+    return {
+        "name": scenario.name,
+        "params": scenario.params,
+        "items": scenario.items,
+        "number": number,
+        "repeat": repeat,
+        "best_s": best,
+        "mean_s": sum(timings) / len(timings),
+        "per_item_us": best / scenario.items * 1e6,
+    }
+
+
+def result_key(result: dict) -> str:
+    return json.dumps([result["name"], result["params"]], sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="inline & remote taskdata sizes")
+    parser.add_argument("--filter", default="", help="regex on scenario names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum duration of a repeat in seconds")
+    parser.add_argument("-o", "--output", help="JSON results file")
+    parser.add_argument("--compare", help="JSON results file of a previous run")
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = {result_key(result): result for result in json.load(f)["results"]}
+
+    server = DocumentServer()
+    results = []
+    try:
+        for scenario in scenarios(args.sizes, server):
+            if not re.search(args.filter, scenario.name):
+                continue
+            result = measure(scenario, args.repeat, args.min_time)
+            results.append(result)
+
+            line = f"{scenario.name:<30} {json.dumps(scenario.params):<90} {result['best_s'] * 1000:10.3f}ms"
+            before = previous.get(result_key(result))
+            if before:
+                line += f"  x{before['best_s'] / result['best_s']:.2f}"
+            print(line, file=sys.stderr)
+    finally:
+        server.close()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pydantic": pydantic.VERSION,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+import httpretty
+
+from basemodels.__main__ import main
+from basemodels.manifest.bulk import BULK_WINDOW_PER_PROCESS, validate_jsonl, validate_manifest_line
+
+MANIFEST = {
+    "job_mode": "batch",
+    "request_type": "image_label_binary",
+    "job_total_tasks": 1,
+    "task_bid_price": 1.0,
+    "oracle_stake": 0.05,
+    "requester_question": {"en": "Is there a cat?"},
+    "requester_restricted_answer_set": {"0": {"en": "yes"}, "1": {"en": "no"}},
+    "taskdata_uri": "https://domain.com/taskdata.json",
+}
+
+INVALID_MANIFEST = dict(MANIFEST, job_mode="unknown")
+
+
+def jsonl(*manifests) -> list:
+    return [json.dumps(manifest) + "\n" for manifest in manifests]
+
+
+class ValidateJsonlTest(unittest.TestCase):
+    def test_line_reports(self):
+        lines = jsonl(MANIFEST, INVALID_MANIFEST) + ["\n", "{not json\n"]
+        reports = list(validate_jsonl(lines, offline=True, processes=1))
+
+        self.assertEqual([report["line"] for report in reports], [1, 2, 4])
+        self.assertEqual([report["ok"] for report in reports], [True, False, False])
+        self.assertEqual(reports[0]["errors"], [])
+        self.assertEqual(reports[1]["errors"][0]["loc"], ["job_mode"])
+        self.assertEqual(reports[2]["errors"][0]["type"], "json_invalid")
+        for report in reports:
+            self.assertGreaterEqual(report["elapsed_ms"], 0)
+            json.dumps(report)
+
+    def test_process_pool_keeps_input_order(self):
+        manifests = [MANIFEST if i % 3 else INVALID_MANIFEST for i in range(50)]
+        lines = [line.encode() for line in jsonl(*manifests)]
+
+        reports = list(validate_jsonl(lines, offline=True, processes=2, chunksize=4))
+        self.assertEqual([report["line"] for report in reports], list(range(1, 51)))
+        self.assertEqual([report["ok"] for report in reports], [bool(i % 3) for i in range(50)])
+
+    def test_process_pool_bounded_input(self):
+        consumed = []
+
+        def lines():
+            line = jsonl(MANIFEST)[0]
+            while True:
+                consumed.append(line)
+                yield line
+
+        reports = validate_jsonl(lines(), offline=True, processes=2, chunksize=4)
+        self.assertEqual([next(reports)["line"] for _ in range(10)], list(range(1, 11)))
+        reports.close()
+        # At most a window of lines is read ahead of the reports
+        self.assertLessEqual(len(consumed), 10 + 2 * BULK_WINDOW_PER_PROCESS + 1)
+
+    @httpretty.activate
+    def test_online_validation(self):
+        httpretty.register_uri(httpretty.GET, MANIFEST["taskdata_uri"], body=json.dumps([{"task_key": "not_uuid"}]))
+        line = json.dumps(MANIFEST)
+
+        self.assertTrue(validate_manifest_line(line, offline=True)["ok"])
+        # Online by default, like the command line
+        report = validate_manifest_line(line)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["errors"][0]["loc"][0], "taskdata_uri")
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "manifests.jsonl")
+            output = os.path.join(directory, "report.jsonl")
+            with open(source, "w") as f:
+                f.writelines(jsonl(MANIFEST, INVALID_MANIFEST))
+
+            with redirect_stderr(io.StringIO()) as stderr:
+                status = main(["validate", source, "-o", output, "--offline", "-p", "1"])
+            with open(output) as f:
+                reports = [json.loads(line) for line in f]
+
+        self.assertEqual(status, 1)
+        self.assertEqual([report["ok"] for report in reports], [True, False])
+        self.assertIn("2 manifests validated, 1 invalid", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
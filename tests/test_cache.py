@@ -0,0 +1,238 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import httpretty
+from pydantic import ValidationError
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data import taskdata, groundtruth, helpers
+from basemodels.manifest.data.cache import (
+    ContentTypeCache,
+    DocumentCache,
+    MemoryCacheBackend,
+    set_content_type_cache,
+    get_document_cache,
+    set_document_cache,
+)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class MemoryCacheBackendTest(unittest.TestCase):
+    def test_lru_eviction(self):
+        backend = MemoryCacheBackend(maxsize=2)
+        backend.set("a", "image/jpeg", 60)
+        backend.set("b", "image/png", 60)
+        backend.get("a")
+        backend.set("c", "image/gif", 60)
+
+        self.assertEqual(len(backend), 2)
+        self.assertEqual(backend.get("a"), "image/jpeg")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), "image/gif")
+
+    def test_ttl_eviction(self):
+        timer = FakeTimer()
+        backend = MemoryCacheBackend(timer=timer)
+        backend.set("a", "image/jpeg", 10)
+
+        timer.now = 9
+        self.assertEqual(backend.get("a"), "image/jpeg")
+        timer.now = 10
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(len(backend), 0)
+
+
+@httpretty.activate
+class ContentTypeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ContentTypeCache()
+        set_content_type_cache(self.cache)
+
+    def tearDown(self):
+        set_content_type_cache(None)
+
+    def test_shared_by_all_call_sites(self):
+        uri = "https://domain.com/file1.jpg"
+        httpretty.register_uri(httpretty.HEAD, uri, **{"Content-Type": "image/jpeg"})
+
+        helpers.validate_content_type(uri)
+        taskdata.validate_content_type(uri)
+        groundtruth.validate_content_type(uri)
+
+        self.assertEqual(len(httpretty.latest_requests()), 1)
+        self.assertEqual(self.cache.stats(), {"hits": 2, "misses": 1})
+
+    def test_unsupported_type_is_cached(self):
+        uri = "https://domain.com/file1.html"
+        httpretty.register_uri(httpretty.HEAD, uri, **{"Content-Type": "text/html"})
+
+        for validate_content_type in (taskdata.validate_content_type, groundtruth.validate_content_type):
+            with self.assertRaises(ValidationError):
+                validate_content_type(uri)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_concurrent_counters(self):
+        uris = [f"https://domain.com/file{index}.jpg" for index in range(100)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in executor.map(lambda uri: self.cache.get_content_type(uri, lambda _: "image/jpeg"), uris * 50):
+                pass
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 5000)
+        self.assertGreaterEqual(stats["misses"], 100)
+
+    def test_request_errors_are_not_cached(self):
+        uri = "https://domain.com/missing.jpg"
+        httpretty.register_uri(httpretty.HEAD, uri, status=404)
+
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                taskdata.validate_content_type(uri)
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 2})
+
+
+@httpretty.activate
+class DocumentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        set_document_cache(DocumentCache(self.directory.name))
+        self.etag = '"v1"'
+        self.responses = []
+
+    def tearDown(self):
+        set_document_cache(None)
+        self.directory.cleanup()
+
+    def register_document(self, uri, body):
+        def callback(request, uri, response_headers):
+            response_headers["ETag"] = self.etag
+            if request.headers.get("If-None-Match") == self.etag:
+                self.responses.append(304)
+                return [304, response_headers, ""]
+            self.responses.append(200)
+            return [200, response_headers, json.dumps(body)]
+
+        httpretty.register_uri(httpretty.GET, uri, body=callback)
+
+    def test_taskdata_and_groundtruth_uri(self):
+        taskdata_body = [
+            {
+                "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+                "datapoint_uri": "https://domain.com/file1.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            }
+        ] * 3
+        groundtruth_body = {"https://domain.com/file1.jpg": ["false", "true"]}
+        self.register_document("https://td.com", taskdata_body)
+        self.register_document("https://gt.com", groundtruth_body)
+        td_manifest = {"taskdata_uri": "https://td.com", "request_type": "text_multiple_choice_one_option"}
+        gt_manifest = {"groundtruth_uri": "https://gt.com", "request_type": "text_multiple_choice_one_option"}
+
+        for _ in range(2):
+            self.assertEqual(manifest.validate_taskdata_uri(td_manifest), 3)
+            self.assertEqual(manifest.validate_groundtruth_uri(gt_manifest), 1)
+        self.assertEqual(self.responses, [200, 200, 304, 304])
+
+        # A new version of the document is validated again
+        self.etag = '"v2"'
+        self.assertEqual(manifest.validate_taskdata_uri(td_manifest, stream=True), 3)
+        self.assertEqual(manifest.validate_taskdata_uri(td_manifest, bulk=True), 3)
+        self.assertEqual(self.responses[4:], [200, 304])
+
+        # Verdicts are cached per request type
+        td_manifest["request_type"] = "text_label_multiple_span_select"
+        manifest.validate_taskdata_uri(td_manifest)
+        self.assertEqual(self.responses[6:], [200])
+
+    def test_invalid_document_is_not_cached(self):
+        self.register_document("https://td.com", [{"task_key": "not_uuid"}])
+
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com"})
+        self.assertEqual(self.responses, [200, 200])
+
+    def test_fetch_data_from_uri(self):
+        body = {"https://domain.com/file1.jpg": ["false"]}
+        self.register_document("https://gt.com", body)
+
+        for _ in range(2):
+            self.assertEqual(manifest.fetch_data_from_uri("https://gt.com"), body)
+        self.assertEqual(self.responses, [200, 304])
+
+    def test_evicted_body(self):
+        body = {"https://domain.com/file1.jpg": ["false"]}
+        self.register_document("https://gt.com", body)
+        cache = get_document_cache()
+        manifest.fetch_data_from_uri("https://gt.com")
+        headers = cache.conditional_headers("https://gt.com")
+
+        # Evicted between the conditional headers and the 304 response
+        os.remove(cache._path("https://gt.com", ".body"))
+        with mock.patch.object(cache, "conditional_headers", return_value=headers):
+            self.assertEqual(manifest.fetch_data_from_uri("https://gt.com"), body)
+        self.assertEqual(self.responses, [200, 304, 200])
+
+    def test_unconditional_304(self):
+        # A 304 response to a request without conditional headers has no cached document to serve
+        httpretty.register_uri(httpretty.GET, "https://td.com", status=304, body="")
+        td_manifest = {"taskdata_uri": "https://td.com", "groundtruth_uri": "https://td.com"}
+
+        for cache in (get_document_cache(), None):
+            set_document_cache(cache)
+            for validate in (
+                manifest.validate_taskdata_uri,
+                manifest.validate_groundtruth_uri,
+                lambda data: manifest.fetch_data_from_uri(data["taskdata_uri"]),
+            ):
+                with self.assertRaises(ValidationError):
+                    validate(td_manifest)
+
+    def test_max_size(self):
+        cache = DocumentCache(self.directory.name, max_size=2500)
+        set_document_cache(cache)
+        for index in range(4):
+            self.register_document(f"https://gt{index}.com", {f"https://domain.com/{index}.jpg": ["false"] * 100})
+        for index in range(4):
+            manifest.fetch_data_from_uri(f"https://gt{index}.com")
+            time.sleep(0.01)
+            # Two documents fit, the least recently used one is evicted
+            self.assertIsNotNone(cache.get_body("https://gt0.com"))
+            time.sleep(0.01)
+
+        cached = [index for index in range(4) if cache.get_body(f"https://gt{index}.com") is not None]
+        self.assertEqual(cached, [0, 3])
+        self.assertEqual(cache.conditional_headers("https://gt1.com"), {})
+        self.assertLessEqual(sum(path.stat().st_size for path in Path(self.directory.name).iterdir()), 2500)
+
+    def test_eviction_scans(self):
+        cache = DocumentCache(self.directory.name, max_size=2500)
+        set_document_cache(cache)
+        for index in range(4):
+            self.register_document(f"https://gt{index}.com", {f"https://domain.com/{index}.jpg": ["false"] * 100})
+
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            manifest.fetch_data_from_uri("https://gt0.com")
+            manifest.fetch_data_from_uri("https://gt1.com")
+            # The directory is scanned on the first write, then only once over max_size
+            self.assertEqual(scandir.call_count, 1)
+            manifest.fetch_data_from_uri("https://gt2.com")
+            self.assertEqual(scandir.call_count, 2)
+        self.assertLessEqual(sum(path.stat().st_size for path in Path(self.directory.name).iterdir()), 2500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from basemodels.manifest.data.compact import CompactTaskData, set_compact_taskdata
+from basemodels.manifest.data.synthetic import SyntheticData
+from basemodels.manifest.manifest import Manifest
+
+
+class CompactTaskDataTest(unittest.TestCase):
+    def setUp(self):
+        self.data = SyntheticData(seed=1).manifest("image_label_binary", taskdata_entries=3000)
+        self.data.pop("taskdata_uri", None)
+        self.data["job_id"] = "5d5dfa33-32ff-4b5b-9d4f-de8b73a9c8a4"
+        taskdata = self.data["taskdata"]
+        taskdata[1]["polygon"] = [1, 2, 3, 4, 5, 6]
+        taskdata[2]["polygon"] = []
+        taskdata[3]["datapoint_text"] = {"en": "text"}
+        taskdata[4]["entities"] = [
+            {
+                "entity_id": "7f3c6f1c-6d84-4a55-bc5d-6f1c6f3c6d84",
+                "entity_uri": "https://domain.com/entity.jpg",
+                "coords": [1, 2],
+                "size": [3, 4],
+            }
+        ]
+        # Same image in several tasks
+        taskdata[5]["datapoint_uri"] = taskdata[6]["datapoint_uri"] = taskdata[0]["datapoint_uri"]
+        self.manifest = Manifest(**self.data)
+        set_compact_taskdata(True)
+        self.compact = Manifest(**self.data)
+
+    def tearDown(self):
+        set_compact_taskdata(False)
+
+    def test_store(self):
+        self.assertIsInstance(self.compact.taskdata, CompactTaskData)
+        self.assertEqual(len(self.compact.taskdata), 3000)
+        self.assertEqual(self.compact.taskdata._uris.distinct, 2998)
+        self.assertLess(self.compact.taskdata.nbytes(), 200 * 3000)
+
+    def test_large_polygon(self):
+        self.data["taskdata"][1]["polygon"] = [2 ** 70, -2 ** 63, 3, 4, 5, 6]
+        compact = Manifest(**self.data)
+
+        self.assertEqual(compact.taskdata[1].polygon, [2 ** 70, -2 ** 63, 3, 4, 5, 6])
+        self.assertEqual(compact.taskdata[2].polygon, [])
+        set_compact_taskdata(False)
+        self.assertEqual(compact.to_primitive(), Manifest(**self.data).to_primitive())
+
+    def test_rows(self):
+        rows, compact_rows = self.manifest.taskdata, self.compact.taskdata
+
+        self.assertEqual(compact_rows, rows)
+        for index in (0, 1, 2, 3, 4, -1):
+            self.assertEqual(compact_rows[index], rows[index])
+            self.assertEqual(compact_rows[index].model_fields_set, rows[index].model_fields_set)
+        self.assertEqual(compact_rows[1].polygon, [1, 2, 3, 4, 5, 6])
+        self.assertEqual((compact_rows[0].polygon, compact_rows[2].polygon), (None, []))
+        self.assertIsInstance(compact_rows[0].task_key, UUID)
+        self.assertEqual(compact_rows[10:20:3], rows[10:20:3])
+        with self.assertRaises(IndexError):
+            compact_rows[3000]
+
+    def test_serialization(self):
+        self.assertEqual(self.compact.to_primitive(), self.manifest.to_primitive())
+        self.assertEqual(self.compact.model_dump(), self.manifest.model_dump())
+        self.assertEqual(self.compact.model_dump_json(), self.manifest.model_dump_json())
+        self.assertEqual(
+            self.compact.model_dump(mode="json", exclude_none=True),
+            self.manifest.model_dump(mode="json", exclude_none=True),
+        )
+
+    def test_check(self):
+        self.compact.check()
+        self.assertIsInstance(self.compact.check(return_new=True).taskdata, CompactTaskData)
+
+    def test_errors(self):
+        self.data["taskdata"][2500]["task_key"] = "not an uuid"
+
+        with self.assertRaises(ValidationError) as context:
+            Manifest(**self.data)
+        self.assertEqual(context.exception.errors()[0]["loc"], ("taskdata", 2500, "task_key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
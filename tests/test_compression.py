@@ -0,0 +1,142 @@
+import bz2
+import gzip
+import json
+import lzma
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpretty
+from pydantic import ValidationError
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data import compression
+from basemodels.manifest.data.compression import decompress, decompressed_chunks
+from basemodels.manifest.data.instrumentation import SpanRecorder, instrument
+from basemodels.manifest.data.synthetic import SyntheticData
+from basemodels.manifest.data.transport import FileTransport, MemoryTransport, set_scheme_transport, set_transport
+
+REQUEST_TYPE = "text_multiple_choice_one_option"
+TASKDATA = list(SyntheticData(seed=1).taskdata_entries(REQUEST_TYPE, 200))
+GROUNDTRUTH = dict(SyntheticData(seed=1).groundtruth_entries("text_label_multiple_span_select", 200))
+COMPRESSIONS = {"gzip": gzip.compress, "bzip2": bz2.compress, "xz": lzma.compress}
+
+
+def split(data: bytes, size: int):
+    return [memoryview(data)[i:i + size] for i in range(0, len(data), size)]
+
+
+class DecompressTest(unittest.TestCase):
+    def test_decompressed_chunks(self):
+        data = json.dumps(TASKDATA).encode()
+
+        for name, compress in COMPRESSIONS.items():
+            for size in (1, 5, 4096):
+                compression, chunks = decompressed_chunks(split(compress(data), size), max_length=1000)
+                chunks = list(chunks)
+                self.assertEqual(compression, name)
+                self.assertEqual(b"".join(chunks), data)
+                self.assertLessEqual(max(len(chunk) for chunk in chunks), 1000)
+
+    def test_uncompressed(self):
+        chunks = split(b'[{"a": 1}]', 3)
+        compression, passed = decompressed_chunks(chunks)
+        self.assertIsNone(compression)
+        self.assertEqual(list(passed), chunks)
+        self.assertEqual(decompress(b"[]"), (None, b"[]"))
+        self.assertEqual(decompress(b""), (None, b""))
+
+    def test_concatenated_streams(self):
+        self.assertEqual(decompress(gzip.compress(b"[1, ") + gzip.compress(b"2]")), ("gzip", b"[1, 2]"))
+        self.assertEqual(decompress(bz2.compress(b"[1, ") + bz2.compress(b"2]")), ("bzip2", b"[1, 2]"))
+
+    def test_invalid(self):
+        for name, compress in COMPRESSIONS.items():
+            compressed = compress(json.dumps(TASKDATA).encode())
+            for invalid in (compressed[:-8], compressed[:10] + b"\x00" * 100):
+                with self.assertRaisesRegex(ValueError, f"invalid {name} document"):
+                    decompress(invalid)
+
+    def test_max_size(self):
+        bomb = b"[" + b" " * 10 * 1024 * 1024 + b"]"
+        for name, compress in COMPRESSIONS.items():
+            compressed = compress(bomb)
+            self.assertEqual(decompress(compressed, max_size=len(bomb)), (name, bomb))
+            with self.assertRaisesRegex(ValueError, f"{name} document larger than 1000 bytes"):
+                decompress(compressed, max_size=1000)
+
+            chunks = decompressed_chunks(split(compressed, 100), max_size=len(bomb) - 1)[1]
+            with self.assertRaisesRegex(ValueError, "larger than"):
+                for chunk in chunks:
+                    self.assertLessEqual(len(chunk), compression.DECOMPRESSED_CHUNK_SIZE)
+
+
+class CompressedDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = MemoryTransport()
+        set_transport(self.transport)
+        self.directory = tempfile.TemporaryDirectory()
+        set_scheme_transport("file", FileTransport(root=self.directory.name))
+
+    def tearDown(self):
+        set_scheme_transport("file", None)
+        set_transport(None)
+        self.directory.cleanup()
+
+    def test_taskdata_uri(self):
+        for name, compress in COMPRESSIONS.items():
+            uri = f"https://td.com/taskdata.json.{name}"
+            self.transport.add(uri, compress(json.dumps(TASKDATA).encode()))
+            td_manifest = {"taskdata_uri": uri, "request_type": REQUEST_TYPE}
+
+            for options in ({}, {"stream": True}, {"bulk": True}):
+                recorder = SpanRecorder()
+                with instrument(recorder):
+                    self.assertEqual(manifest.validate_taskdata_uri(td_manifest, **options), 200)
+                document_span = next(span for span in recorder.spans if span.name == "taskdata_uri")
+                self.assertEqual(document_span.attributes["compression"], name)
+            self.assertEqual(manifest.fetch_data_from_uri(uri), TASKDATA)
+
+    def test_groundtruth_uri(self):
+        path = Path(self.directory.name, "groundtruth.json.xz")
+        path.write_bytes(lzma.compress(json.dumps(GROUNDTRUTH).encode()))
+        gt_manifest = {"groundtruth_uri": path.as_uri(), "request_type": "text_label_multiple_span_select"}
+
+        for stream in (False, True):
+            self.assertEqual(manifest.validate_groundtruth_uri(gt_manifest, stream=stream), 200)
+
+    def test_truncated(self):
+        self.transport.add("https://td.com/taskdata.json.gz", gzip.compress(json.dumps(TASKDATA).encode())[:-100])
+
+        for stream in (False, True):
+            with self.assertRaises(ValidationError) as context:
+                manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com/taskdata.json.gz"}, stream=stream)
+            self.assertIn("invalid gzip document", context.exception.errors()[0]["msg"])
+
+    def test_decompression_bomb(self):
+        self.transport.add("https://td.com/taskdata.json.gz", gzip.compress(b"[" + b" " * 1024 * 1024 + b"]"))
+
+        with mock.patch.object(compression, "DECOMPRESSED_SIZE_MAX", 64 * 1024):
+            for options in ({}, {"stream": True}, {"bulk": True}):
+                with self.assertRaises(ValidationError) as context:
+                    manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com/taskdata.json.gz"}, **options)
+                self.assertIn("larger than 65536 bytes once decompressed", context.exception.errors()[0]["msg"])
+
+    @httpretty.activate
+    def test_content_encoding(self):
+        set_transport(None)
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://td.com/taskdata.json",
+            body=gzip.compress(json.dumps(TASKDATA).encode()),
+            adding_headers={"Content-Encoding": "gzip"},
+        )
+
+        for stream in (False, True):
+            td_manifest = {"taskdata_uri": "https://td.com/taskdata.json", "request_type": REQUEST_TYPE}
+            self.assertEqual(manifest.validate_taskdata_uri(td_manifest, stream=stream), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
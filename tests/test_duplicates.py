@@ -0,0 +1,134 @@
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data.compact import set_compact_taskdata
+from basemodels.manifest.data.duplicates import DuplicateIndex, FingerprintSet
+from basemodels.manifest.data.lazy import set_lazy_taskdata
+from basemodels.manifest.data.synthetic import SyntheticData
+from basemodels.manifest.data.transport import MemoryTransport, set_transport
+from basemodels.manifest.manifest import Manifest
+
+REQUEST_TYPE = "image_label_binary"
+
+
+def taskdata_with_duplicates():
+    taskdata = list(SyntheticData(seed=1).taskdata_entries(REQUEST_TYPE, 2000))
+    taskdata[1500]["task_key"] = taskdata[3]["task_key"].upper()
+    taskdata[1600]["datapoint_uri"] = taskdata[4]["datapoint_uri"]
+    taskdata[1700]["datapoint_uri"] = taskdata[4]["datapoint_uri"]
+    taskdata[1800]["datapoint_hash"] = taskdata[5]["datapoint_hash"]
+    return taskdata
+
+
+class DuplicateIndexTest(unittest.TestCase):
+    def test_fingerprint_set(self):
+        fingerprints = FingerprintSet(capacity=4)
+
+        self.assertTrue(all(fingerprints.add(value) for value in range(1, 10001)))
+        self.assertFalse(any(fingerprints.add(value) for value in range(1, 10001, 7)))
+        self.assertEqual(len(fingerprints), 10000)
+
+    def test_report(self):
+        duplicates = DuplicateIndex()
+        duplicates.extend(taskdata_with_duplicates())
+        duplicates.add({"task_key": None, "datapoint_text": {"en": "text"}})
+
+        report = duplicates.report()
+        self.assertEqual(report.entries, 2001)
+        self.assertEqual(report.duplicates, {"task_key": 1, "datapoint_uri": 2, "datapoint_hash": 1})
+        self.assertEqual(
+            report.first_duplicates, {"task_key": [1500], "datapoint_uri": [1600, 1700], "datapoint_hash": [1800]}
+        )
+        self.assertEqual(duplicates.first_duplicate(), ("task_key", 1500))
+        self.assertFalse(duplicates.rejects())
+
+    def test_invalid_task_keys(self):
+        duplicates = DuplicateIndex()
+        for task_key in ("z" * 36, "Z" * 36, "z" * 36, "not an uuid", 12):
+            duplicates.add({"task_key": task_key})
+
+        self.assertEqual(duplicates.report().duplicates["task_key"], 1)
+        self.assertEqual(duplicates.report().first_duplicates["task_key"], [2])
+
+    def test_non_canonical_task_keys(self):
+        task_key = "407fdd93-687a-46bb-b578-89eb96b4109d"
+        duplicates = DuplicateIndex(fields=("task_key",))
+        for value in (task_key, "{" + task_key + "}", task_key.replace("-", ""), "0x" + task_key[2:],
+                      "0x" + task_key.replace("-", "")[2:], task_key[:8] + "_" + task_key[9:]):
+            duplicates.add({"task_key": value})
+
+        # Only the forms valid as a task key are the same UUID
+        self.assertEqual(duplicates.report().first_duplicates["task_key"], [1, 2])
+
+    def test_fields(self):
+        duplicates = DuplicateIndex(fields=("datapoint_hash",), reject=True)
+        duplicates.extend(taskdata_with_duplicates())
+
+        self.assertEqual(duplicates.report().duplicates, {"datapoint_hash": 1})
+        self.assertTrue(duplicates.rejects())
+
+
+class ValidateDuplicatesTest(unittest.TestCase):
+    def setUp(self):
+        taskdata = taskdata_with_duplicates()
+        self.transport = MemoryTransport()
+        self.transport.add("https://td.com", json.dumps(taskdata))
+        self.transport.add(taskdata[0]["datapoint_uri"], headers={"Content-Type": "image/jpeg"})
+        set_transport(self.transport)
+        self.td_manifest = {"taskdata_uri": "https://td.com", "request_type": REQUEST_TYPE}
+
+    def tearDown(self):
+        set_transport(None)
+
+    def test_validate_taskdata_uri(self):
+        reports = []
+        for options in ({}, {"stream": True}, {"bulk": True}):
+            duplicates = DuplicateIndex()
+            self.assertEqual(manifest.validate_taskdata_uri(self.td_manifest, duplicates=duplicates, **options), 2000)
+            reports.append(duplicates.report())
+
+        self.assertEqual(reports[0].duplicates, {"task_key": 1, "datapoint_uri": 2, "datapoint_hash": 1})
+        self.assertEqual(reports[1], reports[0])
+        self.assertEqual(reports[2], reports[0])
+
+    def test_normalized_uris(self):
+        taskdata = taskdata_with_duplicates()[:100]
+        taskdata[50]["datapoint_uri"] = taskdata[6]["datapoint_uri"].replace("https://", "HTTPS://")
+        self.transport.add("https://td.com", json.dumps(taskdata))
+
+        # Stream mode indexes the raw entries, bulk mode the validated ones
+        for options in ({"stream": True}, {"bulk": True}):
+            duplicates = DuplicateIndex(fields=("datapoint_uri",))
+            manifest.validate_taskdata_uri(self.td_manifest, duplicates=duplicates, **options)
+            self.assertEqual(duplicates.report().first_duplicates["datapoint_uri"], [50])
+
+    def test_rejected(self):
+        for stream in (False, True):
+            with self.assertRaises(ValidationError) as context:
+                manifest.validate_taskdata_uri(self.td_manifest, stream=stream, duplicates=DuplicateIndex(reject=True))
+
+            error = context.exception.errors()[0]
+            self.assertEqual(error["loc"], ("taskdata_uri", 1500))
+            self.assertIn("first duplicate task_key at entry 1500", error["msg"])
+
+    def test_inline_taskdata(self):
+        data = SyntheticData(seed=1).manifest(REQUEST_TYPE, taskdata_entries=10)
+        data.pop("taskdata_uri", None)
+        data["taskdata"] = taskdata_with_duplicates()
+
+        for setting in (None, set_compact_taskdata, set_lazy_taskdata):
+            if setting is not None:
+                setting(True)
+            try:
+                report = Manifest(**data).find_duplicates()
+            finally:
+                if setting is not None:
+                    setting(False)
+            self.assertEqual(report.duplicates, {"task_key": 1, "datapoint_uri": 2, "datapoint_hash": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Imported on first use only, the import time itself is measured by benchmarks/bench_import_time.py
+LAZY_MODULES = ("requests", "urllib3", "pydantic.v1", "asyncio", "multiprocessing")
+
+IMPORT_SCRIPT = """
+import json, sys
+import basemodels
+print(json.dumps({
+    "modules": [name for name in %r if name in sys.modules],
+    "complete": basemodels.Manifest.__pydantic_complete__,
+}))
+""" % (LAZY_MODULES,)
+
+
+def import_basemodels() -> dict:
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_lazy_modules(self):
+        result = import_basemodels()
+        self.assertEqual(result["modules"], [])
+        # Schemas are built on first use
+        self.assertFalse(result["complete"])
+
+    def test_lazy_exports(self):
+        import basemodels
+        from basemodels.manifest.data.transport import MemoryTransport
+        from basemodels.via import ViaDataManifest
+
+        self.assertIs(basemodels.MemoryTransport, MemoryTransport)
+        self.assertIs(basemodels.ViaDataManifest, ViaDataManifest)
+        with self.assertRaises(AttributeError):
+            basemodels.missing_attribute
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import unittest
+
+import httpretty
+from pydantic import ValidationError
+
+from basemodels import Manifest
+from basemodels.manifest import manifest
+from basemodels.manifest.data.instrumentation import (
+    NULL_SPAN,
+    SpanRecorder,
+    get_instrumentation_hook,
+    instrument,
+    span,
+)
+from basemodels.manifest.data.synthetic import SyntheticData
+
+TASKDATA = [
+    {
+        "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+        "datapoint_uri": "https://domain.com/file1.jpg",
+        "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+    }
+] * 3
+GROUNDTRUTH = {"https://domain.com/file1.jpg": ["false", "true"], "https://domain.com/file2.jpg": ["true"]}
+
+
+class SpanTest(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_instrumentation_hook())
+        self.assertIs(span("taskdata_uri"), NULL_SPAN)
+        func = lambda: None
+        self.assertIs(NULL_SPAN.timed(func), func)
+
+    def test_byte_counts_measured_in_active_spans_only(self):
+        class Body:
+            measured = 0
+
+            def __len__(self):
+                Body.measured += 1
+                return 10
+
+        NULL_SPAN.count_bytes(Body())
+        self.assertEqual(Body.measured, 0)
+        with instrument(SpanRecorder()):
+            with span("taskdata_uri") as active_span:
+                active_span.count_bytes(Body())
+        self.assertEqual((Body.measured, active_span.bytes), (1, 10))
+
+    def test_errors_and_cumulative_spans(self):
+        recorder = SpanRecorder()
+        with instrument(recorder):
+            with self.assertRaises(ValueError):
+                with span("failed", uri="https://domain.com"):
+                    raise ValueError()
+            with span("cumulative", cumulative=True) as cumulative:
+                items = list(cumulative.timed_iter(iter(range(3))))
+        self.assertIsNone(get_instrumentation_hook())
+
+        failed, cumulative = recorder.spans
+        self.assertEqual((failed.name, failed.error, failed.attributes), ("failed", "ValueError", {"uri": "https://domain.com"}))
+        self.assertEqual(items, [0, 1, 2])
+        self.assertGreater(cumulative.duration, 0)
+
+
+@httpretty.activate
+class PipelineInstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.recorder = SpanRecorder()
+        httpretty.register_uri(httpretty.GET, "https://td.com", body=json.dumps(TASKDATA))
+        httpretty.register_uri(httpretty.GET, "https://gt.com", body=json.dumps(GROUNDTRUTH))
+        httpretty.register_uri(httpretty.HEAD, "https://domain.com/file1.jpg", **{"Content-Type": "image/jpeg"})
+
+    def names(self):
+        return [span.name for span in self.recorder.spans]
+
+    def test_validate_taskdata_uri(self):
+        td_manifest = {"taskdata_uri": "https://td.com", "request_type": "image_label_binary"}
+        size = len(json.dumps(TASKDATA))
+
+        for options in ({}, {"stream": True}, {"bulk": True}):
+            self.recorder.spans.clear()
+            with self.subTest(**options), instrument(self.recorder):
+                manifest.validate_taskdata_uri(td_manifest, **options)
+
+            totals = self.recorder.totals()
+            self.assertEqual(totals["taskdata_uri"]["entries"], 3)
+            self.assertEqual(totals["taskdata_uri"]["bytes"], size)
+            self.assertEqual(totals["taskdata_uri.validate"]["entries"], 3)
+            self.assertEqual(totals["content_type"]["count"], 1)
+            self.assertEqual(self.recorder.spans[0].name, "taskdata_uri.request")
+            self.assertEqual(self.recorder.spans[0].attributes["status"], 200)
+            self.assertEqual(self.names()[-1], "taskdata_uri")
+            if not options.get("bulk"):
+                self.assertEqual(totals["taskdata_uri.parse"]["bytes"], size)
+
+    def test_validate_groundtruth_uri(self):
+        gt_manifest = {"groundtruth_uri": "https://gt.com", "request_type": "image_label_binary"}
+
+        for stream in (False, True):
+            self.recorder.spans.clear()
+            with self.subTest(stream=stream), instrument(self.recorder):
+                manifest.validate_groundtruth_uri(gt_manifest, stream=stream)
+
+            totals = self.recorder.totals()
+            self.assertEqual(
+                set(totals),
+                {"groundtruth_uri", "groundtruth_uri.request", "groundtruth_uri.parse", "groundtruth_uri.validate", "content_type"},
+            )
+            self.assertEqual(totals["groundtruth_uri"]["entries"], 2)
+            self.assertEqual(totals["groundtruth_uri.parse"]["bytes"], len(json.dumps(GROUNDTRUTH)))
+
+    def test_failed_validation(self):
+        httpretty.register_uri(httpretty.GET, "https://td.com", status=404)
+
+        with instrument(self.recorder), self.assertRaises(ValidationError):
+            manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com"})
+        self.assertEqual(self.names(), ["taskdata_uri.request", "taskdata_uri"])
+        self.assertEqual(self.recorder.spans[-1].error, "HTTPError")
+
+    def test_fetch_data_from_uri(self):
+        with instrument(self.recorder):
+            manifest.fetch_data_from_uri("https://gt.com")
+        self.assertEqual(self.names(), ["fetch_data_from_uri.request", "fetch_data_from_uri.parse", "fetch_data_from_uri"])
+
+    def test_manifest_construction(self):
+        data = SyntheticData(seed=1).manifest("multi_challenge", 5, nested_manifests=2)
+
+        with instrument(self.recorder):
+            Manifest(**data)
+        self.assertEqual(self.names(), ["nested_manifest.validate"] * 2 + ["manifest.validate"])
+        self.assertEqual(self.recorder.spans[-1].entries, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
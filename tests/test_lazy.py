@@ -0,0 +1,101 @@
+import copy
+import unittest
+
+from pydantic import ValidationError
+
+from basemodels.manifest.data.compact import CompactTaskData, set_compact_taskdata
+from basemodels.manifest.data.lazy import LazyTaskData, set_lazy_taskdata
+from basemodels.manifest.data.synthetic import SyntheticData
+from basemodels.manifest.manifest import Manifest
+
+
+def error_details(error: ValidationError):
+    return [(detail["loc"], detail["type"], detail["msg"]) for detail in error.errors()]
+
+
+class LazyTaskDataTest(unittest.TestCase):
+    def setUp(self):
+        self.data = SyntheticData(seed=1).manifest("image_label_binary", taskdata_entries=3000)
+        self.data.pop("taskdata_uri", None)
+        self.data["job_id"] = "5d5dfa33-32ff-4b5b-9d4f-de8b73a9c8a4"
+        set_lazy_taskdata(True)
+
+    def tearDown(self):
+        set_lazy_taskdata(False)
+
+    def test_header_fields(self):
+        manifest = Manifest(**self.data)
+
+        self.assertEqual((manifest.request_type, manifest.job_mode), ("image_label_binary", "batch"))
+        self.assertIsInstance(manifest.taskdata, LazyTaskData)
+        self.assertEqual(len(manifest.taskdata), 3000)
+        self.assertFalse(manifest.taskdata.validated)
+
+    def test_access(self):
+        set_lazy_taskdata(False)
+        eager = Manifest(**self.data)
+        set_lazy_taskdata(True)
+        manifest = Manifest(**self.data)
+
+        self.assertEqual(manifest.taskdata[2500], eager.taskdata[2500])
+        self.assertEqual(manifest.taskdata[-1], eager.taskdata[-1])
+        self.assertFalse(manifest.taskdata.validated)
+        self.assertEqual(manifest.taskdata, eager.taskdata)
+        self.assertTrue(manifest.taskdata.validated)
+        self.assertEqual(manifest.to_primitive(), eager.to_primitive())
+        self.assertEqual(copy.deepcopy(manifest).taskdata, eager.taskdata)
+
+    def test_deferred_errors(self):
+        self.data["taskdata"][2500]["task_key"] = "not an uuid"
+
+        for method in ("check", "check_full", "to_primitive", "model_dump", "model_dump_json"):
+            manifest = Manifest(**self.data)
+            call = (lambda: manifest.check(full=True)) if method == "check_full" else getattr(manifest, method)
+            with self.assertRaises(ValidationError, msg=method) as context:
+                call()
+            self.assertEqual(context.exception.errors()[0]["loc"], ("taskdata", 2500, "task_key"))
+
+    def test_context(self):
+        set_lazy_taskdata(False)
+        for mode, storage in (("lazy", LazyTaskData), ("compact", CompactTaskData), ("models", list)):
+            manifest = Manifest.model_validate(self.data, context={"taskdata": mode})
+            self.assertIsInstance(manifest.taskdata, storage)
+        self.assertIsInstance(Manifest(**self.data).taskdata, list)
+
+        with self.assertRaises(ValidationError) as context:
+            Manifest.model_validate(self.data, context={"taskdata": "eager"})
+        self.assertEqual(context.exception.errors()[0]["loc"], ("taskdata",))
+
+    def test_compact_and_lazy(self):
+        set_compact_taskdata(True)
+        try:
+            with self.assertRaises(ValidationError) as context:
+                Manifest(**self.data)
+            self.assertIn("can't be enabled together", context.exception.errors()[0]["msg"])
+            # The context overrides the process-wide settings
+            manifest = Manifest.model_validate(self.data, context={"taskdata": "compact"})
+            self.assertIsInstance(manifest.taskdata, CompactTaskData)
+        finally:
+            set_compact_taskdata(False)
+
+    def test_errors(self):
+        self.data["taskdata"][2500]["task_key"] = "not an uuid"
+        self.data["taskdata"][2600]["datapoint_hash"] = "short"
+
+        with self.assertRaises(ValidationError) as context:
+            set_lazy_taskdata(False)
+            Manifest(**self.data)
+        eager_errors = error_details(context.exception)
+        set_lazy_taskdata(True)
+
+        manifest = Manifest(**self.data)
+        # Only the chunk of the invalid entries fails
+        self.assertEqual(str(manifest.taskdata[0].task_key), self.data["taskdata"][0]["task_key"])
+        for access in (lambda: manifest.taskdata[2048], lambda: list(manifest.taskdata), manifest.validate_all):
+            with self.assertRaises(ValidationError) as context:
+                access()
+            self.assertEqual(error_details(context.exception), eager_errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
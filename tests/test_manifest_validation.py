@@ -3,7 +3,7 @@
 import json
 import logging
 import unittest
-from copy import deepcopy
+from copy import copy, deepcopy
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
@@ -301,6 +301,112 @@ class ManifestTest(unittest.TestCase):
         model.request_type = "image_label_area_select"
         self.assertTrue(validate_func(model))
 
+    def test_incremental_check(self):
+        """check() re-validates changed fields and the fields depending on them"""
+        data = get_data()
+        data["requester_restricted_answer_set"] = {"0": {"en": "English Answer 1"}}
+        manifest = basemodels.Manifest(**data)
+        manifest.check(incremental=True)
+
+        # requester_restricted_answer_set depends on request_type
+        manifest.request_type = "image_label_multiple_choice"
+        self.assertRaises(ValidationError, manifest.check, incremental=True)
+        manifest.requester_restricted_answer_set = {"0": {"en": "Answer 1"}, "1": {"en": "Answer 2"}}
+        manifest.check(incremental=True)
+
+        # dates are checked by the model level validator
+        manifest.start_date = int(datetime.now().timestamp())
+        self.assertRaises(ValidationError, manifest.check, incremental=True)
+        manifest.expiration_date = manifest.start_date + 3600
+        manifest.check(incremental=True)
+
+        # check does not change the model values
+        self.assertEqual(manifest.request_type, "image_label_multiple_choice")
+        self.assertEqual(manifest.requester_min_repeats, 1)
+
+    def test_incremental_check_skips_unchanged_fields(self):
+        data = get_data()
+        data.update({"taskdata_uri": None, "taskdata": [deepcopy(TASK)]})
+        manifest = basemodels.Manifest(**data)
+
+        # in-place changes are not tracked, unlike assignments
+        manifest.taskdata[0].datapoint_hash = "short"
+        manifest.check(incremental=True)
+        self.assertRaises(ValidationError, manifest.check)
+
+        manifest.taskdata = [deepcopy(TASK), {"task_key": "not_uuid"}]
+        self.assertRaises(ValidationError, manifest.check, incremental=True)
+
+    def test_incremental_check_nested_manifest(self):
+        nested_manifest = a_nested_manifest(request_type="image_label_area_select")
+        manifest = a_manifest(request_type="multi_challenge", multi_challenge_manifests=[nested_manifest])
+
+        nested_manifest.request_type = "multi_challenge"
+        self.assertRaises(ValidationError, manifest.check, incremental=True)
+
+    def test_incremental_check_reassigned_nested_manifest(self):
+        nested_manifest = a_nested_manifest(request_type="image_label_area_select")
+        manifest = a_manifest(request_type="multi_challenge", multi_challenge_manifests=[nested_manifest])
+
+        nested_manifest.request_type = "multi_challenge"
+        manifest.multi_challenge_manifests = [nested_manifest]
+        self.assertRaises(ValidationError, manifest.check, incremental=True)
+
+    def test_check_in_place_changes(self):
+        """check() validates the whole model by default, in-place changes included"""
+        data = get_data()
+        data.update({"taskdata_uri": None, "taskdata": [deepcopy(TASK)]})
+        manifest = basemodels.Manifest(**data)
+
+        manifest.requester_restricted_answer_set["0"] = "not a dict"
+        self.assertRaises(ValidationError, manifest.check)
+
+    def test_copy_tracks_its_own_changes(self):
+        manifest = basemodels.Manifest(**get_data())
+        copied = manifest.model_copy()
+
+        copied.request_type = "image_label_multiple_choice"
+        self.assertEqual(manifest._dirty_fields, set())
+        self.assertEqual(copied._dirty_fields, {"request_type"})
+        self.assertEqual(copy(manifest)._dirty_fields, set())
+        self.assertEqual(manifest.model_copy(update={"job_mode": "online"})._dirty_fields, {"job_mode"})
+
+    def test_from_json_bytes(self):
+        """from_json_bytes gives the same model as the dict path"""
+        nested_manifest = {"request_type": "image_label_area_select", "requester_question": {"en": "Draw a box"}}
+        inline_taskdata = get_data()
+        inline_taskdata.update({"taskdata_uri": None, "taskdata": [deepcopy(TASK)]})
+        multi_challenge = get_data(request_type="multi_challenge", multi_challenge_manifests=[nested_manifest])
+        with_restricted_audience = get_data()
+        with_restricted_audience["restricted_audience"] = {"lang": [{"en-us": {"score": 0.9}}]}
+
+        for data in (get_data(), inline_taskdata, multi_challenge, with_restricted_audience):
+            data["job_id"] = "c26c2e6a-41ab-4218-b39e-6314b760c45c"
+            manifest = basemodels.Manifest.from_json_bytes(json.dumps(data).encode())
+            self.assertEqual(manifest, basemodels.Manifest(**data))
+
+        nested_manifest["job_id"] = "c26c2e6a-41ab-4218-b39e-6314b760c45c"
+        nested_manifest["requester_restricted_answer_set"] = {}
+        nested = basemodels.NestedManifest.from_json_bytes(json.dumps(nested_manifest))
+        self.assertEqual(nested, basemodels.NestedManifest(**nested_manifest))
+        self.assertEqual(nested.requester_restricted_answer_set, {"label": {}})
+
+    def test_from_json_bytes_invalid(self):
+        """before validators keep their semantics, invalid documents raise ValidationError"""
+        no_taskdata = get_data()
+        no_taskdata["taskdata_uri"] = None
+        invalid_taskdata = get_data()
+        invalid_taskdata.update({"taskdata_uri": None, "taskdata": [{"task_key": TASK["task_key"]}, "task"]})
+        invalid_restricted_audience = get_data()
+        invalid_restricted_audience["restricted_audience"] = ["lang"]
+
+        for data in (no_taskdata, invalid_taskdata, invalid_restricted_audience, [get_data()]):
+            with self.assertRaises(ValidationError):
+                basemodels.Manifest.from_json_bytes(json.dumps(data).encode())
+
+        with self.assertRaises(ValidationError):
+            basemodels.Manifest.from_json_bytes(b'{"job_mode": "batch"')
+
     def test_restricted_audience(self):
         """Test that restricted audience is in the Manifest"""
         manifest = a_manifest()
@@ -327,6 +433,67 @@ class ManifestTest(unittest.TestCase):
         )
         self.assertEqual(2, manifest.to_primitive()["restricted_audience"]["min_difficulty"])
 
+    def test_to_primitive_matches_json_round_trip(self):
+        """to_primitive output is identical to a model_dump_json/json.loads round trip"""
+        def legacy_to_primitive(manifest):
+            d = json.loads(manifest.model_dump_json())
+            if isinstance(manifest.restricted_audience, RestrictedAudience):
+                d["restricted_audience"] = manifest.restricted_audience.to_primitive()
+            return d
+
+        taskdata = [
+            {
+                "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+                "datapoint_uri": "https://domain.com/file1.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+                "polygon": [1, 2, 3, 4],
+                "entities": [
+                    {
+                        "entity_id": "04606112-4b9d-455f-8f43-9cc1a9bca185",
+                        "entity_uri": "https://domain.com/entity.jpg",
+                        "coords": [1, 2],
+                        "size": [3, 4],
+                    }
+                ],
+            },
+            {
+                "task_key": "20bd4f3e-4518-4602-b67a-1d8dfabcce0c",
+                "datapoint_text": {"en": "Question"},
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            },
+        ]
+        restricted_audience = {
+            "lang": [{"en-us": {"score": 0.9}}],
+            "browser": [{"desktop": {"score": 0.5}}],
+            "confidence": [{"minimum_client_confidence": {"score": 0.9}}],
+            "min_difficulty": 2,
+        }
+        nested_manifest = a_nested_manifest(
+            request_type="image_label_area_select",
+            request_config={"shape_type": "point"},
+        )
+
+        inline_taskdata = get_data()
+        inline_taskdata.update({"taskdata_uri": None, "taskdata": taskdata})
+        with_restricted_audience = get_data(expiration_date=None)
+        with_restricted_audience["restricted_audience"] = restricted_audience
+        with_webhook = get_data()
+        with_webhook["webhook"] = {"webhook_id": "c26c2e6a-41ab-4218-b39e-6314b760c45c", "job_completed": [FAKE_URL]}
+
+        manifests = [
+            a_manifest(),
+            a_manifest(request_type="multi_challenge", multi_challenge_manifests=[nested_manifest]),
+            basemodels.Manifest(**get_data()),
+            basemodels.Manifest(**inline_taskdata),
+            basemodels.Manifest(**with_restricted_audience),
+            basemodels.Manifest(**with_webhook),
+            basemodels.Manifest(**get_data(request_type="multi_challenge", multi_challenge_manifests=[
+                nested_manifest.model_dump()
+            ])),
+        ]
+        for manifest in manifests:
+            self.assertEqual(json.dumps(manifest.to_primitive()), json.dumps(legacy_to_primitive(manifest)))
+
     def test_parse_restricted_audience(self):
         """Test None fields are skipped in restricted audience"""
         restricted_audience = {"min_difficulty": 2}
@@ -721,13 +888,13 @@ class TestValidateManifestUris(unittest.TestCase):
         headers = headers or {}
         httpretty.register_uri(method, uri, body=json.dumps(body), **headers)
 
-    def validate_groundtruth_response(self, request_type, body):
+    def validate_groundtruth_response(self, request_type, body, stream=False):
         uri = "https://uri.com"
         manifest = {"groundtruth_uri": uri, "request_type": request_type}
 
         self.register_http_response(uri, manifest, body)
 
-        test_models.validate_manifest_uris(manifest)
+        test_models.validate_manifest_uris(manifest, stream=stream)
 
     def test_no_uris(self):
         """should not raise if there are no uris to validate"""
@@ -853,6 +1020,26 @@ class TestValidateManifestUris(unittest.TestCase):
         with self.assertRaises(ValidationError):
             self.validate_groundtruth_response("image_label_area_select", body)
 
+    def test_groundtruth_uri_stream(self):
+        """should validate groundtruth_uri entries while streaming the response"""
+        groundtruth_uri = "https://domain.com/file1.jpeg"
+        body = {
+            groundtruth_uri: [[{"entity_name": 0, "entity_type": "gate", "entity_coords": [275, 184, 454, 183]}]],
+            "https://domain.com/file2.jpeg": [[{"entity_name": 1, "entity_type": "gate", "entity_coords": [1, 2]}]],
+        }
+        self.register_http_response(groundtruth_uri, method=httpretty.HEAD, headers={"Content-Type": "image/jpeg"})
+        self.validate_groundtruth_response("image_label_area_select", body, stream=True)
+
+        invalid_bodies = [
+            {"not_uri": [["cat"], ["cat"], ["cat"]]},
+            {"https://domain.com/file1.jpeg": [True, False]},
+            [{"key": "value"}],
+            {},
+        ]
+        for body in invalid_bodies:
+            with self.assertRaises(ValidationError):
+                self.validate_groundtruth_response("image_label_multiple_choice", body, stream=True)
+
     def test_taskdata_empty(self):
         """should raise if taskdata_uri contains no entries"""
         uri = "https://uri.com"
@@ -905,6 +1092,69 @@ class TestValidateManifestUris(unittest.TestCase):
         with self.assertRaises(ValidationError):
             test_models.validate_manifest_uris(manifest)
 
+    def test_taskdata_uri_stream(self):
+        """should validate taskdata_uri entries while streaming the response"""
+        uri = "https://uri.com"
+        manifest = {"taskdata_uri": uri}
+        body = [
+            {
+                "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+                "datapoint_uri": "https://domain.com/file1.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            },
+        ] * 1000
+
+        self.register_http_response(uri, manifest, body)
+
+        self.assertEqual(test_models.manifest.manifest.validate_taskdata_uri(manifest, stream=True), 1000)
+
+    def test_taskdata_uri_stream_invalid(self):
+        uri = "https://uri.com"
+        manifest = {"taskdata_uri": uri}
+
+        for body in ([], {"key": [1, 2, 3]}, [{"task_key": "not_uuid", "datapoint_uri": "not_uri"}]):
+            self.register_http_response(uri, manifest, body)
+            with self.assertRaises(ValidationError):
+                test_models.validate_manifest_uris(manifest, stream=True)
+
+        httpretty.register_uri(httpretty.GET, uri, body='[{"datapoint_uri": "https://domain.com/file1.jpg"')
+        with self.assertRaises(ValidationError):
+            test_models.validate_manifest_uris(manifest, stream=True)
+
+    def test_taskdata_uri_bulk(self):
+        """should validate the whole taskdata_uri document at once"""
+        uri = "https://uri.com"
+        manifest = {"taskdata_uri": uri, "request_type": "image_label_binary"}
+        body = [
+            {
+                "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+                "datapoint_uri": "https://domain.com/file1.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            },
+        ] * 1000
+
+        self.register_http_response(uri, manifest, body)
+        self.register_http_response(
+            "https://domain.com/file1.jpg", method=httpretty.HEAD, headers={"Content-Type": "image/jpeg"}
+        )
+
+        self.assertEqual(test_models.manifest.manifest.validate_taskdata_uri(manifest, bulk=True), 1000)
+
+    def test_taskdata_uri_bulk_invalid(self):
+        uri = "https://uri.com"
+        manifest = {"taskdata_uri": uri}
+
+        for body in ([], {"key": [1, 2, 3]}, ["not a dict"], [TASK, dict(TASK, task_key="not_uuid")]):
+            self.register_http_response(uri, manifest, body)
+            with self.assertRaises(ValidationError) as context:
+                test_models.validate_manifest_uris(manifest, bulk=True)
+        self.assertEqual(context.exception.errors()[0]["loc"], ("taskdata_uri", 1))
+        self.assertIn("taskdata entry 1 is invalid", context.exception.errors()[0]["msg"])
+
+        with self.assertRaises(ValidationError) as val_error:
+            test_models.validate_taskdata_json(json.dumps([TASK, dict(TASK, task_key="not_uuid")]), False)
+        self.assertEqual(val_error.exception.errors()[0]["loc"], ("taskdata_uri", 1, "task_key"))
+
     def mock_manifest_uris(self, verification: bool = False, gt_td_same_length: bool = False):
         """Mocking manifest uris."""
         taskdata_uri = "https://td.com"
@@ -1024,6 +1274,34 @@ class TestValidateManifestUris(unittest.TestCase):
         with self.assertRaises(ValidationError):
             test_models.validate_manifest_example_images(manifest)
 
+    def test_example_images_resources_deduplicated(self):
+        """Test each example image resource is fetched once and errors keep their shape."""
+        first_uri = "http://test.com/example-image1.jpg"
+        second_uri = "http://test.com/example-image2.jpg"
+
+        manifest = {
+            "requester_question_example": [first_uri, second_uri, first_uri],
+            "requester_restricted_answer_set": {
+                "0": {"answer_example_uri": second_uri, "en": "Test en2"},
+                "1": {"answer_example_uri": first_uri, "en": "Test en3"},
+            },
+        }
+        self.register_http_response(first_uri, method=httpretty.HEAD, headers={"Content-Type": "image/jpeg"})
+        self.register_http_response(second_uri, method=httpretty.HEAD, headers={"Content-Type": "image/png"})
+
+        test_models.validate_manifest_example_images(manifest, max_workers=4)
+        self.assertEqual(len(httpretty.latest_requests()), 2)
+
+        self.register_http_response(second_uri, method=httpretty.HEAD, headers={"Content-Type": "image/html"})
+        manifest["requester_question_example"] = first_uri
+        with self.assertRaises(ValidationError) as val_error:
+            test_models.validate_manifest_example_images(manifest, max_workers=4)
+        self.assertEqual(
+            f"requester restricted answer set uri({second_uri}) content type failed validation: "
+            "Unsupported type image/html",
+            val_error.exception.title,
+        )
+
     def test_valid_is_verification(self):
         """Test valid is verification."""
         manifest = self.mock_manifest_uris(verification=True, gt_td_same_length=True)
@@ -1045,6 +1323,72 @@ class TestValidateManifestUris(unittest.TestCase):
 
         self.assertEqual("All taskdata entries dont have corresponding groundtruth entry", val_error.exception.title)
 
+    def test_validation_session(self):
+        """should fetch each document once for all the checks"""
+        manifest = self.mock_manifest_uris(verification=True, gt_td_same_length=True)
+        result = test_models.ManifestValidationSession(manifest).validate(is_verification=True)
+
+        self.assertEqual(result.taskdata_entries, 3)
+        self.assertEqual(result.groundtruth_entries, 2)
+        self.assertTrue(result.verified)
+        gets = [request for request in httpretty.latest_requests() if request.method == "GET"]
+        self.assertEqual(len(gets), 2)
+
+        result = test_models.ManifestValidationSession(manifest).validate()
+        self.assertFalse(result.verified)
+
+    def test_validation_session_invalid_verification(self):
+        manifest = self.mock_manifest_uris(gt_td_same_length=True)
+        manifest["is_verification"] = True
+        with self.assertRaises(ValidationError) as val_error:
+            test_models.ManifestValidationSession(manifest).validate()
+        self.assertEqual("All taskdata entries dont have corresponding groundtruth entry", val_error.exception.title)
+
+        with self.assertRaises(ValidationError):
+            test_models.ManifestValidationSession({"taskdata_uri": "https://td.com"}).validate(is_verification=True)
+
+
+class GroundtruthDataTest(unittest.TestCase):
+    def test_valid(self):
+        documents = {
+            "image_label_binary": {"https://domain.com/file1.jpeg": ["false", "true"]},
+            "image_label_multiple_choice": {"https://domain.com/file1.jpeg": [["cat"], ["dog"]]},
+            "image_label_area_select": {
+                "https://domain.com/file1.jpeg": [[{"entity_type": "gate", "entity_coords": [275, 184]}]]
+            },
+            "text_label_multiple_span_select": {
+                "https://domain.com/file1.txt": [{"start": 0, "end": 4, "label": "0"}]
+            },
+            "image_drag_drop": {
+                "81fb76f3-3906-4fbd-8168-9dff208860a5": [
+                    {
+                        "entity_name": "04606112-4b9d-455f-8f43-9cc1a9bca185",
+                        "entity_type": "default",
+                        "entity_coords": [275, 184],
+                    }
+                ]
+            },
+            "text_free_entry": ["anything"],
+        }
+        for request_type, data in documents.items():
+            self.assertEqual(test_models.validate_groundtruth_data(data, request_type, False), 1)
+
+    def test_invalid_entry_is_localized(self):
+        data = {
+            "https://domain.com/file1.jpeg": ["false", "true"],
+            "https://domain.com/file2.jpeg": ["false", "maybe"],
+        }
+        with self.assertRaises(ValidationError) as val_error:
+            test_models.validate_groundtruth_data(data, "image_label_binary", False)
+        self.assertEqual(val_error.exception.errors()[0]["loc"], ("groundtruth_uri", "https://domain.com/file2.jpeg"))
+
+        with self.assertRaises(ValidationError) as val_error:
+            test_models.validate_groundtruth_data([["false"]], "image_label_binary", False)
+        self.assertEqual(val_error.exception.errors()[0]["loc"], ("groundtruth_uri", 0))
+
+        with self.assertRaises(ValidationError):
+            test_models.validate_groundtruth_data("not a document", "image_label_binary", False)
+
 
 class TaskEntryTest(unittest.TestCase):
     def test_valid_entry_is_true(self):
@@ -0,0 +1,142 @@
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data.reconcile import KeyReconciler, RECONCILE_SAMPLES_MAX
+from basemodels.manifest.data.transport import MemoryTransport, set_transport
+from basemodels.manifest.session import ManifestValidationSession
+
+REQUEST_TYPE = "image_label_binary"
+
+
+def uri(index):
+    return f"https://domain.com/image-{index}.jpg"
+
+
+def reconcile(task_keys, gt_keys, **kwargs):
+    with KeyReconciler("datapoint_uri", **kwargs) as reconciler:
+        for key in task_keys:
+            reconciler.add_task({"datapoint_uri": key})
+        for key in gt_keys:
+            reconciler.add_groundtruth(key, ["true"])
+        return reconciler.report()
+
+
+class KeyReconcilerTest(unittest.TestCase):
+    def test_report(self):
+        task_keys = [uri(i) for i in range(1000)] + [uri(0), uri(1)]
+        gt_keys = [uri(i) for i in range(20, 1050)]
+
+        report = reconcile(task_keys, gt_keys)
+        self.assertEqual((report.taskdata_keys, report.groundtruth_keys), (1000, 1030))
+        self.assertEqual((report.missing, report.extra, report.unkeyed), (20, 50, 0))
+        self.assertEqual(report.missing_sample, [uri(i) for i in range(RECONCILE_SAMPLES_MAX)])
+        self.assertEqual(len(report.extra_sample), RECONCILE_SAMPLES_MAX)
+        self.assertTrue(set(report.extra_sample) <= {uri(i) for i in range(1000, 1050)})
+        self.assertFalse(report.matches)
+
+    def test_spilled(self):
+        task_keys = [uri(i) for i in range(1000)] + [uri(0), uri(1)]
+        gt_keys = [uri(i) for i in reversed(range(20, 1050))]
+
+        report = reconcile(task_keys, gt_keys)
+        spilled = reconcile(task_keys, gt_keys, spill_keys=7)
+        self.assertEqual(spilled.model_dump(exclude={"missing_sample", "extra_sample"}),
+                         report.model_dump(exclude={"missing_sample", "extra_sample"}))
+        self.assertTrue(set(spilled.missing_sample) <= {uri(i) for i in range(20)})
+        self.assertTrue(set(spilled.extra_sample) <= {uri(i) for i in range(1000, 1050)})
+        self.assertEqual(len(spilled.extra_sample), RECONCILE_SAMPLES_MAX)
+
+    def test_matching(self):
+        keys = [uri(i) for i in range(100)]
+        for spill_keys in (7, 1000):
+            report = reconcile(keys, reversed(keys), spill_keys=spill_keys)
+            self.assertTrue(report.matches)
+            self.assertEqual(report.missing_sample, [])
+
+    def test_unkeyed(self):
+        with KeyReconciler("datapoint_uri") as reconciler:
+            reconciler.add_task({"datapoint_uri": uri(0)})
+            reconciler.add_task({"task_key": "no uri"})
+            reconciler.add_task(["not an entry"])
+            reconciler.add_groundtruth(uri(0), ["true"])
+            reconciler.add_groundtruth("", ["true"])
+            report = reconciler.report()
+
+        self.assertEqual((report.taskdata_keys, report.groundtruth_keys, report.missing, report.extra), (1, 1, 0, 0))
+        self.assertEqual(report.unkeyed, 3)
+        self.assertFalse(report.matches)
+
+
+class ValidateIsVerificationTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = MemoryTransport()
+        set_transport(self.transport)
+        self.manifest = {
+            "taskdata_uri": "https://td.com",
+            "groundtruth_uri": "https://gt.com",
+            "request_type": REQUEST_TYPE,
+            "is_verification": True,
+        }
+        self.transport.add(uri(0), headers={"Content-Type": "image/jpeg"})
+        self.taskdata = [
+            {"task_key": "407fdd93-687a-46bb-b578-89eb96b4109d", "datapoint_uri": uri(i), "datapoint_hash": "x"}
+            for i in range(3)
+        ]
+        self.transport.add("https://td.com", json.dumps(self.taskdata))
+
+    def tearDown(self):
+        set_transport(None)
+
+    def test_matching(self):
+        groundtruth = {uri(i): ["true"] for i in range(3)}
+        self.transport.add("https://gt.com", json.dumps(groundtruth))
+
+        report = manifest.validate_is_verification(self.manifest)
+        self.assertTrue(report.matches)
+
+    def test_taskdata_object(self):
+        self.transport.add("https://td.com", json.dumps({str(i): task for i, task in enumerate(self.taskdata)}))
+        self.transport.add("https://gt.com", json.dumps({uri(i): ["true"] for i in range(3)}))
+
+        with self.assertRaises(ValidationError) as context:
+            manifest.validate_is_verification(self.manifest)
+        self.assertIn("expected a JSON array", context.exception.errors()[0]["msg"])
+
+    def test_list_groundtruth(self):
+        # List layout entries have no key to match the taskdata
+        self.transport.add("https://gt.com", json.dumps([["true"], ["true"], ["true"]]))
+
+        with self.assertRaises(ValidationError) as context:
+            manifest.validate_is_verification(self.manifest)
+        error_input = context.exception.errors()[0]["input"]
+        self.assertEqual((error_input["missing"], error_input["unkeyed"]), (3, 3))
+
+    def test_mismatch(self):
+        self.transport.add("https://gt.com", json.dumps({uri(0): ["true"], uri(5): ["false"]}))
+
+        for validate in (
+            manifest.validate_is_verification,
+            lambda data: ManifestValidationSession(data).validate(),
+        ):
+            with self.assertRaises(ValidationError) as context:
+                validate(self.manifest)
+
+            self.assertEqual(context.exception.title, "All taskdata entries dont have corresponding groundtruth entry")
+            error_input = context.exception.errors()[0]["input"]
+            self.assertEqual((error_input["missing"], error_input["extra"]), (2, 1))
+            self.assertEqual(sorted(error_input["missing_sample"]), [uri(1), uri(2)])
+            self.assertEqual(error_input["extra_sample"], [uri(5)])
+
+    def test_session_report(self):
+        self.transport.add("https://gt.com", json.dumps({uri(i): ["true"] for i in range(3)}))
+
+        result = ManifestValidationSession(self.manifest).validate()
+        self.assertTrue(result.verified)
+        self.assertEqual(result.reconciliation.taskdata_keys, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
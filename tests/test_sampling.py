@@ -0,0 +1,110 @@
+import json
+import unittest
+
+import httpretty
+from pydantic import ValidationError
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data.sampling import Sampling, SamplingResult
+from basemodels.manifest.data.synthetic import SyntheticData
+
+
+class SamplingTest(unittest.TestCase):
+    def test_sample(self):
+        sampling = Sampling(size=10, head=5, seed=1)
+        seen = []
+
+        count, sample = sampling.sample(range(1000), on_entry=seen.append)
+        self.assertEqual(count, 1000)
+        self.assertEqual(seen, list(range(1000)))
+        self.assertEqual(len(sample), 15)
+        self.assertEqual(sample[:5], [(i, i) for i in range(5)])
+        self.assertEqual([index for index, _ in sample], sorted(index for index, _ in sample))
+
+        self.assertEqual(sampling.sample(range(1000)), (count, sample))
+        self.assertNotEqual(Sampling(size=10, head=5, seed=2).sample(range(1000))[1], sample)
+
+    def test_small_document(self):
+        self.assertEqual(Sampling(size=10, head=5).sample("abc"), (3, [(0, "a"), (1, "b"), (2, "c")]))
+
+
+@httpretty.activate
+class ValidateUriSamplingTest(unittest.TestCase):
+    def setUp(self):
+        self.synthetic = SyntheticData(seed=1, fault_rate=0.1)
+        taskdata = list(self.synthetic.taskdata_entries("text_multiple_choice_one_option", 300))
+        groundtruth = dict(SyntheticData(seed=1).groundtruth_entries("text_label_multiple_span_select", 300))
+        httpretty.register_uri(httpretty.GET, "https://td.com", body=json.dumps(taskdata))
+        httpretty.register_uri(httpretty.GET, "https://gt.com", body=json.dumps(groundtruth))
+        httpretty.register_uri(httpretty.GET, "https://gt-list.com", body=json.dumps(list(groundtruth.values())))
+        self.td_manifest = {"taskdata_uri": "https://td.com", "request_type": "text_multiple_choice_one_option"}
+
+    def test_taskdata_sample(self):
+        sampling = Sampling(size=50, head=10, seed=3, max_error_rate=0.5)
+        faults = {fault.index for fault in self.synthetic.faults if fault.document == "taskdata"}
+
+        for stream in (False, True):
+            result = manifest.validate_taskdata_uri(self.td_manifest, stream=stream, sample=sampling)
+            self.assertIsInstance(result, SamplingResult)
+            self.assertEqual((result.entries, result.sample_size), (300, 60))
+            self.assertGreater(result.errors, 0)
+            self.assertEqual(result.error_rate, result.errors / 60)
+            self.assertTrue({index for index, _ in result.first_errors} <= faults)
+            self.assertEqual(manifest.validate_taskdata_uri(self.td_manifest, stream=stream, sample=sampling), result)
+
+    def test_rejected_sample(self):
+        with self.assertRaises(ValidationError) as context:
+            manifest.validate_taskdata_uri(self.td_manifest, sample=Sampling(size=50, seed=3))
+
+        error = context.exception.errors()[0]
+        self.assertEqual(error["loc"][0], "taskdata_uri")
+        self.assertIn("sampled entries are invalid", error["msg"])
+
+    def test_content_type_probe(self):
+        taskdata = [
+            {
+                "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+                "datapoint_uri": "https://domain.com/file.jpg",
+                "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+            }
+            for _ in range(20)
+        ]
+        httpretty.register_uri(httpretty.GET, "https://td-images.com", body=json.dumps(taskdata))
+        td_manifest = {"taskdata_uri": "https://td-images.com", "request_type": "image_label_binary"}
+        sampling = Sampling(size=5, seed=3, max_error_rate=1.0)
+
+        httpretty.register_uri(httpretty.HEAD, "https://domain.com/file.jpg", **{"Content-Type": "image/jpeg"})
+        self.assertEqual(manifest.validate_taskdata_uri(td_manifest, sample=sampling).errors, 0)
+
+        # A failed probe fails the document as without sampling, it is not a sampled entry error
+        httpretty.register_uri(httpretty.HEAD, "https://domain.com/file.html", **{"Content-Type": "text/html"})
+        for entry in taskdata:
+            entry["datapoint_uri"] = "https://domain.com/file.html"
+        httpretty.register_uri(httpretty.GET, "https://td-html.com", body=json.dumps(taskdata))
+        td_manifest["taskdata_uri"] = "https://td-html.com"
+        for sample in (None, sampling):
+            with self.assertRaises(ValidationError) as context:
+                manifest.validate_taskdata_uri(td_manifest, sample=sample)
+            error = context.exception.errors()[0]
+            self.assertEqual(error["loc"], ("taskdata_uri",))
+            self.assertIn("unsupported type text/html", error["msg"])
+
+    def test_groundtruth_sample(self):
+        sampling = Sampling(size=20, seed=3)
+
+        # Entries of the list layout have no key, only the groundtruth of unvalidated types can use it
+        for uri, request_type in (
+            ("https://gt.com", "text_label_multiple_span_select"),
+            ("https://gt-list.com", "text_multiple_choice_one_option"),
+        ):
+            gt_manifest = {"groundtruth_uri": uri, "request_type": request_type}
+            for stream in (False, True):
+                keys = []
+                result = manifest.validate_groundtruth_uri(
+                    gt_manifest, stream=stream, sample=sampling, on_entry=lambda key, value: keys.append(key)
+                )
+                self.assertEqual((result.entries, result.sample_size, result.errors, len(keys)), (300, 20, 0, 300))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import unittest
+
+from basemodels.manifest.data.stream import iter_json_array, iter_json_object, JSONStreamReader
+
+
+def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def test_matches_json_loads(self):
+        """should yield the same items as json.loads for any chunk size"""
+        data = [
+            {"task_key": "407fdd93-687a-46bb-b578-89eb96b4109d", "datapoint_text": {"en": "ünïcødé"}},
+            12345.678,
+            [1, [2, [3]]],
+            'a string with "escaped" chars, and ] brackets',
+            None,
+            True,
+            -10,
+        ]
+        body = json.dumps(data, indent=2).encode()
+        for size in (1, 2, 3, 7, 64, len(body)):
+            self.assertEqual(list(iter_json_array(chunked(body, size))), data)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(chunked(b" [ ] ", 1))), [])
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunked(b'{"key": [1, 2, 3]}', 4)))
+
+    def test_malformed(self):
+        for body in (b"[1, 2", b"[1 2]", b"[1, 2] 3", b"[{]", b""):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(chunked(body, 2)))
+
+    def test_reads_lazily(self):
+        """should not read further chunks than needed for the next item"""
+        consumed = []
+
+        def chunks():
+            for chunk in (b'[{"a": 1},', b' {"b": 2},', b' {"c": 3}]'):
+                consumed.append(chunk)
+                yield chunk
+
+        items = iter_json_array(chunks())
+        self.assertEqual(next(items), {"a": 1})
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(next(items), {"b": 2})
+        self.assertEqual(len(consumed), 2)
+
+    def test_malformed_first_entry(self):
+        """should raise a syntax error without reading the rest of the document"""
+        consumed = []
+        body = b'[{"a": 1 "b": 2}, ' + b", ".join([b'{"c": 3}'] * 100000) + b"]"
+
+        def chunks():
+            for chunk in chunked(body, 1024):
+                consumed.append(chunk)
+                yield chunk
+
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunks()))
+        self.assertEqual(len(consumed), 1)
+
+    def test_partial_tokens(self):
+        """should read values cut anywhere by chunk boundaries"""
+        data = [True, False, None, -1.5e-10, "\u00fc \\ \"", float("-inf"), {"key": [0]}]
+        body = json.dumps(data).encode()
+        for size in (1, 2, 3, 5):
+            self.assertEqual(list(iter_json_array(chunked(body, size))), data)
+
+
+class IterJsonObjectTest(unittest.TestCase):
+    def test_matches_json_loads(self):
+        data = {
+            "https://domain.com/file1.jpeg": [[{"entity_name": 0, "entity_type": "gate", "entity_coords": [275, 184]}]],
+            "https://domain.com/file2.jpeg": ["true", "false"],
+            "key, with: \"special\" } chars": {},
+        }
+        body = json.dumps(data).encode()
+        for size in (1, 5, 64, len(body)):
+            self.assertEqual(dict(iter_json_object(chunked(body, size))), data)
+
+    def test_malformed(self):
+        for body in (b"[]", b'{"a" 1}', b'{"a": 1 "b": 2}', b"{1: 2}", b'{"a": 1'):
+            with self.assertRaises(ValueError):
+                list(iter_json_object(chunked(body, 2)))
+
+    def test_peek(self):
+        reader = JSONStreamReader(chunked(b'  \n {"a": 1}', 1))
+        self.assertEqual(reader.peek(), "{")
+        self.assertEqual(list(reader.iter_object()), [("a", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from basemodels import Manifest
+from basemodels.constants import BaseJobTypesEnum
+from basemodels.manifest.data import validate_groundtruth_data, validate_taskdata_json
+from basemodels.manifest.data.groundtruth import validate_groundtruth_entry
+from basemodels.manifest.data.synthetic import (
+    SyntheticData,
+    dump_json_array,
+    dump_json_object,
+    json_array_chunks,
+)
+from basemodels.manifest.data.taskdata import validate_taskdata_entry
+
+
+class SyntheticDataTest(unittest.TestCase):
+    def test_valid_documents_of_every_request_type(self):
+        synthetic = SyntheticData(seed=1)
+
+        for request_type in BaseJobTypesEnum:
+            taskdata = list(synthetic.taskdata_entries(request_type, 20))
+            groundtruth = dict(synthetic.groundtruth_entries(request_type, 20))
+
+            self.assertEqual(validate_taskdata_json(json.dumps(taskdata), False), 20)
+            self.assertEqual(validate_groundtruth_data(groundtruth, request_type, False), 20)
+            Manifest(**synthetic.manifest(request_type.value, 5))
+        self.assertEqual(synthetic.faults, [])
+
+    def test_deterministic(self):
+        def documents(seed):
+            synthetic = SyntheticData(seed)
+            return (
+                list(synthetic.taskdata_entries("image_drag_drop", 10)),
+                list(synthetic.groundtruth_entries("image_label_area_select", 10)),
+                list(synthetic.manifests(3)),
+            )
+
+        first = documents(1)
+        self.assertEqual(first, documents(1))
+        self.assertNotEqual(first, documents(2))
+
+    def test_groundtruth_keys_match_taskdata(self):
+        synthetic = SyntheticData(seed=1)
+
+        taskdata = synthetic.taskdata_entries("image_label_binary", 10)
+        groundtruth = synthetic.groundtruth_entries("image_label_binary", 10)
+        self.assertEqual([task["datapoint_uri"] for task in taskdata], [key for key, _ in groundtruth])
+
+        taskdata = synthetic.taskdata_entries("image_drag_drop", 10)
+        groundtruth = synthetic.groundtruth_entries("image_drag_drop", 10)
+        self.assertEqual([task["task_key"] for task in taskdata], [key for key, _ in groundtruth])
+
+    def test_injected_faults(self):
+        synthetic = SyntheticData(seed=1, fault_rate=0.2)
+
+        invalid = set()
+        for i, entry in enumerate(synthetic.taskdata_entries("image_label_binary", 200)):
+            try:
+                validate_taskdata_entry(entry, False)
+            except ValidationError:
+                invalid.add(i)
+        self.assertTrue(0 < len(invalid) < 200)
+        self.assertEqual(invalid, {fault.index for fault in synthetic.faults})
+
+        synthetic.faults.clear()
+        for request_type in ("image_label_multiple_choice", "image_label_area_select", "image_drag_drop"):
+            invalid = set()
+            for i, (key, value) in enumerate(synthetic.groundtruth_entries(request_type, 100)):
+                try:
+                    validate_groundtruth_entry(key, value, request_type, False)
+                except ValidationError:
+                    invalid.add(i)
+            faults = {fault.index for fault in synthetic.faults}
+            self.assertTrue(invalid)
+            self.assertEqual(invalid, faults)
+            synthetic.faults.clear()
+
+        for i, manifest in enumerate(synthetic.manifests(50)):
+            with self.subTest(i=i):
+                if any(fault.index == i for fault in synthetic.faults):
+                    with self.assertRaises(ValidationError):
+                        Manifest(**manifest)
+                else:
+                    Manifest(**manifest)
+
+    def test_dump(self):
+        synthetic = SyntheticData(seed=1)
+        taskdata = list(synthetic.taskdata_entries("image_label_binary", 25))
+        groundtruth = dict(synthetic.groundtruth_entries("image_label_binary", 25))
+
+        self.assertEqual(len(list(json_array_chunks(taskdata, chunk_entries=10))), 3)
+        for chunk_entries in (1, 10, 1000):
+            self.assertEqual(json.loads("".join(json_array_chunks(taskdata, chunk_entries))), taskdata)
+        self.assertEqual(json.loads("".join(json_array_chunks([]))), [])
+
+        fp = io.StringIO()
+        dump_json_array(fp, synthetic.taskdata_entries("image_label_binary", 25))
+        self.assertEqual(json.loads(fp.getvalue()), taskdata)
+
+        fp = io.StringIO()
+        dump_json_object(fp, synthetic.groundtruth_entries("image_label_binary", 25))
+        self.assertEqual(json.loads(fp.getvalue()), groundtruth)
+
+
+if __name__ == "__main__":
+    unittest.main()
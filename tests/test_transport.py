@@ -0,0 +1,200 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpretty
+from pydantic import ValidationError
+from requests.exceptions import InvalidSchema, InvalidURL
+from urllib3.util.retry import RequestHistory, Retry
+
+from basemodels.manifest import manifest
+from basemodels.manifest.data import taskdata
+from basemodels.manifest.data.cache import DocumentCache, set_document_cache
+from basemodels.manifest.data.transport import (
+    FileTransport,
+    HttpTransport,
+    JitteredRetry,
+    MemoryTransport,
+    get_transport,
+    set_scheme_transport,
+    set_transport,
+    transport_for,
+)
+
+TASKDATA = [
+    {
+        "task_key": "407fdd93-687a-46bb-b578-89eb96b4109d",
+        "datapoint_uri": "https://domain.com/file1.jpg",
+        "datapoint_hash": "f4acbe8562907183a484498ba901bfe5c5503aaa",
+    }
+] * 3
+
+
+class MemoryTransportTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = MemoryTransport()
+        self.transport.add("https://td.com", json.dumps(TASKDATA))
+        self.transport.add("https://domain.com/file1.jpg", headers={"Content-Type": "image/jpeg"})
+        set_transport(self.transport)
+
+    def tearDown(self):
+        set_transport(None)
+
+    def test_validate_taskdata_uri(self):
+        td_manifest = {"taskdata_uri": "https://td.com", "request_type": "image_label_binary"}
+
+        for options in ({}, {"stream": True}, {"bulk": True}):
+            self.assertEqual(manifest.validate_taskdata_uri(td_manifest, **options), 3)
+        self.assertEqual(
+            [(method, uri) for method, uri, _ in self.transport.requests],
+            [("GET", "https://td.com"), ("HEAD", "https://domain.com/file1.jpg")] * 3,
+        )
+
+    def test_errors(self):
+        with self.assertRaises(ValidationError):
+            manifest.validate_taskdata_uri({"taskdata_uri": "https://missing.com"})
+        with self.assertRaises(ValidationError):
+            taskdata.validate_content_type("https://missing.com/file.jpg")
+
+    def test_conditional_requests(self):
+        self.transport.add("https://gt.com", json.dumps({"a": 1}), headers={"ETag": '"v1"'})
+
+        with tempfile.TemporaryDirectory() as directory:
+            set_document_cache(DocumentCache(directory))
+            try:
+                for _ in range(2):
+                    self.assertEqual(manifest.fetch_data_from_uri("https://gt.com"), {"a": 1})
+            finally:
+                set_document_cache(None)
+        self.assertEqual(self.transport.requests[-1][2], {"If-None-Match": '"v1"'})
+
+
+class FileTransportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "task data.json")
+        self.path.write_text(json.dumps(TASKDATA))
+        self.uri = self.path.as_uri()
+        self.transport = MemoryTransport()
+        self.transport.add("https://domain.com/file1.jpg", headers={"Content-Type": "image/jpeg"})
+        set_transport(self.transport)
+        self.file_transport = FileTransport(root=self.directory.name)
+        set_scheme_transport("file", self.file_transport)
+
+    def tearDown(self):
+        set_scheme_transport("file", None)
+        set_transport(None)
+        self.directory.cleanup()
+
+    def test_validate_taskdata_uri(self):
+        td_manifest = {"taskdata_uri": self.uri, "request_type": "image_label_binary"}
+
+        for options in ({}, {"stream": True}, {"bulk": True}):
+            self.assertEqual(manifest.validate_taskdata_uri(td_manifest, **options), 3)
+        self.assertEqual(manifest.fetch_data_from_uri(self.uri), TASKDATA)
+        # Only the datapoints went through the default transport
+        self.assertEqual({uri for _, uri, _ in self.transport.requests}, {"https://domain.com/file1.jpg"})
+
+    def test_mapped_chunks(self):
+        with self.file_transport.get(self.uri, stream=True) as response:
+            chunks = list(response.iter_content(16))
+            self.assertIsInstance(chunks[0], memoryview)
+            self.assertEqual(b"".join(chunks), self.path.read_bytes())
+            self.assertEqual(response.headers["Content-Length"], str(self.path.stat().st_size))
+            del chunks
+
+        with self.file_transport.get(self.uri) as response:
+            # Copied once
+            self.assertIs(response.content, response.content)
+            self.assertEqual(response.content, self.path.read_bytes())
+
+        self.path.write_bytes(b"")
+        with self.file_transport.get(self.uri) as response:
+            self.assertEqual((response.content, list(response.iter_content(16))), (b"", []))
+
+    def test_conditional_requests(self):
+        etag = self.file_transport.head(self.uri).headers["ETag"]
+        self.assertEqual(self.file_transport.get(self.uri, headers={"If-None-Match": etag}).status_code, 304)
+
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(self.file_transport.get(self.uri, headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_errors(self):
+        with self.assertRaises(ValidationError):
+            manifest.validate_taskdata_uri({"taskdata_uri": Path(self.directory.name, "missing.json").as_uri()})
+        with self.assertRaises(InvalidURL):
+            self.file_transport.get("file://host/data.json")
+
+    def test_root(self):
+        for uri in ("file:///etc/passwd", Path(self.directory.name, "..", "data.json").as_uri()):
+            with self.assertRaises(InvalidURL):
+                self.file_transport.get(uri)
+            with self.assertRaises(ValidationError):
+                manifest.fetch_data_from_uri(uri)
+
+    def test_scheme_transports(self):
+        self.assertIs(transport_for(self.uri), self.file_transport)
+        self.assertIs(transport_for("https://td.com"), self.transport)
+
+        set_scheme_transport("file", None)
+        self.assertIs(transport_for(self.uri), self.transport)
+
+    def test_disabled_by_default(self):
+        set_scheme_transport("file", None)
+        set_transport(None)
+        self.assertIsInstance(transport_for("file:///etc/passwd"), HttpTransport)
+        with self.assertRaises(InvalidSchema):
+            get_transport().get("file:///etc/passwd")
+        with self.assertRaises(ValidationError) as context:
+            manifest.fetch_data_from_uri("file:///etc/passwd")
+        self.assertNotIn("root:", str(context.exception))
+
+
+class HttpTransportTest(unittest.TestCase):
+    def test_default_transport(self):
+        set_transport(None)
+        self.assertIsInstance(get_transport(), HttpTransport)
+        self.assertIs(get_transport(), get_transport())
+
+    def test_jittered_backoff(self):
+        history = (RequestHistory("GET", "/", None, None, None),) * 3
+        backoff = Retry(total=5, backoff_factor=1, history=history).get_backoff_time()
+
+        for _ in range(20):
+            self.assertTrue(0 <= JitteredRetry(total=5, backoff_factor=1, history=history).get_backoff_time() <= backoff)
+
+    def test_keep_alive(self):
+        self.assertEqual(HttpTransport().session.headers["Connection"], "keep-alive")
+        self.assertEqual(HttpTransport(keep_alive=False).session.headers["Connection"], "close")
+
+    @httpretty.activate
+    def test_retries(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://td.com/",
+            responses=[
+                httpretty.Response(body="", status=503),
+                httpretty.Response(body="", status=502),
+                httpretty.Response(body=json.dumps(TASKDATA), status=200),
+            ],
+        )
+
+        set_transport(HttpTransport(retries=2, backoff_factor=0))
+        try:
+            self.assertEqual(manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com/"}), 3)
+            self.assertEqual(len(httpretty.latest_requests()), 3)
+
+            set_transport(HttpTransport(retries=0))
+            httpretty.reset()
+            httpretty.register_uri(httpretty.GET, "https://td.com/", status=503)
+            with self.assertRaises(ValidationError):
+                manifest.validate_taskdata_uri({"taskdata_uri": "https://td.com/"})
+            self.assertEqual(len(httpretty.latest_requests()), 1)
+        finally:
+            set_transport(None)
+
+
+if __name__ == "__main__":
+    unittest.main()